@@ -0,0 +1,58 @@
+"""
+FEI Vision Studio - Avaliação de modelos em um conjunto rotulado
+
+Uso:
+    python evaluate.py yolov8n.pt data_test/images
+    python evaluate.py yolov8n.pt yolov8s.pt dataset/images --profiles padrão imgsz480 --workers 4
+
+Para cada modelo e perfil de inferência (as receitas de variantes) mede mAP,
+precisão, recall e latência por imagem. Interromper e rodar de novo continua
+de onde parou. O relatório combinado fica em resultados/avaliacao/report.md e
+inclui as avaliações de execuções anteriores.
+"""
+import argparse
+import os
+
+from src.core import DatasetEvaluation, profile_specs, write_report
+from src.core.variants import VARIANT_SPECS
+
+
+def main():
+    """Avalia cada combinação de modelo e perfil e grava o relatório"""
+    parser = argparse.ArgumentParser(description="Avaliação de modelos YOLO (mAP e velocidade)")
+    parser.add_argument('models', nargs='+', help='Arquivos .pt seguidos da pasta de imagens')
+    parser.add_argument('--profiles', nargs='+', choices=[spec['name'] for spec in VARIANT_SPECS],
+                        help='Perfis de inferência (padrão: todos os aplicáveis)')
+    parser.add_argument('--workers', type=int, help='Processos de inferência')
+    parser.add_argument('--conf', type=float, default=0.5, help='Confiança para precisão e recall')
+    parser.add_argument('--out', default=os.path.join('resultados', 'avaliacao'))
+    args = parser.parse_args()
+
+    if len(args.models) < 2:
+        parser.error("informe ao menos um modelo e a pasta de imagens")
+    *models, image_dir = args.models
+
+    summaries = []
+    try:
+        for model_path in models:
+            for profile in profile_specs(model_path, args.profiles):
+                evaluation = DatasetEvaluation(
+                    model_path, image_dir, profile=profile, out_dir=args.out, report_conf=args.conf
+                )
+                summary = evaluation.run(
+                    workers=args.workers,
+                    progress=lambda done, total: print(f"\r  {done}/{total}", end="", flush=True),
+                )
+                print()
+                print(f"{summary['model']} [{summary['profile']}]: mAP50 {summary['map50']:.3f} · "
+                      f"mAP50-95 {summary['map50_95']:.3f} · {summary['images_per_s']:.1f} img/s")
+                summaries.append(summary)
+    except KeyboardInterrupt:
+        print("\nInterrompido; rode de novo para continuar de onde parou")
+
+    if summaries:
+        print(f"Relatório (todas as avaliações em {args.out}): {write_report(args.out)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+FEI Vision Studio - Servidor de inferência HTTP local
+
+Uso:
+    python server.py yolov8n.pt                       # http://127.0.0.1:8765
+    python server.py yolov8n.pt outro.pt --port 9000 --max-batch 16
+
+Não abre a interface gráfica; ver src/server para os endpoints.
+"""
+import argparse
+import os
+
+from src.server import InferenceServer
+
+
+def main():
+    """Carrega os modelos e atende até Ctrl+C"""
+    parser = argparse.ArgumentParser(description="Servidor HTTP local de detecção YOLO")
+    parser.add_argument('models', nargs='+', help='Arquivos .pt (o primeiro é o padrão)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--conf', type=float, default=0.25, help='Confiança mínima do modelo')
+    parser.add_argument('--max-batch', type=int, default=8, help='Maior lote por chamada ao modelo')
+    parser.add_argument('--max-wait-ms', type=float, default=5.0,
+                        help='Espera máxima para completar um lote')
+    args = parser.parse_args()
+
+    models = {os.path.splitext(os.path.basename(path))[0]: path for path in args.models}
+    server = InferenceServer(
+        models, host=args.host, port=args.port, conf=args.conf,
+        max_batch=args.max_batch, max_wait_ms=args.max_wait_ms
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Servidor encerrado")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+Núcleo de inferência compartilhado pelas threads
+"""
+
+from .analytics import DetectionAnalytics
+from .clips import ClipRecorder, TriggerRule, parse_rules
+from .decoders import VideoDecoder, open_decoder
+from .detector import Detector, extract_detections, quantize_dynamic, select_device
+from .evaluation import DatasetEvaluation, detection_metrics, profile_specs, stored_summaries, write_report
+from .memory import MemoryGovernor
+from .persistence import ResultWriter
+from .preprocess import LetterboxPlan, TensorPreprocessor, cuda_available
+from .roi import RoiStore, predict_frame, predict_rois
+from .shm_decode import SharedDecodePool, SharedFrame
+from .variants import ModelVariants, detector_options, variant_label
+from .video_index import FrameCache, KeyframeIndex
+
+__all__ = [
+    'DetectionAnalytics', 'ClipRecorder', 'TriggerRule', 'parse_rules',
+    'VideoDecoder', 'open_decoder',
+    'Detector', 'extract_detections', 'quantize_dynamic', 'select_device',
+    'DatasetEvaluation', 'detection_metrics', 'profile_specs', 'stored_summaries', 'write_report',
+    'MemoryGovernor', 'ResultWriter', 'LetterboxPlan', 'TensorPreprocessor', 'cuda_available',
+    'RoiStore', 'predict_frame', 'predict_rois', 'SharedDecodePool', 'SharedFrame', 'FrameCache', 'KeyframeIndex',
+    'ModelVariants', 'detector_options', 'variant_label',
+]
@@ -0,0 +1,154 @@
+"""
+Estatísticas de detecção acumuladas ao longo de um vídeo
+"""
+import csv
+import json
+import os
+import threading
+
+import numpy as np
+
+
+class DetectionAnalytics:
+    """
+    Contagens, histogramas de confiança e ocupação por classe em arrays pré-alocados
+
+    A série temporal usa no máximo max_bins intervalos. Quando o vídeo passa
+    desse comprimento, intervalos vizinhos são somados dois a dois e a
+    largura de cada intervalo dobra; a memória fica constante para qualquer
+    duração e o custo amortizado por frame continua O(1).
+    """
+
+    def __init__(self, class_names, fps, max_bins=3600, conf_bins=20, bin_seconds=1.0):
+        if isinstance(class_names, dict):
+            class_names = [class_names[i] for i in sorted(class_names)]
+        self.class_names = list(class_names)
+        self.fps = fps or 30.0
+        self.max_bins = max_bins
+        self.conf_bins = conf_bins
+        self.bin_seconds = bin_seconds
+
+        n = len(self.class_names)
+        self.counts = np.zeros(n, dtype=np.int64)  # detecções por classe
+        self.frames_present = np.zeros(n, dtype=np.int64)  # frames com a classe
+        self.conf_hist = np.zeros((n, conf_bins), dtype=np.int64)
+        self.bin_counts = np.zeros((max_bins, n), dtype=np.int64)
+        self.bin_present = np.zeros((max_bins, n), dtype=np.int64)
+        self.bin_frames = np.zeros(max_bins, dtype=np.int64)
+        self.frames = 0
+        self.used_bins = 0
+        self._lock = threading.Lock()
+
+    def update(self, frame_index, class_ids, confidences):
+        """
+        Registra as detecções de um frame
+
+        Args:
+            frame_index: Índice do frame no vídeo
+            class_ids: Array de ids de classe das caixas
+            confidences: Array de confianças das caixas
+        """
+        class_ids = np.asarray(class_ids, dtype=np.int64)
+        confidences = np.asarray(confidences, dtype=np.float64)
+        per_class = np.bincount(class_ids, minlength=len(self.class_names))
+        present = per_class > 0
+
+        with self._lock:
+            b = int(frame_index / self.fps / self.bin_seconds)
+            while b >= self.max_bins:
+                self._coarsen()
+                b = int(frame_index / self.fps / self.bin_seconds)
+
+            self.frames += 1
+            self.counts += per_class
+            self.frames_present += present
+            if len(class_ids):
+                conf_idx = np.minimum((confidences * self.conf_bins).astype(np.int64), self.conf_bins - 1)
+                np.add.at(self.conf_hist, (class_ids, conf_idx), 1)
+
+            self.bin_counts[b] += per_class
+            self.bin_present[b] += present
+            self.bin_frames[b] += 1
+            self.used_bins = max(self.used_bins, b + 1)
+
+    def _coarsen(self):
+        """Une intervalos vizinhos, dobrando a largura de cada intervalo"""
+        half = self.max_bins // 2
+        for arr in (self.bin_counts, self.bin_present, self.bin_frames):
+            arr[:half] = arr[0:2 * half:2] + arr[1:2 * half:2]
+            arr[half:] = 0
+        self.used_bins = (self.used_bins + 1) // 2
+        self.bin_seconds *= 2
+
+    def summary(self):
+        """Totais por classe (custo independe da duração do vídeo)"""
+        with self._lock:
+            frames = max(self.frames, 1)
+            return {
+                'frames': self.frames,
+                'duration_s': round(self.frames / self.fps, 2),
+                'classes': {
+                    name: {
+                        'detections': int(self.counts[i]),
+                        'frames_present': int(self.frames_present[i]),
+                        'occupancy': round(float(self.frames_present[i]) / frames, 4),
+                        'conf_hist': self.conf_hist[i].tolist(),
+                    }
+                    for i, name in enumerate(self.class_names) if self.counts[i]
+                },
+            }
+
+    def snapshot(self, top_k=5):
+        """
+        Série de ocupação das classes mais frequentes, para o gráfico ao vivo
+
+        Returns:
+            dict: names, occupancy (used_bins x k, fração de frames com a classe),
+                bin_seconds e totals
+        """
+        with self._lock:
+            top = [int(i) for i in np.argsort(-self.counts)[:top_k] if self.counts[i] > 0]
+            n = self.used_bins
+            frames = np.maximum(self.bin_frames[:n, None], 1)
+            occupancy = (self.bin_present[:n][:, top] / frames).astype(np.float32)
+            return {
+                'names': [self.class_names[i] for i in top],
+                'occupancy': occupancy,
+                'bin_seconds': self.bin_seconds,
+                'totals': [int(self.counts[i]) for i in top],
+            }
+
+    def export(self, directory, basename):
+        """
+        Salva resumo (JSON) e série temporal por intervalo (CSV)
+
+        Returns:
+            tuple: (caminho do JSON, caminho do CSV)
+        """
+        os.makedirs(directory, exist_ok=True)
+        json_path = os.path.join(directory, f"{basename}.json")
+        csv_path = os.path.join(directory, f"{basename}.csv")
+
+        summary = self.summary()
+        with open(json_path, 'w', encoding='utf-8') as f:
+            summary['bin_seconds'] = self.bin_seconds
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+        with self._lock:
+            active = [i for i in range(len(self.class_names)) if self.counts[i]]
+            with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                header = ['inicio_s', 'fim_s', 'frames']
+                for i in active:
+                    header += [f"{self.class_names[i]}_deteccoes", f"{self.class_names[i]}_ocupacao"]
+                writer.writerow(header)
+
+                for b in range(self.used_bins):
+                    frames = int(self.bin_frames[b])
+                    row = [b * self.bin_seconds, (b + 1) * self.bin_seconds, frames]
+                    for i in active:
+                        row += [int(self.bin_counts[b, i]),
+                                round(self.bin_present[b, i] / frames, 4) if frames else 0.0]
+                    writer.writerow(row)
+
+        return json_path, csv_path
@@ -0,0 +1,243 @@
+"""
+Gravação de clipes disparada por eventos, com pré-roll em memória
+
+As regras são avaliadas na thread de inferência (só contadores). Compressão
+do pré-roll, decodificação e escrita do vídeo ficam em uma thread própria,
+então a inferência não espera pelo encoder.
+"""
+import json
+import os
+import queue
+import re
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+
+class TriggerRule:
+    """Classe com confiança acima de min_conf por min_frames frames seguidos"""
+
+    def __init__(self, class_name, min_conf=0.5, min_frames=3):
+        self.class_name = class_name
+        self.min_conf = min_conf
+        self.min_frames = max(1, int(min_frames))
+        self.streak = 0
+
+    def update(self, detections):
+        """Atualiza a sequência com as detecções do frame; True quando a regra dispara"""
+        if any(nome == self.class_name and conf > self.min_conf for nome, conf in detections):
+            self.streak += 1
+        else:
+            self.streak = 0
+        return self.streak >= self.min_frames
+
+    def __str__(self):
+        return f"{self.class_name}>{self.min_conf:g}x{self.min_frames}"
+
+
+_RULE_PATTERN = re.compile(r'^\s*(?P<name>[^>]+?)\s*(?:>\s*(?P<conf>\d*\.?\d+))?\s*(?:x\s*(?P<frames>\d+))?\s*$')
+
+
+def parse_rules(text):
+    """
+    Converte o texto da UI em regras
+
+    Formato: "classe>conf xN" separados por vírgula, ex. "person>0.6x5, car".
+    Confiança padrão 0.5, 3 frames.
+
+    Raises:
+        ValueError: Se algum trecho não seguir o formato
+    """
+    rules = []
+    for chunk in re.split(r'[,;]', text or ""):
+        if not chunk.strip():
+            continue
+        match = _RULE_PATTERN.match(chunk)
+        if not match:
+            raise ValueError(f"Regra inválida: '{chunk.strip()}' (use classe>0.5x3)")
+        rules.append(TriggerRule(
+            match['name'].strip(),
+            float(match['conf']) if match['conf'] else 0.5,
+            int(match['frames']) if match['frames'] else 3,
+        ))
+    return rules
+
+
+class ClipRecorder:
+    """
+    Grava um clipe anotado quando alguma regra dispara
+
+    O clipe começa pre_roll segundos antes do disparo (frames JPEG de um anel
+    em memória) e termina post_roll segundos depois do último disparo. Cada
+    clipe gravado entra em <save_dir>/index.jsonl com regra e intervalo.
+
+    Uso (thread de inferência):
+        recorder = ClipRecorder(parse_rules("person>0.6x5"), fps=30)
+        recorder.update(index, detections, annotated_bgr)
+        ...
+        recorder.flush()   # fim da fonte; o gravador continua aceitando frames
+        recorder.close()
+    """
+
+    def __init__(self, rules, fps, save_dir=os.path.join("resultados", "clipes"), pre_roll=3.0,
+                 post_roll=3.0, jpeg_quality=80, source_name="video", max_pending=64):
+        self.rules = list(rules)
+        self.fps = fps or 30.0
+        self.save_dir = save_dir
+        self.pre_roll_frames = max(0, int(round(pre_roll * self.fps)))
+        self.post_roll_frames = max(1, int(round(post_roll * self.fps)))
+        self.jpeg_quality = jpeg_quality
+        self.source_name = source_name
+
+        self.clips_saved = 0
+        self.dropped_frames = 0  # frames fora de clipe descartados com a fila cheia
+        self.recording = False
+        self._record_until = -1
+        self._last_index = None
+        self._rule = None
+
+        os.makedirs(save_dir, exist_ok=True)
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._worker = threading.Thread(target=self._run, name="clip-writer", daemon=True)
+        self._worker.start()
+
+    def update(self, index, detections, frame):
+        """
+        Avalia as regras para o frame e o entrega ao gravador
+
+        Args:
+            index: Índice do frame na fonte
+            detections: Lista de (nome, confiança)
+            frame: Frame anotado BGR (não é copiado; não reutilize o array)
+
+        Returns:
+            bool: True se o frame faz parte de um clipe
+        """
+        if self._last_index is not None and index != self._last_index + 1:
+            # Salto (seek): o pré-roll e as sequências não valem mais
+            self._stop_clip()
+            for rule in self.rules:
+                rule.streak = 0
+            self._queue.put(('reset', None, None))
+        self._last_index = index
+
+        fired = [rule for rule in self.rules if rule.update(detections)]
+        if fired:
+            if not self.recording:
+                self.recording = True
+                self._rule = fired[0]
+                self._queue.put(('start', index, str(self._rule)))
+            self._record_until = index + self.post_roll_frames
+
+        if self.recording:
+            # Frames de clipe nunca são descartados: se o encoder atrasar, a inferência espera
+            self._queue.put(('frame', index, frame))
+            if index >= self._record_until:
+                self._stop_clip()
+            return True
+
+        try:
+            self._queue.put_nowait(('preroll', index, frame))
+        except queue.Full:
+            self.dropped_frames += 1
+        return False
+
+    def _stop_clip(self):
+        if self.recording:
+            self.recording = False
+            self._queue.put(('stop', self._last_index, None))
+
+    def flush(self):
+        """Encerra o clipe em andamento sem esperar o pós-roll (ex.: fim do vídeo)"""
+        self._stop_clip()
+
+    def close(self, timeout=10.0):
+        """Finaliza o clipe em andamento e espera o gravador terminar"""
+        self._stop_clip()
+        self._queue.put(None)
+        self._worker.join(timeout)
+
+    # --- thread do gravador ---
+
+    def _run(self):
+        ring = deque(maxlen=self.pre_roll_frames or 1)
+        writer = None
+        clip = None
+
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            kind, index, payload = item
+
+            try:
+                if kind == 'preroll':
+                    if self.pre_roll_frames:
+                        ok, jpeg = cv2.imencode('.jpg', payload, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+                        if ok:
+                            ring.append((index, jpeg))
+                elif kind == 'reset':
+                    ring.clear()
+                elif kind == 'start':
+                    clip = {'rule': payload, 'trigger_frame': index, 'pending': list(ring)}
+                    ring.clear()
+                elif kind == 'frame' and clip is not None:
+                    if writer is None:
+                        writer = self._open_clip(clip, payload)
+                    self._write(writer, clip, payload)
+                    clip['end_frame'] = index
+                elif kind == 'stop' and clip is not None:
+                    if writer is not None:
+                        writer.release()
+                        self._log_clip(clip)
+                    writer, clip = None, None
+            except Exception as e:
+                print(f"Erro ao gravar clipe: {e}")
+
+        if writer is not None:
+            writer.release()
+            self._log_clip(clip)
+
+    def _open_clip(self, clip, frame):
+        """Abre o arquivo no tamanho do primeiro frame ao vivo e despeja o pré-roll"""
+        h, w = frame.shape[:2]
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        base = os.path.join(self.save_dir, f"{self.source_name}_{stamp}_f{clip['trigger_frame']}")
+
+        path = base + ".mp4"
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), self.fps, (w, h))
+        if not writer.isOpened():
+            path = base + ".avi"
+            writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), self.fps, (w, h))
+
+        clip.update(path=path, size=(w, h))
+        pending = clip.pop('pending')
+        clip['start_frame'] = pending[0][0] if pending else clip['trigger_frame']
+        for _, jpeg in pending:
+            self._write(writer, clip, cv2.imdecode(jpeg, cv2.IMREAD_COLOR))
+        return writer
+
+    @staticmethod
+    def _write(writer, clip, frame):
+        # O governador de memória pode mudar a resolução no meio do clipe
+        if (frame.shape[1], frame.shape[0]) != clip['size']:
+            frame = cv2.resize(frame, clip['size'])
+        writer.write(np.ascontiguousarray(frame))
+
+    def _log_clip(self, clip):
+        self.clips_saved += 1
+        entry = {
+            'path': clip['path'],
+            'source': self.source_name,
+            'rule': clip['rule'],
+            'start_frame': clip['start_frame'],
+            'trigger_frame': clip['trigger_frame'],
+            'end_frame': clip.get('end_frame', clip['trigger_frame']),
+            'fps': self.fps,
+        }
+        with open(os.path.join(self.save_dir, "index.jsonl"), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        print(f"Clipe salvo: {clip['path']} ({entry['rule']}, frames {entry['start_frame']}-{entry['end_frame']})")
@@ -0,0 +1,234 @@
+"""
+Decodificadores de vídeo com backends selecionáveis (OpenCV e PyAV/FFmpeg)
+"""
+import os
+import time
+
+import cv2
+
+try:
+    import av
+except ImportError:  # PyAV é opcional
+    av = None
+
+
+def scaled_size(width, height, max_size):
+    """Tamanho (w, h) reduzido para que o maior lado seja no máximo max_size"""
+    if not max_size or max(width, height) <= max_size:
+        return width, height
+    scale = max_size / max(width, height)
+    return int(width * scale), int(height * scale)
+
+
+class VideoDecoder:
+    """
+    Interface comum dos decodificadores
+
+    read() devolve (ok, frame BGR) como o cv2.VideoCapture. O tempo gasto
+    decodificando é medido à parte, para reportar FPS de decodificação
+    separado do FPS de inferência.
+    """
+    name = "base"
+
+    def __init__(self, source, max_size=None):
+        self.source = source
+        self.max_size = max_size  # Sugestão: backends que decodificam já reduzido usam
+        self.position = 0  # Índice do próximo frame a ser lido
+        self._decode_time = 0.0
+        self._decoded = 0
+
+    @property
+    def decode_fps(self):
+        return self._decoded / self._decode_time if self._decode_time > 0 else 0.0
+
+    def read(self):
+        start = time.perf_counter()
+        ok, frame = self._read()
+        self._decode_time += time.perf_counter() - start
+        if ok:
+            self._decoded += 1
+            self.position += 1
+        return ok, frame
+
+    def _read(self):
+        raise NotImplementedError
+
+    def seek(self, frame_index, exact=True):
+        """
+        Posiciona o decodificador
+
+        Args:
+            frame_index: Frame desejado
+            exact: False para no keyframe anterior (mais rápido); True
+                decodifica a partir dele até o frame pedido
+        """
+        raise NotImplementedError
+
+    def isOpened(self):
+        raise NotImplementedError
+
+    def release(self):
+        pass
+
+
+class OpenCVDecoder(VideoDecoder):
+    """cv2.VideoCapture com número de threads e aceleração por hardware configurados"""
+    name = "opencv"
+
+    def __init__(self, source, max_size=None, threads=None):
+        super().__init__(source, max_size)
+        params = []
+        if hasattr(cv2, 'CAP_PROP_N_THREADS'):
+            params += [cv2.CAP_PROP_N_THREADS, threads or os.cpu_count() or 1]
+        if hasattr(cv2, 'CAP_PROP_HW_ACCELERATION'):
+            params += [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+
+        if isinstance(source, int):
+            self.cap = cv2.VideoCapture(source)
+        else:
+            self.cap = cv2.VideoCapture(source, cv2.CAP_FFMPEG, params)
+            if not self.cap.isOpened():
+                self.cap = cv2.VideoCapture(source)
+
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self.frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+    def _read(self):
+        return self.cap.read()
+
+    def seek(self, frame_index, exact=True):
+        # O FFmpeg do OpenCV já busca o keyframe anterior e decodifica até o frame
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+        self.position = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+
+class PyAVDecoder(VideoDecoder):
+    """
+    Decodificação via PyAV/FFmpeg com threads por frame/fatia
+
+    A conversão para BGR é feita pelo swscale já no tamanho reduzido, o que
+    evita materializar o frame 4K inteiro em memória só para redimensioná-lo.
+    """
+    name = "pyav"
+
+    def __init__(self, source, max_size=None):
+        super().__init__(source, max_size)
+        self.container = av.open(source)
+        self.stream = self.container.streams.video[0]
+        self.stream.thread_type = 'AUTO'
+        self._frames = self.container.decode(self.stream)
+
+        self.fps = float(self.stream.average_rate or self.stream.guessed_rate or 30.0)
+        self.frame_count = self.stream.frames or int(
+            (self.container.duration or 0) / av.time_base * self.fps
+        )
+        self.width = self.stream.codec_context.width
+        self.height = self.stream.codec_context.height
+        self._pending = None  # Frame já decodificado durante um seek exato
+
+    def _frame_index(self, frame):
+        if frame.time is None:
+            return self.position
+        start = float(self.stream.start_time * self.stream.time_base) if self.stream.start_time else 0.0
+        return int(round((frame.time - start) * self.fps))
+
+    def _to_bgr(self, frame):
+        width, height = scaled_size(frame.width, frame.height, self.max_size)
+        return frame.to_ndarray(format='bgr24', width=width, height=height)
+
+    def _read(self):
+        if self._pending is not None:
+            frame, self._pending = self._pending, None
+        else:
+            try:
+                frame = next(self._frames)
+            except (StopIteration, av.error.EOFError):
+                return False, None
+        return True, self._to_bgr(frame)
+
+    def seek(self, frame_index, exact=True):
+        start = self.stream.start_time or 0
+        target = start + int(frame_index / self.fps / self.stream.time_base)
+        self.container.seek(target, stream=self.stream, backward=True, any_frame=False)
+        self._frames = self.container.decode(self.stream)
+        self._pending = None
+
+        for frame in self._frames:
+            index = self._frame_index(frame)
+            if not exact or index >= frame_index:
+                self._pending = frame
+                self.position = index
+                return
+        self.position = frame_index
+
+    def isOpened(self):
+        return self.container is not None
+
+    def release(self):
+        if self.container is not None:
+            self.container.close()
+            self.container = None
+
+
+BACKENDS = {'opencv': OpenCVDecoder}
+if av is not None:
+    BACKENDS['pyav'] = PyAVDecoder
+
+
+def probe_backends(source, max_size=None, frames=30):
+    """
+    Mede o FPS de decodificação de cada backend disponível nos primeiros frames
+
+    Returns:
+        dict: nome do backend -> FPS medido (0 se falhou)
+    """
+    scores = {}
+    for name, backend in BACKENDS.items():
+        decoder = None
+        try:
+            decoder = backend(source, max_size=max_size)
+            for _ in range(frames):
+                ok, _ = decoder.read()
+                if not ok:
+                    break
+            scores[name] = decoder.decode_fps
+        except Exception as e:
+            print(f"Backend {name} indisponível para {source}: {e}")
+            scores[name] = 0.0
+        finally:
+            if decoder is not None:
+                decoder.release()
+    return scores
+
+
+def open_decoder(source, backend='auto', max_size=None, probe_frames=30):
+    """
+    Abre o decodificador mais adequado para a fonte
+
+    Args:
+        source: Caminho do vídeo ou índice de câmera
+        backend: 'auto', 'opencv' ou 'pyav'
+        max_size: Maior lado desejado (backends que suportam decodificam já reduzidos)
+        probe_frames: Frames decodificados por backend na sondagem automática
+
+    Returns:
+        VideoDecoder: Decodificador aberto no início do vídeo
+    """
+    if isinstance(source, int) or backend == 'opencv' or len(BACKENDS) == 1:
+        return OpenCVDecoder(source, max_size=max_size)
+    if backend != 'auto':
+        return BACKENDS[backend](source, max_size=max_size)
+
+    scores = probe_backends(source, max_size, probe_frames)
+    best = max(scores, key=scores.get)
+    summary = ", ".join(f"{name}: {fps:.0f} fps" for name, fps in scores.items())
+    print(f"Decodificador escolhido: {best} ({summary})")
+    return BACKENDS[best](source, max_size=max_size)
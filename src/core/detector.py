@@ -0,0 +1,196 @@
+"""
+Wrapper do modelo YOLO com escolha de dispositivo e caminho de pré-processamento
+"""
+import warnings
+
+import torch
+from torch import nn
+from ultralytics import YOLO
+
+from .preprocess import LetterboxPlan, TensorPreprocessor, cuda_available
+
+
+def select_device():
+    """Retorna o dispositivo de inferência ('0' para a GPU primária ou 'cpu')"""
+    return '0' if cuda_available() else 'cpu'
+
+
+def extract_detections(result):
+    """
+    Converte as caixas de um resultado YOLO em lista de detecções
+
+    Args:
+        result: Objeto Results do ultralytics
+
+    Returns:
+        list: Lista de tuplas (nome, confiança)
+    """
+    detections = []
+    for box in result.boxes:
+        cls = int(box.cls)
+        conf = float(box.conf)
+        nome = result.names[cls]
+        detections.append((nome, conf))
+    return detections
+
+
+def quantize_dynamic(model):
+    """
+    Quantização dinâmica INT8 (apenas CPU) das camadas Linear do modelo
+
+    Modelos de detecção YOLO são quase só convoluções e normalmente não têm
+    camadas Linear; nesse caso nada muda e o retorno é 0.
+
+    Args:
+        model: Objeto YOLO do ultralytics (alterado no lugar)
+
+    Returns:
+        int: Número de camadas quantizadas
+    """
+    layers = sum(isinstance(m, nn.Linear) for m in model.model.modules())
+    if layers:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')  # API eager marcada como obsoleta no torch recente
+            model.model = torch.ao.quantization.quantize_dynamic(
+                model.model, {nn.Linear}, dtype=torch.qint8
+            )
+    return layers
+
+
+class Detector:
+    """
+    Modelo YOLO carregado uma vez, com pré-processamento em CPU ou no dispositivo
+
+    preprocess:
+        'auto'   - usa o dispositivo quando há CUDA, senão CPU
+        'device' - sempre usa o caminho de tensores (também funciona em CPU)
+        'cpu'    - deixa o letterbox/normalização para o ultralytics
+
+    half e quantize vêm das variantes do modelo (ver variants.py): half=None
+    usa FP16 sempre que houver GPU; quantize='dynamic' aplica INT8 dinâmico
+    e força a CPU.
+    """
+
+    def __init__(self, model_path, conf=0.5, imgsz=640, preprocess='auto', device=None,
+                 half=None, quantize=None):
+        self.model = YOLO(model_path)
+        self.conf = conf
+        self.imgsz = imgsz
+        self.device = device or select_device()
+
+        self.quantized_layers = 0
+        if quantize == 'dynamic':
+            self.device = 'cpu'  # kernels INT8 dinâmicos só existem em CPU
+            self.quantized_layers = quantize_dynamic(self.model)
+        elif quantize is not None:
+            raise ValueError(f"Quantização desconhecida: {quantize}")
+
+        if half is None:
+            half = self.device != 'cpu'
+        self.half = half and self.device != 'cpu'  # FP16 apenas na GPU
+        self.stride = self._stride()
+
+        if preprocess == 'auto':
+            preprocess = 'device' if self.device != 'cpu' else 'cpu'
+
+        self.preprocessor = None
+        if preprocess == 'device':
+            torch_device = 'cuda:0' if self.device != 'cpu' else 'cpu'
+            self.preprocessor = TensorPreprocessor(
+                torch_device, imgsz=imgsz, stride=self.stride, half=self.half
+            )
+
+    @property
+    def uses_device_preprocess(self):
+        """Indica se o pré-processamento é feito com tensores no dispositivo"""
+        return self.preprocessor is not None
+
+    def _stride(self):
+        try:
+            return int(max(self.model.model.stride))
+        except (AttributeError, TypeError):
+            return 32
+
+    def set_imgsz(self, imgsz):
+        """Altera a resolução de entrada do modelo (ex.: por pressão de memória)"""
+        self.imgsz = imgsz
+        if self.preprocessor is not None:
+            self.preprocessor.set_imgsz(imgsz)
+
+    def _infer(self, source, imgsz=None):
+        return self.model(
+            source,
+            verbose=False,
+            conf=self.conf,
+            imgsz=imgsz or self.imgsz,
+            device=self.device,
+            half=self.half
+        )
+
+    def predict(self, frame, max_size=None, imgsz=None):
+        """
+        Executa a detecção em um frame BGR
+
+        Args:
+            frame: Frame BGR (numpy uint8)
+            max_size: Maior lado do frame de exibição (apenas no caminho do dispositivo;
+                no caminho de CPU o frame deve chegar já redimensionado)
+            imgsz: Tamanho de entrada só para esta chamada (None usa self.imgsz)
+
+        Returns:
+            Results: Resultado com caixas nas coordenadas do frame de exibição
+        """
+        if self.preprocessor is None:
+            return self._infer(frame, imgsz)[0]
+
+        tensor, display = self.preprocessor(frame, max_size, imgsz)
+        result = self._infer(tensor)[0]
+        return self.preprocessor.restore(result, tensor, display)
+
+    def letterbox_plan(self, frame, max_size=None):
+        """LetterboxPlan para os próximos frames da fonte, com o formato de frame e o imgsz atual"""
+        h, w = frame.shape[:2]
+        return LetterboxPlan(w, h, max_size, self.imgsz, self.stride)
+
+    def predict_planned(self, frame, plan):
+        """
+        Executa a detecção com um LetterboxPlan (caminho de CPU para vídeo)
+
+        O frame vai em um passo para a entrada do modelo e o ultralytics
+        recebe o tensor pronto, sem o próprio letterbox.
+
+        Returns:
+            Results: Resultado com caixas nas coordenadas do frame de exibição
+        """
+        tensor, display = plan(frame)
+        result = self._infer(tensor)[0]
+        return plan.restore(result, display)
+
+    def predict_batch(self, frames, max_size=None, imgsz=None):
+        """
+        Executa a detecção em vários frames com uma única chamada ao modelo
+
+        No caminho do dispositivo os tensores só são empilhados quando têm o
+        mesmo formato; caso contrário cada um é inferido separadamente.
+
+        Returns:
+            list: Um Results por frame, na mesma ordem
+        """
+        if not frames:
+            return []
+        if self.preprocessor is None:
+            return list(self._infer(list(frames), imgsz))
+
+        prepared = [self.preprocessor(frame, max_size, imgsz) for frame in frames]
+        if len({tensor.shape for tensor, _ in prepared}) > 1:
+            return [
+                self.preprocessor.restore(self._infer(tensor)[0], tensor, display)
+                for tensor, display in prepared
+            ]
+
+        batch = torch.cat([tensor for tensor, _ in prepared])
+        results = self._infer(batch)
+        return [
+            self.preprocessor.restore(result, tensor, display)
+            for result, (tensor, display) in zip(results, prepared)
+        ]
@@ -0,0 +1,448 @@
+"""
+Avaliação de modelos em um conjunto rotulado: mAP, precisão, recall e latência
+
+Os rótulos seguem o formato YOLO (uma linha "classe cx cy w h" normalizada
+por objeto), em labels/<nome>.txt ao lado da pasta images/ ou no mesmo
+diretório da imagem. As imagens são divididas entre processos, cada um com
+seu Detector (o mesmo núcleo do YOLOThread). Cada resultado entra no arquivo
+de progresso JSONL assim que fica pronto, então uma avaliação interrompida
+continua de onde parou.
+"""
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+import numpy as np
+import torch
+
+from .detector import Detector, select_device
+from .metrics import box_iou
+from .variants import VARIANT_SPECS, detector_options
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff')
+IOU_THRESHOLDS = np.linspace(0.5, 0.95, 10)
+
+# Detector do processo worker (um por processo, criado no inicializador)
+_worker_detector = None
+
+
+def list_images(image_dir):
+    """Imagens da pasta em ordem de nome"""
+    return sorted(
+        os.path.join(image_dir, name)
+        for name in os.listdir(image_dir)
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    )
+
+
+def label_path(image_path):
+    """Arquivo de rótulos da imagem: .../labels/x.txt para .../images/x.jpg, senão ao lado"""
+    stem = os.path.splitext(image_path)[0]
+    parts = stem.split(os.sep)
+    if 'images' in parts:
+        i = len(parts) - 1 - parts[::-1].index('images')
+        candidate = os.sep.join(parts[:i] + ['labels'] + parts[i + 1:]) + '.txt'
+        if os.path.exists(candidate):
+            return candidate
+    return stem + '.txt'
+
+
+def load_labels(image_path, width, height):
+    """
+    Lê os rótulos YOLO da imagem em pixels
+
+    Returns:
+        np.ndarray: Array (N, 5) [x1, y1, x2, y2, classe]; vazio sem arquivo (imagem sem objetos)
+    """
+    path = label_path(image_path)
+    if not os.path.exists(path):
+        return np.zeros((0, 5))
+    rows = np.loadtxt(path, ndmin=2)
+    if rows.size == 0:
+        return np.zeros((0, 5))
+    cls, cx, cy, w, h = rows[:, :5].T
+    return np.stack([
+        (cx - w / 2) * width, (cy - h / 2) * height,
+        (cx + w / 2) * width, (cy + h / 2) * height, cls,
+    ], axis=1)
+
+
+def match_predictions(pred, gt, iou_thresholds=IOU_THRESHOLDS):
+    """
+    Marca cada predição como acerto ou não, para cada limiar de IoU
+
+    Em ordem de confiança, cada predição fica com a caixa rotulada livre de
+    mesma classe com maior IoU (padrão COCO).
+
+    Args:
+        pred: Array (M, 6) [x1, y1, x2, y2, conf, classe]
+        gt: Array (N, 5) [x1, y1, x2, y2, classe]
+
+    Returns:
+        np.ndarray: Matriz booleana (M, len(iou_thresholds)) na ordem de pred
+    """
+    pred = np.asarray(pred, dtype=np.float64).reshape(-1, 6)
+    gt = np.asarray(gt, dtype=np.float64).reshape(-1, 5)
+    tp = np.zeros((len(pred), len(iou_thresholds)), dtype=bool)
+    if not len(pred) or not len(gt):
+        return tp
+
+    iou = box_iou(pred[:, :4], gt[:, :4])
+    iou[pred[:, 5][:, None] != gt[:, 4][None, :]] = 0.0
+    order = np.argsort(-pred[:, 4], kind='stable')
+    for t, threshold in enumerate(iou_thresholds):
+        taken = np.zeros(len(gt), dtype=bool)
+        for i in order:
+            candidates = np.where(taken, 0.0, iou[i])
+            j = int(candidates.argmax())
+            if candidates[j] >= threshold:
+                taken[j] = True
+                tp[i, t] = True
+    return tp
+
+
+def average_precision(recall, precision):
+    """AP por interpolação em 101 pontos de recall (COCO)"""
+    envelope = np.maximum.accumulate(np.concatenate([[0.0], precision, [0.0]])[::-1])[::-1]
+    recall = np.concatenate([[0.0], recall, [1.0]])
+    points = np.linspace(0, 1, 101)
+    idx = np.searchsorted(recall, points, side='left')
+    return float(envelope[np.minimum(idx, len(envelope) - 1)].mean())
+
+
+def detection_metrics(records, names, conf=0.5):
+    """
+    mAP50, mAP50-95 e precisão/recall no limiar de confiança
+
+    Args:
+        records: Registros de imagem com 'pred' (M, 6) e 'gt' (N, 5)
+        names: Nomes das classes do modelo (dict índice -> nome)
+        conf: Confiança usada para precisão e recall (a do aplicativo)
+
+    Returns:
+        dict: Métricas gerais e por classe (apenas classes presentes nos rótulos)
+    """
+    confs, classes, hits, gt_classes = [], [], [], []
+    for record in records:
+        pred = np.asarray(record['pred'], dtype=np.float64).reshape(-1, 6)
+        gt = np.asarray(record['gt'], dtype=np.float64).reshape(-1, 5)
+        hits.append(match_predictions(pred, gt))
+        confs.append(pred[:, 4])
+        classes.append(pred[:, 5])
+        gt_classes.append(gt[:, 4])
+    confs = np.concatenate(confs) if confs else np.zeros(0)
+    classes = np.concatenate(classes) if classes else np.zeros(0)
+    hits = np.concatenate(hits) if hits else np.zeros((0, len(IOU_THRESHOLDS)), dtype=bool)
+    gt_classes = np.concatenate(gt_classes) if gt_classes else np.zeros(0)
+
+    per_class = {}
+    for cls in np.unique(gt_classes).astype(int):
+        n_gt = int((gt_classes == cls).sum())
+        mask = classes == cls
+        order = np.argsort(-confs[mask], kind='stable')
+        cls_hits = hits[mask][order]
+        tp = np.cumsum(cls_hits, axis=0)
+        fp = np.cumsum(~cls_hits, axis=0)
+        ap = [
+            average_precision(tp[:, t] / n_gt, tp[:, t] / np.maximum(tp[:, t] + fp[:, t], 1))
+            for t in range(len(IOU_THRESHOLDS))
+        ]
+        per_class[names.get(cls, str(cls))] = {
+            'instances': n_gt, 'ap50': round(ap[0], 4), 'ap50_95': round(float(np.mean(ap)), 4),
+        }
+
+    kept = confs >= conf
+    true_pos = int(hits[kept, 0].sum())
+    return {
+        'map50': round(float(np.mean([c['ap50'] for c in per_class.values()])), 4) if per_class else 0.0,
+        'map50_95': round(float(np.mean([c['ap50_95'] for c in per_class.values()])), 4) if per_class else 0.0,
+        'precision': round(true_pos / max(int(kept.sum()), 1), 4),
+        'recall': round(true_pos / max(len(gt_classes), 1), 4),
+        'instances': int(len(gt_classes)),
+        'per_class': per_class,
+    }
+
+
+def profile_specs(model_path, names=None):
+    """
+    Perfis de inferência (receitas de variants.py) aplicáveis nesta máquina
+
+    Args:
+        names: Nomes dos perfis desejados (None = todos)
+    """
+    device = select_device()
+    specs = []
+    for spec in VARIANT_SPECS:
+        if names and spec['name'] not in names:
+            continue
+        if spec.get('gpu_only') and device == 'cpu':
+            print(f"Perfil {spec['name']}: só se aplica com GPU")
+            continue
+        if spec.get('quantize') and not Detector(model_path, **detector_options(spec)).quantized_layers:
+            print(f"Perfil {spec['name']}: modelo sem camadas Linear, quantização dinâmica não se aplica")
+            continue
+        specs.append(spec)
+    return specs
+
+
+def _init_worker(model_path, options, conf, threads, ready):
+    global _worker_detector
+    torch.set_num_threads(threads)  # processos dividem os núcleos em vez de disputá-los
+    _worker_detector = Detector(model_path, conf=conf, **options)
+    _worker_detector.predict(np.zeros((480, 640, 3), dtype=np.uint8))  # aquecimento fora da medição
+    try:
+        ready.wait(300)  # todos os workers carregados antes de medir a vazão
+    except threading.BrokenBarrierError:
+        pass
+
+
+def _worker_ready(_):
+    return _worker_detector.model.names
+
+
+def _evaluate_image(path):
+    frame = cv2.imread(path)
+    if frame is None:
+        return {'image': path, 'error': "imagem ilegível"}
+
+    start = time.perf_counter()
+    result = _worker_detector.predict(frame)
+    latency = (time.perf_counter() - start) * 1000
+
+    h, w = frame.shape[:2]
+    return {
+        'image': path,
+        'latency_ms': round(latency, 3),
+        'pred': np.round(result.boxes.data.cpu().numpy()[:, :6], 3).tolist(),
+        'gt': np.round(load_labels(path, w, h), 3).tolist(),
+    }
+
+
+class DatasetEvaluation:
+    """
+    Avalia um modelo em um perfil de inferência sobre uma pasta de imagens rotuladas
+
+    Uso:
+        evaluation = DatasetEvaluation("yolov8n.pt", "data_test/images", profile={'name': 'imgsz480', 'imgsz': 480})
+        summary = evaluation.run(workers=4)
+
+    O progresso fica em <out_dir>/<modelo>-<hash>__<perfil>.jsonl (hash do
+    caminho absoluto, para que best.pt de treinos diferentes não se misturem):
+    uma linha de cabeçalho (modelo e configuração), uma com os nomes das
+    classes, uma por imagem e uma por execução (imagens e tempo de parede,
+    para a vazão). Se o modelo ou a configuração mudarem, o arquivo é refeito
+    do zero. O resumo de cada execução fica em <...>.summary.json, de onde
+    write_report monta o relatório com todas as combinações já avaliadas.
+    """
+
+    def __init__(self, model_path, image_dir, profile=None, out_dir=os.path.join("resultados", "avaliacao"),
+                 conf=0.001, report_conf=0.5):
+        self.model_path = model_path
+        self.image_dir = image_dir
+        self.profile = profile or VARIANT_SPECS[0]
+        self.options = detector_options(self.profile)
+        self.conf = conf  # baixa, para a curva precisão x recall do mAP
+        self.report_conf = report_conf  # a do aplicativo, para precisão e recall
+        self.out_dir = out_dir
+        self.names = {}  # índice -> nome, vindo dos workers ou do progresso
+        digest = hashlib.sha1(os.path.abspath(model_path).encode('utf-8')).hexdigest()[:8]
+        self.model_id = f"{os.path.splitext(os.path.basename(model_path))[0]}-{digest}"
+        self.progress_path = os.path.join(out_dir, f"{self.model_id}__{self.profile['name']}.jsonl")
+        self.summary_path = os.path.join(out_dir, f"{self.model_id}__{self.profile['name']}.summary.json")
+
+    def _header(self):
+        stat = os.stat(self.model_path)
+        return {
+            'model': os.path.abspath(self.model_path),
+            'model_size': stat.st_size,
+            'model_mtime': int(stat.st_mtime),
+            'profile': self.profile['name'],
+            'options': self.options,
+            'conf': self.conf,
+        }
+
+    def _load_progress(self):
+        """Registros já gravados, ou None se o arquivo não vale para esta configuração"""
+        if not os.path.exists(self.progress_path):
+            return None
+        header, records, runs = None, {}, []
+        with open(self.progress_path, encoding='utf-8') as f:
+            lines = f.read().split("\n")
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # linha vazia ou cortada por uma interrupção
+            if 'header' in entry:
+                header = entry['header']
+            elif 'names' in entry:
+                self.names = {int(k): v for k, v in entry['names'].items()}  # JSON só tem chaves texto
+            elif 'run' in entry:
+                runs.append(entry['run'])
+            elif 'image' in entry:
+                records[entry['image']] = entry
+        if header != self._header():
+            print(f"Progresso de outra configuração em {self.progress_path}; recomeçando")
+            return None
+        if lines[-1]:
+            # Linha cortada no fim: as próximas começam em uma linha nova
+            with open(self.progress_path, 'a', encoding='utf-8') as f:
+                f.write("\n")
+        return records, runs
+
+    def run(self, workers=None, progress=None):
+        """
+        Avalia as imagens que ainda não estão no progresso e resume tudo
+
+        Args:
+            workers: Processos de inferência (None: 1 com GPU, metade dos núcleos em CPU)
+            progress: Callback opcional progress(feitas, total)
+
+        Returns:
+            dict: Resumo (ver summarize)
+        """
+        paths = list_images(self.image_dir)
+        os.makedirs(self.out_dir, exist_ok=True)
+
+        loaded = self._load_progress()
+        if loaded is None:
+            with open(self.progress_path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({'header': self._header()}, ensure_ascii=False) + "\n")
+            records, runs = {}, []
+        else:
+            records, runs = loaded
+
+        pending = [path for path in paths if path not in records]
+        if pending:
+            cpus = os.cpu_count() or 1
+            if workers is None:
+                workers = 1 if select_device() != 'cpu' else max(1, cpus // 2)
+            workers = max(1, min(workers, len(pending)))
+            print(f"{self.profile['name']}: {len(pending)} de {len(paths)} imagens pendentes, {workers} processo(s)")
+            runs.append(self._process(pending, workers, max(1, cpus // workers), records, len(paths), progress))
+
+        summary = self.summarize([records[path] for path in paths if path in records], runs)
+        with open(self.summary_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        return summary
+
+    def _process(self, pending, workers, threads, records, total, progress):
+        # spawn: processos limpos também no Linux (fork com CUDA já iniciado quebra)
+        ctx = mp.get_context('spawn')
+        done = 0
+        start = time.perf_counter()
+        with open(self.progress_path, 'a', encoding='utf-8') as log, ProcessPoolExecutor(
+            workers, mp_context=ctx, initializer=_init_worker,
+            initargs=(self.model_path, self.options, self.conf, threads, ctx.Barrier(workers))
+        ) as pool:
+            # Uma tarefa por worker cria todos os processos; carregar o modelo não entra na vazão
+            names = list(pool.map(_worker_ready, range(workers)))[0]
+            if not self.names:
+                self.names = dict(names)
+                log.write(json.dumps({'names': self.names}, ensure_ascii=False) + "\n")
+            start = time.perf_counter()
+            futures = [pool.submit(_evaluate_image, path) for path in pending]
+            try:
+                for future in as_completed(futures):
+                    record = future.result()
+                    if 'error' in record:
+                        print(f"Ignorando {record['image']}: {record['error']}")
+                        continue
+                    records[record['image']] = record
+                    log.write(json.dumps(record) + "\n")
+                    log.flush()  # o que foi gravado sobrevive a uma interrupção
+                    done += 1
+                    if progress is not None:
+                        progress(len(records), total)
+            except KeyboardInterrupt:
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+            finally:
+                run = {'images': done, 'wall_s': round(time.perf_counter() - start, 3), 'workers': workers}
+                log.write(json.dumps({'run': run}) + "\n")
+        return run
+
+    def summarize(self, records, runs):
+        """
+        Junta acurácia e velocidade de todas as execuções
+
+        Returns:
+            dict: modelo, perfil, métricas de detecção, latência (média, p50, p95) e imagens/s
+        """
+        latencies = np.array([record['latency_ms'] for record in records])
+        images = sum(run['images'] for run in runs)
+        wall = sum(run['wall_s'] for run in runs)
+        summary = {
+            'model': self.model_id,
+            'model_path': os.path.abspath(self.model_path),
+            'profile': self.profile['name'],
+            'device': 'cpu' if select_device() == 'cpu' or self.profile.get('quantize') else 'gpu',
+            'images': len(records),
+            'workers': runs[-1]['workers'] if runs else 0,
+            **detection_metrics(records, self.names, self.report_conf),
+            'latency_ms': {
+                'mean': round(float(latencies.mean()), 2) if len(latencies) else 0.0,
+                'p50': round(float(np.percentile(latencies, 50)), 2) if len(latencies) else 0.0,
+                'p95': round(float(np.percentile(latencies, 95)), 2) if len(latencies) else 0.0,
+            },
+            'images_per_s': round(images / wall, 2) if wall > 0 else 0.0,
+        }
+        return summary
+
+
+def stored_summaries(out_dir=os.path.join("resultados", "avaliacao")):
+    """Resumos gravados em out_dir por DatasetEvaluation.run (esta e as execuções anteriores)"""
+    if not os.path.isdir(out_dir):
+        return []
+    summaries = []
+    for name in sorted(os.listdir(out_dir)):
+        if name.endswith(".summary.json"):
+            with open(os.path.join(out_dir, name), encoding='utf-8') as f:
+                summaries.append(json.load(f))
+    return summaries
+
+
+def write_report(out_dir=os.path.join("resultados", "avaliacao")):
+    """
+    Grava report.json e report.md com uma linha por modelo e perfil já avaliado
+
+    O relatório sai de todos os resumos em out_dir, não só os desta
+    execução: avaliar um subconjunto de modelos ou perfis não apaga as
+    outras linhas. A coluna "fronteira" marca as combinações que nenhuma
+    outra supera ao mesmo tempo em mAP50-95 e em imagens/s.
+
+    Returns:
+        str ou None: Caminho do report.md (None se nada foi avaliado ainda)
+    """
+    summaries = stored_summaries(out_dir)
+    if not summaries:
+        return None
+    for s in summaries:
+        s['pareto'] = not any(
+            o is not s and o['map50_95'] >= s['map50_95'] and o['images_per_s'] >= s['images_per_s']
+            and (o['map50_95'] > s['map50_95'] or o['images_per_s'] > s['images_per_s'])
+            for o in summaries
+        )
+
+    with open(os.path.join(out_dir, "report.json"), 'w', encoding='utf-8') as f:
+        json.dump(summaries, f, indent=2, ensure_ascii=False)
+
+    lines = [
+        "| Modelo | Perfil | Disp. | Imagens | mAP50 | mAP50-95 | P | R | ms p50 | ms p95 | img/s | Fronteira |",
+        "|---|---|---|---|---|---|---|---|---|---|---|---|",
+    ]
+    for s in sorted(summaries, key=lambda s: (-s['map50_95'], -s['images_per_s'])):
+        lines.append(
+            f"| {s['model']} | {s['profile']} | {s['device']} | {s['images']} | {s['map50']:.3f} | "
+            f"{s['map50_95']:.3f} | {s['precision']:.3f} | {s['recall']:.3f} | {s['latency_ms']['p50']:.1f} | "
+            f"{s['latency_ms']['p95']:.1f} | {s['images_per_s']:.1f} | {'✔' if s['pareto'] else ''} |"
+        )
+    path = os.path.join(out_dir, "report.md")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+    return path
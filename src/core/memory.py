@@ -0,0 +1,151 @@
+"""
+Governador de memória para execuções longas
+"""
+import psutil
+import torch
+
+
+MB = 1024 * 1024
+
+
+class MemoryGovernor:
+    """
+    Acompanha a memória do processo (RSS) e do dispositivo e degrada a carga
+
+    Cada nível acima de zero reduz profundidade de filas, tamanho de lote,
+    resolução dos frames e imgsz do modelo. Fila e lote só são controlados
+    quando o chamador os informa (queue_depth/batch_size None = sem fila ou
+    lote, e ficam fora do status). Quando a memória passa do limite
+    o nível sobe imediatamente; ele só volta a descer depois de algumas
+    verificações seguidas abaixo de recover_ratio * limite, para não oscilar.
+
+    Limites padrão: 40% da RAM total e 80% da memória da GPU.
+    """
+
+    LEVELS = [
+        # (fator de max_size, imgsz, divisor de fila/lote)
+        (1.0, 640, 1),
+        (0.75, 512, 2),
+        (0.6, 416, 4),
+        (0.5, 320, 8),
+    ]
+
+    def __init__(self, rss_limit_mb=None, device_limit_mb=None, max_size=1280,
+                 queue_depth=4, batch_size=1, check_interval=15,
+                 recover_ratio=0.8, recover_checks=8):
+        self.process = psutil.Process()
+        self.has_device = torch.cuda.is_available()
+
+        if rss_limit_mb is None:
+            rss_limit_mb = psutil.virtual_memory().total * 0.4 / MB
+        if device_limit_mb is None and self.has_device:
+            device_limit_mb = torch.cuda.get_device_properties(0).total_memory * 0.8 / MB
+
+        self.rss_limit_mb = rss_limit_mb
+        self.device_limit_mb = device_limit_mb
+        self.base_max_size = max_size
+        self.base_queue_depth = queue_depth
+        self.base_batch_size = batch_size
+        self.check_interval = check_interval
+        self.recover_ratio = recover_ratio
+        self.recover_checks = recover_checks
+
+        self.level = 0
+        self._ticks = 0
+        self._below = 0
+        self.rss_mb = 0.0
+        self.device_mb = 0.0
+
+    @property
+    def max_size(self):
+        return int(self.base_max_size * self.LEVELS[self.level][0])
+
+    @property
+    def imgsz(self):
+        return self.LEVELS[self.level][1]
+
+    @property
+    def queue_depth(self):
+        if self.base_queue_depth is None:
+            return None
+        return max(1, self.base_queue_depth // self.LEVELS[self.level][2])
+
+    @property
+    def batch_size(self):
+        if self.base_batch_size is None:
+            return None
+        return max(1, self.base_batch_size // self.LEVELS[self.level][2])
+
+    def sample(self):
+        """Lê RSS e memória reservada no dispositivo (em MB)"""
+        self.rss_mb = self.process.memory_info().rss / MB
+        if self.has_device:
+            self.device_mb = torch.cuda.memory_reserved() / MB
+        return self.rss_mb, self.device_mb
+
+    def _pressure(self):
+        """Maior razão uso/limite entre RAM e dispositivo"""
+        ratios = [self.rss_mb / self.rss_limit_mb] if self.rss_limit_mb else []
+        if self.has_device and self.device_limit_mb:
+            ratios.append(self.device_mb / self.device_limit_mb)
+        return max(ratios, default=0.0)
+
+    def update(self):
+        """
+        Deve ser chamado a cada frame; mede a memória a cada check_interval chamadas
+
+        Returns:
+            dict ou None: Decisão tomada quando o nível muda, senão None
+        """
+        self._ticks += 1
+        if self._ticks % self.check_interval:
+            return None
+
+        self.sample()
+        pressure = self._pressure()
+        previous = self.level
+
+        if pressure >= 1.0:
+            self._below = 0
+            if self.level < len(self.LEVELS) - 1:
+                self.level += 1
+            if self.has_device:
+                # Devolve ao driver os blocos livres do cache do PyTorch
+                torch.cuda.empty_cache()
+        elif pressure < self.recover_ratio and self.level > 0:
+            self._below += 1
+            if self._below >= self.recover_checks:
+                self._below = 0
+                self.level -= 1
+        else:
+            self._below = 0
+
+        if self.level == previous:
+            return None
+
+        decision = self.status()
+        decision['reason'] = (
+            f"pressão de memória {pressure:.0%}: nível {previous} -> {self.level}"
+        )
+        applied = f"max_size={self.max_size}, imgsz={self.imgsz}"
+        if self.queue_depth is not None:
+            applied += f", fila={self.queue_depth}"
+        if self.batch_size is not None:
+            applied += f", lote={self.batch_size}"
+        print(f"[Memória] {decision['reason']} ({applied})")
+        return decision
+
+    def status(self):
+        """Estado atual para exibição na interface"""
+        status = {
+            'rss_mb': round(self.rss_mb, 1),
+            'device_mb': round(self.device_mb, 1),
+            'level': self.level,
+            'max_size': self.max_size,
+            'imgsz': self.imgsz,
+        }
+        if self.queue_depth is not None:
+            status['queue_depth'] = self.queue_depth
+        if self.batch_size is not None:
+            status['batch_size'] = self.batch_size
+        return status
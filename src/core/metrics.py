@@ -0,0 +1,64 @@
+"""
+Métricas para comparar conjuntos de detecções
+"""
+import numpy as np
+
+
+def box_iou(boxes_a, boxes_b):
+    """
+    Calcula a matriz de IoU entre dois conjuntos de caixas xyxy
+
+    Args:
+        boxes_a: Array (N, 4)
+        boxes_b: Array (M, 4)
+
+    Returns:
+        np.ndarray: Matriz (N, M) de IoU
+    """
+    a = np.asarray(boxes_a, dtype=np.float64).reshape(-1, 4)
+    b = np.asarray(boxes_b, dtype=np.float64).reshape(-1, 4)
+
+    tl = np.maximum(a[:, None, :2], b[None, :, :2])
+    br = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    inter = np.clip(br - tl, 0, None).prod(axis=2)
+
+    area_a = (a[:, 2:] - a[:, :2]).prod(axis=1)
+    area_b = (b[:, 2:] - b[:, :2]).prod(axis=1)
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-12), 0.0)
+
+
+def match_detections(reference, candidate, iou_threshold=0.5):
+    """
+    Associa detecções de mesma classe de forma gulosa pela maior IoU
+
+    Args:
+        reference: Array (N, 6) no formato [x1, y1, x2, y2, conf, cls]
+        candidate: Array (M, 6) no mesmo formato
+        iou_threshold: IoU mínima para considerar um par
+
+    Returns:
+        tuple: (lista de pares (i, j, iou), índices sem par em reference,
+                índices sem par em candidate)
+    """
+    reference = np.asarray(reference, dtype=np.float64).reshape(-1, 6)
+    candidate = np.asarray(candidate, dtype=np.float64).reshape(-1, 6)
+
+    iou = box_iou(reference[:, :4], candidate[:, :4])
+    iou[reference[:, 5][:, None] != candidate[:, 5][None, :]] = 0.0
+
+    pairs = []
+    used_ref, used_cand = set(), set()
+    for flat in np.argsort(-iou, axis=None):
+        i, j = np.unravel_index(flat, iou.shape)
+        if iou[i, j] < iou_threshold:
+            break
+        if i in used_ref or j in used_cand:
+            continue
+        used_ref.add(i)
+        used_cand.add(j)
+        pairs.append((int(i), int(j), float(iou[i, j])))
+
+    unmatched_ref = [i for i in range(len(reference)) if i not in used_ref]
+    unmatched_cand = [j for j in range(len(candidate)) if j not in used_cand]
+    return pairs, unmatched_ref, unmatched_cand
@@ -0,0 +1,118 @@
+"""
+Gravação assíncrona de resultados anotados com índice de metadados opcional
+"""
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+import cv2
+
+
+class ResultWriter:
+    """
+    Grava imagens de resultado em segundo plano
+
+    O nome do arquivo é derivado do conteúdo da imagem anotada, então execuções
+    concorrentes nunca sobrescrevem umas às outras e resultados idênticos não
+    são gravados duas vezes. A codificação JPEG e o I/O acontecem em uma
+    thread própria; quem chama só paga o hash.
+
+    index:
+        None     - apenas as imagens
+        'json'   - acrescenta uma linha por resultado em index.jsonl
+        'sqlite' - tabela results em index.sqlite
+    """
+
+    def __init__(self, save_dir="resultados", index="sqlite", jpeg_quality=95):
+        self.save_dir = save_dir
+        self.index = index
+        self.jpeg_quality = jpeg_quality
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="ResultWriter", daemon=True)
+        self._worker.start()
+
+    def submit(self, image_bgr, detections=None, source_path=None):
+        """
+        Agenda a gravação de um resultado
+
+        Args:
+            image_bgr: Imagem anotada (numpy BGR). Não deve ser alterada depois.
+            detections: Lista de (nome, confiança) para o índice
+            source_path: Caminho da imagem de origem para o índice
+
+        Returns:
+            str: Caminho onde o resultado estará quando a gravação terminar
+        """
+        digest = hashlib.blake2b(image_bgr.tobytes(), digest_size=12)
+        digest.update(repr(image_bgr.shape).encode())
+        name = digest.hexdigest()
+        output_path = os.path.join(self.save_dir, f"{name}.jpg")
+        self._queue.put((name, output_path, image_bgr, detections or [], source_path))
+        return output_path
+
+    def close(self, timeout=5.0):
+        """Termina a gravação pendente e encerra a thread"""
+        self._queue.put(None)
+        self._worker.join(timeout)
+
+    def _run(self):
+        os.makedirs(self.save_dir, exist_ok=True)
+        db = self._open_index()
+
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            name, output_path, image, detections, source_path = item
+            try:
+                if not os.path.exists(output_path):
+                    tmp_path = output_path + ".tmp.jpg"
+                    cv2.imwrite(tmp_path, image, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+                    os.replace(tmp_path, output_path)
+                self._write_index(db, name, output_path, source_path, detections)
+            except Exception as e:
+                print(f"Erro ao salvar resultado {output_path}: {e}")
+
+        if db is not None:
+            db.close()
+
+    def _open_index(self):
+        if self.index != "sqlite":
+            return None
+
+        db = sqlite3.connect(os.path.join(self.save_dir, "index.sqlite"))
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                hash TEXT,
+                path TEXT,
+                source TEXT,
+                created_at REAL,
+                detections TEXT
+            )
+        """)
+        return db
+
+    def _write_index(self, db, name, output_path, source_path, detections):
+        record = {
+            "hash": name,
+            "path": output_path,
+            "source": source_path,
+            "created_at": time.time(),
+            "detections": [{"nome": nome, "conf": round(conf, 4)} for nome, conf in detections],
+        }
+
+        if self.index == "json":
+            with open(os.path.join(self.save_dir, "index.jsonl"), "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        elif db is not None:
+            db.execute(
+                "INSERT INTO results VALUES (?, ?, ?, ?, ?)",
+                (name, output_path, source_path, record["created_at"],
+                 json.dumps(record["detections"], ensure_ascii=False))
+            )
+            db.commit()
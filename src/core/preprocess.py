@@ -0,0 +1,209 @@
+"""
+Pré-processamento de frames para o modelo YOLO
+
+TensorPreprocessor faz tudo no dispositivo (GPU); LetterboxPlan é o caminho
+de CPU para vídeo, com geometria e buffers calculados uma vez por fonte.
+"""
+import math
+
+import cv2
+import numpy as np
+import torch
+import torch.nn.functional as F
+from ultralytics.engine.results import Results
+from ultralytics.utils import ops
+
+from .decoders import scaled_size
+
+
+def cuda_available():
+    """Indica se existe um dispositivo CUDA utilizável"""
+    return torch.cuda.is_available()
+
+
+class TensorPreprocessor:
+    """
+    Faz redimensionamento, letterbox e normalização de frames como tensores
+
+    O frame BGR decodificado é enviado uma única vez ao dispositivo (memória
+    fixada + cópia não bloqueante) e todo o restante acontece lá. O resultado
+    é um tensor BCHW pronto para o modelo, o que faz o ultralytics pular o
+    seu próprio pré-processamento em CPU.
+    """
+
+    PAD_VALUE = 114 / 255.0
+
+    def __init__(self, device, imgsz=640, stride=32, half=False):
+        self.device = torch.device(device)
+        self.imgsz = round_to_stride(imgsz, stride)
+        self.stride = stride
+        self.half = half and self.device.type == 'cuda'
+        self.dtype = torch.float16 if self.half else torch.float32
+        self._pinned = None
+
+    def set_imgsz(self, imgsz):
+        """Altera o tamanho de entrada do modelo"""
+        self.imgsz = round_to_stride(imgsz, self.stride)
+
+    def _upload(self, frame):
+        """Envia o frame HWC uint8 ao dispositivo"""
+        host = torch.from_numpy(frame)
+        if self.device.type != 'cuda':
+            return host
+
+        if self._pinned is None or self._pinned.shape != host.shape:
+            self._pinned = torch.empty(host.shape, dtype=torch.uint8, pin_memory=True)
+        self._pinned.copy_(host)
+        return self._pinned.to(self.device, non_blocking=True)
+
+    def _letterbox_shape(self, h, w, imgsz):
+        return letterbox_shape(h, w, imgsz, self.stride)
+
+    def __call__(self, frame, max_size=None, imgsz=None):
+        """
+        Prepara um frame para inferência
+
+        Args:
+            frame: Frame BGR (numpy uint8, HWC) como saiu do decodificador
+            max_size: Maior lado do frame de exibição (None mantém o original)
+            imgsz: Tamanho de entrada só para esta chamada (None usa self.imgsz)
+
+        Returns:
+            tuple: (tensor 1x3xHxW normalizado, frame BGR de exibição)
+        """
+        h, w = frame.shape[:2]
+        x = self._upload(frame).permute(2, 0, 1).unsqueeze(0).float()
+
+        display = frame
+        if max_size and max(h, w) > max_size:
+            scale = max_size / max(h, w)
+            h, w = int(h * scale), int(w * scale)
+            x = F.interpolate(x, size=(h, w), mode='bilinear', align_corners=False)
+            display = x.round().clamp_(0, 255).to(torch.uint8)[0].permute(1, 2, 0).contiguous().cpu().numpy()
+
+        imgsz = round_to_stride(imgsz, self.stride) if imgsz else self.imgsz
+        (new_h, new_w), padding = self._letterbox_shape(h, w, imgsz)
+        x = x.flip(1).div_(255.0)  # BGR -> RGB, 0-1
+        if (new_h, new_w) != (h, w):
+            x = F.interpolate(x, size=(new_h, new_w), mode='bilinear', align_corners=False)
+        x = F.pad(x, padding, value=self.PAD_VALUE)
+        return x.to(self.dtype).contiguous(), display
+
+    @staticmethod
+    def restore(result, tensor, display):
+        """
+        Reconstrói o resultado nas coordenadas do frame de exibição
+
+        Args:
+            result: Results retornado pelo modelo para o tensor
+            tensor: Tensor de entrada usado na inferência
+            display: Frame BGR onde as caixas serão desenhadas
+
+        Returns:
+            Results: Resultado com caixas mapeadas e imagem original = display
+        """
+        boxes = result.boxes.data.clone()
+        boxes[:, :4] = ops.scale_boxes(tensor.shape[2:], boxes[:, :4], display.shape)
+        return Results(display, path=result.path, names=result.names, boxes=boxes)
+
+
+class LetterboxPlan:
+    """
+    Geometria e buffers de pré-processamento fixos para os frames de uma fonte
+
+    Calculado uma vez quando o vídeo abre (e refeito só se o tamanho do frame,
+    max_size ou imgsz mudarem). Cada frame é redimensionado em um passo do
+    tamanho decodificado direto para a entrada do modelo, dentro de um buffer
+    com as bordas já preenchidas, e convertido para um tensor CHW float também
+    reutilizado; o ultralytics recebe o tensor e pula o próprio letterbox. O
+    frame de exibição (onde as caixas são desenhadas) é outro resize a partir
+    da fonte, e as caixas são levadas até ele por restore().
+
+    Os arrays devolvidos são reutilizados: valem até a próxima chamada.
+
+    Uso:
+        plan = LetterboxPlan(1920, 1080, max_size=1280, imgsz=640)
+        tensor, display = plan(frame)
+        result = plan.restore(model(tensor)[0], display)
+    """
+
+    def __init__(self, width, height, max_size, imgsz, stride=32):
+        self.key = (width, height, max_size, imgsz)
+        self.source_size = (width, height)
+        self.display_size = scaled_size(width, height, max_size)
+
+        imgsz = round_to_stride(imgsz, stride)
+        (new_h, new_w), (left, right, top, bottom) = letterbox_shape(height, width, imgsz, stride)
+        self.resized_size = (new_w, new_h)
+        self.offset = (left, top)
+
+        pad = round(TensorPreprocessor.PAD_VALUE * 255)
+        self._input = np.full((top + new_h + bottom, left + new_w + right, 3), pad, dtype=np.uint8)
+        self._resized = self._input[top:top + new_h, left:left + new_w]
+        self._chw = np.empty((3,) + self._input.shape[:2], dtype=np.float32)
+        self._tensor = torch.from_numpy(self._chw).unsqueeze(0)  # compartilha a memória de _chw
+        self._display = None
+        if self.display_size != self.source_size:
+            self._display = np.empty((self.display_size[1], self.display_size[0], 3), dtype=np.uint8)
+
+        # Entrada do modelo -> frame de exibição: tira a borda e aplica a razão entre os tamanhos
+        self._box_scale = torch.tensor([
+            self.display_size[0] / new_w, self.display_size[1] / new_h,
+        ] * 2)
+        self._box_offset = torch.tensor([left, top] * 2, dtype=torch.float32)
+
+    def fits(self, frame, max_size, imgsz):
+        """Indica se o plano ainda vale para este frame e configuração"""
+        h, w = frame.shape[:2]
+        return self.key == (w, h, max_size, imgsz)
+
+    def display(self, frame):
+        """Frame de exibição (reduzido para max_size) no buffer do plano"""
+        if self._display is None:
+            return frame
+        return cv2.resize(frame, self.display_size, dst=self._display)
+
+    def __call__(self, frame):
+        """
+        Prepara um frame BGR da fonte
+
+        Returns:
+            tuple: (tensor 1x3xHxW RGB 0-1, frame BGR de exibição)
+        """
+        cv2.resize(frame, self.resized_size, dst=self._resized)
+        # BGR HWC uint8 -> RGB CHW float 0-1, sem arrays intermediários
+        np.multiply(self._input[..., ::-1].transpose(2, 0, 1), 1 / 255.0, out=self._chw, casting='unsafe')
+        return self._tensor, self.display(frame)
+
+    def restore(self, result, display):
+        """Resultado com as caixas nas coordenadas do frame de exibição"""
+        boxes = result.boxes.data.clone()
+        if len(boxes):
+            offset = self._box_offset.to(boxes.device)
+            scale = self._box_scale.to(boxes.device)
+            boxes[:, :4] = (boxes[:, :4] - offset) * scale
+            w, h = self.display_size
+            boxes[:, 0:4:2] = boxes[:, 0:4:2].clamp(0, w)
+            boxes[:, 1:4:2] = boxes[:, 1:4:2].clamp(0, h)
+        return Results(display, path=result.path, names=result.names, boxes=boxes)
+
+
+def letterbox_shape(h, w, imgsz, stride=32):
+    """
+    Tamanho redimensionado e bordas no mesmo padrão do LetterBox do ultralytics
+
+    Returns:
+        tuple: ((new_h, new_w), (left, right, top, bottom))
+    """
+    r = min(imgsz / h, imgsz / w)
+    new_w, new_h = int(round(w * r)), int(round(h * r))
+    dw = (imgsz - new_w) % stride / 2
+    dh = (imgsz - new_h) % stride / 2
+    top, bottom = int(round(dh - 0.1)), int(round(dh + 0.1))
+    left, right = int(round(dw - 0.1)), int(round(dw + 0.1))
+    return (new_h, new_w), (left, right, top, bottom)
+
+
+def round_to_stride(size, stride):
+    """Arredonda um tamanho para o múltiplo de stride mais próximo acima"""
+    return int(math.ceil(size / stride) * stride)
@@ -0,0 +1,161 @@
+"""
+Regiões de interesse (ROI): inferência apenas nos recortes relevantes do frame
+"""
+import json
+import os
+import threading
+
+import numpy as np
+import torch
+from ultralytics.engine.results import Results
+
+from .preprocess import round_to_stride
+
+
+def roi_to_pixels(roi, width, height):
+    """Converte uma ROI normalizada (x1, y1, x2, y2 em 0-1) para pixels inteiros"""
+    x1, y1, x2, y2 = roi
+    return (
+        int(np.clip(min(x1, x2), 0, 1) * width),
+        int(np.clip(min(y1, y2), 0, 1) * height),
+        int(np.ceil(np.clip(max(x1, x2), 0, 1) * width)),
+        int(np.ceil(np.clip(max(y1, y2), 0, 1) * height)),
+    )
+
+
+def merge_overlapping(rects):
+    """Une retângulos que se sobrepõem, para não partir objetos entre dois recortes"""
+    rects = [list(r) for r in rects]
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(rects)):
+            for j in range(i + 1, len(rects)):
+                a, b = rects[i], rects[j]
+                if a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]:
+                    rects[i] = [min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])]
+                    del rects[j]
+                    merged = True
+                    break
+            if merged:
+                break
+    return [tuple(r) for r in rects]
+
+
+def roi_crops(frame_shape, rois, min_size=16):
+    """
+    Retângulos de recorte (em pixels) para as ROIs de um frame
+
+    Returns:
+        list: Tuplas (x1, y1, x2, y2) sem sobreposição
+    """
+    height, width = frame_shape[:2]
+    rects = [roi_to_pixels(roi, width, height) for roi in rois]
+    rects = [r for r in rects if r[2] - r[0] >= min_size and r[3] - r[1] >= min_size]
+    return merge_overlapping(rects)
+
+
+def predict_rois(detector, frame, rois):
+    """
+    Executa a detecção só nos recortes das ROIs e remapeia as caixas para o frame
+
+    Os recortes são inferidos em lote com um imgsz proporcional ao tamanho
+    deles (mesma escala de pixels da inferência no frame inteiro), então o
+    custo cai junto com a área das ROIs.
+
+    Args:
+        detector: Detector já carregado
+        frame: Frame BGR de exibição
+        rois: Lista de ROIs normalizadas
+
+    Returns:
+        Results: Resultado nas coordenadas do frame inteiro
+    """
+    rects = roi_crops(frame.shape, rois)
+    if not rects:
+        return detector.predict(frame)
+
+    height, width = frame.shape[:2]
+    largest = max(max(x2 - x1, y2 - y1) for x1, y1, x2, y2 in rects)
+    imgsz = max(64, round_to_stride(detector.imgsz * largest / max(width, height), detector.stride))
+
+    crops = [np.ascontiguousarray(frame[y1:y2, x1:x2]) for x1, y1, x2, y2 in rects]
+    results = detector.predict_batch(crops, imgsz=imgsz)
+
+    boxes = []
+    for (x1, y1, _, _), result in zip(rects, results):
+        data = result.boxes.data.clone()
+        data[:, [0, 2]] += x1
+        data[:, [1, 3]] += y1
+        boxes.append(data)
+
+    names = results[0].names
+    return Results(frame, path=results[0].path, names=names, boxes=torch.cat(boxes))
+
+
+def predict_frame(detector, frame, max_size, plan=None, rois=None):
+    """
+    Reduz, prepara e detecta um frame de vídeo (o passo por frame do VideoThread)
+
+    No caminho do dispositivo o frame bruto vai uma vez para a GPU e o resize
+    e o letterbox acontecem lá. No de CPU o LetterboxPlan da fonte é
+    reutilizado e refeito só quando o formato, max_size ou imgsz mudam. Com
+    ROIs, só os recortes do frame de exibição são inferidos.
+
+    Args:
+        detector: Detector já carregado
+        frame: Frame BGR da fonte, no tamanho original
+        max_size: Maior lado do frame de exibição
+        plan: Plano devolvido pela chamada anterior (None no primeiro frame)
+        rois: Lista de ROIs normalizadas (vazia = frame inteiro)
+
+    Returns:
+        tuple: (Results nas coordenadas do frame de exibição, plano para o próximo frame)
+    """
+    if detector.uses_device_preprocess and not rois:
+        return detector.predict(frame, max_size=max_size), plan
+
+    if plan is None or not plan.fits(frame, max_size, detector.imgsz):
+        plan = detector.letterbox_plan(frame, max_size)
+    if rois:
+        return predict_rois(detector, plan.display(frame), rois), plan
+    return detector.predict_planned(frame, plan), plan
+
+
+class RoiStore:
+    """ROIs salvas por fonte (caminho absoluto do vídeo) em um arquivo JSON"""
+
+    def __init__(self, path=os.path.join("resultados", "rois.json")):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Erro ao ler ROIs de {self.path}: {e}")
+            return {}
+
+    def load(self, source):
+        """ROIs salvas para a fonte (lista vazia se não houver)"""
+        with self._lock:
+            return [tuple(r) for r in self._read().get(os.path.abspath(str(source)), [])]
+
+    def save(self, source, rois):
+        """Salva (ou remove, se vazia) a lista de ROIs da fonte"""
+        with self._lock:
+            data = self._read()
+            key = os.path.abspath(str(source))
+            if rois:
+                data[key] = [[round(v, 5) for v in roi] for roi in rois]
+            else:
+                data.pop(key, None)
+
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
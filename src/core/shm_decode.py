@@ -0,0 +1,226 @@
+"""
+Pool de processos de decodificação com transporte de frames por memória compartilhada
+
+Cada worker abre o vídeo, decodifica um trecho e grava o frame já reduzido
+direto em um slot de um anel de buffers multiprocessing.shared_memory. O
+processo de inferência recebe só (slot, fonte, índice, h, w) pela fila e lê
+o frame como uma view NumPy sobre o buffer, sem cópia. Serve para os casos
+em lote (vários vídeos, análise offline) em que a decodificação em uma única
+thread Python é o gargalo; o VideoThread continua com o decodificador no
+próprio processo, porque precisa de ordem estrita e seek.
+"""
+import math
+import multiprocessing as mp
+import queue
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from .decoders import BACKENDS, open_decoder, scaled_size
+
+
+def _open_worker_decoder(source, backend, max_size):
+    if backend == 'opencv':
+        # Um thread de FFmpeg por processo: o paralelismo vem dos processos
+        return BACKENDS['opencv'](source, max_size=max_size, threads=1)
+    return BACKENDS[backend](source, max_size=max_size)
+
+
+def _decode_worker(shm_name, slot_shape, tasks, free_slots, ready, stop, backend, max_size):
+    """Processo worker: decodifica trechos (fonte, início, fim) para os slots livres"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    ring = np.ndarray(slot_shape, dtype=np.uint8, buffer=shm.buf)
+    try:
+        while not stop.is_set():
+            task = tasks.get()
+            if task is None:
+                break
+            source_id, source, start, end = task
+
+            decoder = _open_worker_decoder(source, backend, max_size)
+            try:
+                if start:
+                    decoder.seek(start)
+                index = decoder.position
+                while index < end and not stop.is_set():
+                    ok, frame = decoder.read()
+                    if not ok:
+                        break
+
+                    slot = None
+                    while slot is None and not stop.is_set():
+                        try:
+                            slot = free_slots.get(timeout=0.1)
+                        except queue.Empty:
+                            pass
+                    if slot is None:
+                        break
+
+                    h, w = frame.shape[:2]
+                    tw, th = scaled_size(w, h, max_size)
+                    tw, th = min(tw, slot_shape[2]), min(th, slot_shape[1])
+                    view = ring[slot, :th, :tw]
+                    if (tw, th) != (w, h):
+                        cv2.resize(frame, (tw, th), dst=view)
+                    else:
+                        view[:] = frame
+                    ready.put((slot, source_id, index, th, tw))
+                    index += 1
+            finally:
+                decoder.release()
+    finally:
+        ready.put(None)  # fim deste worker
+        if stop.is_set():
+            ready.cancel_join_thread()  # o consumidor pode não ler mais a fila
+        del ring
+        shm.close()
+
+
+class SharedFrame:
+    """Frame no anel compartilhado; válido até release() (ou sair do with)"""
+
+    __slots__ = ('pool', 'slot', 'source_id', 'index', 'array')
+
+    def __init__(self, pool, slot, source_id, index, array):
+        self.pool = pool
+        self.slot = slot
+        self.source_id = source_id
+        self.index = index
+        self.array = array  # view NumPy (h, w, 3) BGR sobre a memória compartilhada
+
+    def release(self):
+        if self.slot is not None:
+            self.pool._release(self.slot)
+            self.slot = None
+            self.array = None
+
+    def __enter__(self):
+        return self.array
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class SharedDecodePool:
+    """
+    Decodifica uma ou mais fontes em paralelo, em processos separados
+
+    Uso:
+        with SharedDecodePool(["a.mp4", "b.mp4"], workers=4, max_size=1280) as pool:
+            for frame in pool:
+                with frame as bgr:       # view sem cópia
+                    detector.predict(bgr)
+
+    Os frames chegam na ordem em que ficam prontos; source_id e index dizem
+    de onde vieram. Um slot só volta para os workers depois de release(),
+    então o anel (slots) limita a memória usada e segura os workers quando
+    a inferência é o gargalo.
+    """
+
+    def __init__(self, sources, workers=None, max_size=1280, slots=None, backend='opencv'):
+        if isinstance(sources, (str, int)):
+            sources = [sources]
+        self.sources = list(sources)
+        self.workers = max(1, workers or mp.cpu_count())
+        self.max_size = max_size
+        self.backend = backend
+        self.slots = slots or 4 * self.workers
+
+        # Slot do tamanho do maior frame reduzido entre as fontes
+        sizes, counts = [], []
+        for source in self.sources:
+            decoder = open_decoder(source, backend='opencv')
+            sizes.append(scaled_size(decoder.width, decoder.height, max_size))
+            counts.append(decoder.frame_count)
+            decoder.release()
+        width = max(w for w, _ in sizes)
+        height = max(h for _, h in sizes)
+        self.frame_counts = counts
+        self._slot_shape = (self.slots, height, width, 3)
+
+        self._shm = shared_memory.SharedMemory(create=True, size=int(np.prod(self._slot_shape)))
+        self._ring = np.ndarray(self._slot_shape, dtype=np.uint8, buffer=self._shm.buf)
+
+        # spawn: processos limpos também no Linux (fork com CUDA já iniciado quebra)
+        ctx = mp.get_context('spawn')
+        self._tasks = ctx.Queue()
+        self._free = ctx.Queue()
+        self._ready = ctx.Queue()
+        self._stop = ctx.Event()
+        for slot in range(self.slots):
+            self._free.put(slot)
+        for task in self._split_tasks():
+            self._tasks.put(task)
+        for _ in range(self.workers):
+            self._tasks.put(None)
+
+        self._processes = [
+            ctx.Process(
+                target=_decode_worker,
+                args=(self._shm.name, self._slot_shape, self._tasks, self._free, self._ready,
+                      self._stop, backend, max_size),
+                daemon=True,
+            )
+            for _ in range(self.workers)
+        ]
+        for process in self._processes:
+            process.start()
+        self._alive = self.workers
+
+    def _split_tasks(self):
+        """Divide as fontes em trechos contíguos para ocupar todos os workers"""
+        per_source = max(1, math.ceil(self.workers / len(self.sources)))
+        for source_id, (source, count) in enumerate(zip(self.sources, self.frame_counts)):
+            if count <= 0 or isinstance(source, int):
+                yield source_id, source, 0, float('inf')
+                continue
+            step = math.ceil(count / per_source)
+            for start in range(0, count, step):
+                yield source_id, source, start, min(start + step, count)
+
+    def _release(self, slot):
+        self._free.put(slot)
+
+    def __iter__(self):
+        while self._alive:
+            try:
+                message = self._ready.get(timeout=0.5)
+            except queue.Empty:
+                # Worker que morreu (ex.: erro de import no processo novo) não avisa o fim
+                if not any(process.is_alive() for process in self._processes):
+                    codes = [process.exitcode for process in self._processes]
+                    raise RuntimeError(f"Workers de decodificação encerraram sem terminar (códigos {codes})")
+                continue
+            if message is None:
+                self._alive -= 1
+                continue
+            slot, source_id, index, h, w = message
+            yield SharedFrame(self, slot, source_id, index, self._ring[slot, :h, :w])
+
+    def close(self, timeout=5.0):
+        """Para os workers e libera a memória compartilhada"""
+        self._stop.set()
+        deadline = time.time() + timeout
+        for process in self._processes:
+            process.join(max(0.0, deadline - time.time()))
+            if process.is_alive():
+                process.terminate()  # processo separado: não afeta CUDA/Qt deste processo
+                process.join(1.0)
+        for q in (self._tasks, self._free, self._ready):
+            q.cancel_join_thread()
+            q.close()
+
+        self._ring = None
+        try:
+            self._shm.close()
+        except BufferError:
+            print("Aviso: frames do pool ainda em uso ao fechar; libere-os antes de close()")
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,178 @@
+"""
+Variantes otimizadas de um modelo, medidas na máquina local
+
+Cada variante é uma receita aplicada ao carregar o .pt (imgsz fixo menor,
+precisão, quantização INT8 dinâmica); nada é reexportado. O benchmark fica
+em <modelo>.variants.json ao lado do modelo e é descartado quando o arquivo
+do modelo muda.
+"""
+import datetime
+import glob
+import io
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+import torch
+
+from .detector import Detector, select_device
+
+
+VARIANT_SPECS = [
+    {'name': 'padrão'},
+    {'name': 'fp32', 'half': False, 'gpu_only': True},  # o padrão na GPU já é FP16
+    {'name': 'int8', 'quantize': 'dynamic'},
+    {'name': 'imgsz480', 'imgsz': 480},
+    {'name': 'imgsz320', 'imgsz': 320},
+]
+
+OPTION_KEYS = ('imgsz', 'half', 'quantize')
+
+
+def manifest_path(model_path):
+    """Caminho do JSON de variantes ao lado do modelo"""
+    return os.path.splitext(model_path)[0] + '.variants.json'
+
+
+def detector_options(variant):
+    """Argumentos do Detector para uma variante (None/vazio = configuração padrão)"""
+    if not variant:
+        return {}
+    return {key: variant[key] for key in OPTION_KEYS if variant.get(key) is not None}
+
+
+def variant_label(variant):
+    """Texto curto com velocidade e tamanho medidos, para o combo de modelos"""
+    return f"{variant['fps']:.1f} FPS ({variant['device']}) · {variant['size_mb']:.1f} MB"
+
+
+def weights_size_mb(model):
+    """Tamanho serializado dos pesos como ficam na memória para inferência"""
+    buffer = io.BytesIO()
+    torch.save(model.model.state_dict(), buffer)
+    return buffer.tell() / 2 ** 20
+
+
+def benchmark_frames(image_dir=os.path.join('data_test', 'images'), count=8, size=(640, 480)):
+    """Frames do benchmark: imagens de teste do projeto ou, sem elas, ruído fixo"""
+    paths = sorted(glob.glob(os.path.join(image_dir, '*.jpg')) + glob.glob(os.path.join(image_dir, '*.png')))
+    frames = [cv2.imread(path) for path in paths[:count]]
+    frames = [frame for frame in frames if frame is not None]
+    if frames:
+        return frames
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 255, (size[1], size[0], 3), dtype=np.uint8) for _ in range(count)]
+
+
+def benchmark_detector(detector, frames, runs=3, warmup=2):
+    """
+    Mede a latência por frame (pré-processamento + inferência + NMS)
+
+    Returns:
+        tuple: (mediana em ms, FPS médio)
+    """
+    for frame in frames[:warmup]:
+        detector.predict(frame)
+
+    latencies = []
+    for _ in range(runs):
+        for frame in frames:
+            start = time.perf_counter()
+            detector.predict(frame)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    return float(np.median(latencies)), 1000 * len(latencies) / sum(latencies)
+
+
+class ModelVariants:
+    """
+    Gera, mede e guarda as variantes de um modelo
+
+    Uso:
+        variants = ModelVariants("models/yolov8n.pt")
+        variants.build()           # mede todas as variantes aplicáveis
+        for v in variants.load():  # [{name, imgsz, half, quantize, ms, fps, size_mb, device}, ...]
+            ...
+    """
+
+    def __init__(self, model_path):
+        self.model_path = model_path
+        self.path = manifest_path(model_path)
+
+    def _fingerprint(self):
+        stat = os.stat(self.model_path)
+        return {'model_size': stat.st_size, 'model_mtime': int(stat.st_mtime)}
+
+    def load(self):
+        """Variantes medidas; lista vazia se não houver medição válida para este arquivo"""
+        if not os.path.exists(self.path):
+            return []
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Erro ao ler variantes de {self.model_path}: {e}")
+            return []
+
+        if manifest.get('fingerprint') != self._fingerprint():
+            return []
+        return manifest.get('variants', [])
+
+    def build(self, frames=None, runs=3, specs=VARIANT_SPECS, progress=None, cancelled=None):
+        """
+        Mede cada variante aplicável e grava o resultado ao lado do modelo
+
+        Args:
+            frames: Frames BGR do benchmark (None usa benchmark_frames())
+            runs: Passadas sobre os frames por variante
+            specs: Receitas a medir
+            progress: Callback opcional progress(índice, total, nome)
+            cancelled: Callback opcional que retorna True para interromper
+
+        Returns:
+            list: Variantes medidas (as não aplicáveis são informadas no console)
+        """
+        frames = frames if frames is not None else benchmark_frames()
+        device = select_device()
+        measured = []
+
+        for i, spec in enumerate(specs):
+            if cancelled is not None and cancelled():
+                return measured
+            if progress is not None:
+                progress(i, len(specs), spec['name'])
+            if spec.get('gpu_only') and device == 'cpu':
+                continue
+
+            options = detector_options(spec)
+            detector = Detector(self.model_path, **options)
+            if spec.get('quantize') and not detector.quantized_layers:
+                print(f"Variante {spec['name']}: modelo sem camadas Linear, quantização dinâmica não se aplica")
+                continue
+
+            ms, fps = benchmark_detector(detector, frames, runs=runs)
+            variant = dict(options, name=spec['name'], imgsz=detector.imgsz, half=detector.half)
+            variant.update(
+                ms=round(ms, 2),
+                fps=round(fps, 2),
+                size_mb=round(weights_size_mb(detector.model), 2),
+                device=detector.device if detector.device == 'cpu' else 'gpu',
+            )
+            print(f"Variante {variant['name']}: {variant['ms']:.1f} ms, {variant_label(variant)}")
+            measured.append(variant)
+
+        if progress is not None:
+            progress(len(specs), len(specs), "")
+
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'model': os.path.basename(self.model_path),
+                'fingerprint': self._fingerprint(),
+                'measured_at': datetime.datetime.now().isoformat(timespec='seconds'),
+                'frames': len(frames),
+                'runs': runs,
+                'variants': measured,
+            }, f, indent=2, ensure_ascii=False)
+        return measured
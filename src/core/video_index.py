@@ -0,0 +1,126 @@
+"""
+Índice de keyframes e cache de frames anotados para navegação no vídeo
+"""
+import bisect
+import threading
+from collections import OrderedDict
+
+try:
+    import av
+except ImportError:  # PyAV é opcional
+    av = None
+
+
+class KeyframeIndex:
+    """
+    Posições (em frames) dos keyframes de um vídeo
+
+    Construído só com o demux dos pacotes (sem decodificar), então é rápido
+    mesmo para arquivos longos. Sem PyAV o índice fica vazio e as buscas
+    sempre usam o seek exato do decodificador.
+    """
+
+    def __init__(self, keyframes=None):
+        self.keyframes = sorted(keyframes or [])
+
+    @classmethod
+    def build(cls, source, fps):
+        if av is None or isinstance(source, int):
+            return cls()
+
+        keyframes = []
+        try:
+            with av.open(source) as container:
+                stream = container.streams.video[0]
+                start = stream.start_time or 0
+                for packet in container.demux(stream):
+                    if packet.is_keyframe and packet.pts is not None:
+                        seconds = float((packet.pts - start) * stream.time_base)
+                        keyframes.append(int(round(seconds * fps)))
+        except Exception as e:
+            print(f"Não foi possível indexar keyframes de {source}: {e}")
+            return cls()
+
+        return cls(keyframes)
+
+    def __len__(self):
+        return len(self.keyframes)
+
+    def keyframe_before(self, frame_index):
+        """Último keyframe em ou antes de frame_index (0 se desconhecido)"""
+        i = bisect.bisect_right(self.keyframes, frame_index)
+        return self.keyframes[i - 1] if i else 0
+
+    def should_decode_forward(self, current, target):
+        """
+        Indica se é mais barato decodificar adiante do que fazer seek
+
+        Verdadeiro quando o alvo está à frente e não há keyframe entre a
+        posição atual e ele: um seek voltaria ao mesmo keyframe e
+        decodificaria os mesmos frames novamente.
+        """
+        if not self.keyframes or target < current:
+            return False
+        return self.keyframe_before(target) <= current
+
+
+class FrameCache:
+    """
+    Cache LRU de frames já anotados, limitado por memória
+
+    Acessado pela thread de vídeo e pela UI (prévia durante o arraste da
+    linha do tempo), por isso protegido por lock.
+    """
+
+    def __init__(self, max_mb=256):
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._items = OrderedDict()  # índice -> (payload, nbytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __contains__(self, frame_index):
+        with self._lock:
+            return frame_index in self._items
+
+    def get(self, frame_index):
+        with self._lock:
+            item = self._items.get(frame_index)
+            if item is None:
+                return None
+            self._items.move_to_end(frame_index)
+            return item[0]
+
+    def peek(self, frame_index):
+        """Consulta sem alterar a ordem LRU"""
+        with self._lock:
+            item = self._items.get(frame_index)
+            return item[0] if item is not None else None
+
+    def put(self, frame_index, payload, nbytes):
+        with self._lock:
+            old = self._items.pop(frame_index, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._items[frame_index] = (payload, nbytes)
+            self._bytes += nbytes
+            self._evict()
+
+    def set_budget(self, max_mb):
+        """Altera o limite de memória (ex.: por decisão do governador)"""
+        with self._lock:
+            self.max_bytes = int(max_mb * 1024 * 1024)
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._items:
+            _, (_, nbytes) = self._items.popitem(last=False)
+            self._bytes -= nbytes
+
+    @property
+    def size_mb(self):
+        return self._bytes / (1024 * 1024)
@@ -0,0 +1,8 @@
+"""
+Modo servidor: inferência via HTTP local, sem a interface gráfica
+"""
+
+from .app import InferenceServer, result_to_json
+from .batcher import MicroBatcher
+
+__all__ = ['InferenceServer', 'MicroBatcher', 'result_to_json']
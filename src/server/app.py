@@ -0,0 +1,260 @@
+"""
+Servidor HTTP local de inferência (sem interface gráfica)
+
+Endpoints:
+    POST /detect?model=<nome>&conf=<0-1>           corpo: imagem (JPEG/PNG)
+    POST /detect_video?model=<nome>&stride=<n>     corpo: trecho de vídeo (MP4, AVI...)
+    GET  /health                                   modelos carregados e uptime
+    GET  /metrics                                  formato texto do Prometheus
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import cv2
+import numpy as np
+
+from ..core import Detector, open_decoder
+from .batcher import MicroBatcher
+
+
+def result_to_json(result, min_conf=0.0):
+    """Caixas de um Results como lista de dicts (classe, confiança, xyxy)"""
+    data = result.boxes.data.cpu().numpy()
+    return [
+        {
+            'class': result.names[int(cls)],
+            'conf': round(float(conf), 4),
+            'box': [round(float(v), 1) for v in (x1, y1, x2, y2)],
+        }
+        for x1, y1, x2, y2, conf, cls in data[:, :6]
+        if conf >= min_conf
+    ]
+
+
+class ServerMetrics:
+    """Contadores e janela móvel de latências para /metrics"""
+
+    def __init__(self, window=2000):
+        self.started = time.time()
+        self.requests = {}
+        self.errors = 0
+        self.frames = 0
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, latency_ms, frames=1, error=False):
+        with self._lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+            if error:
+                self.errors += 1
+                return
+            self.frames += frames
+            self._latencies.append(latency_ms)
+
+    def snapshot(self):
+        """Cópia consistente dos contadores (requisições por endpoint, erros, frames)"""
+        with self._lock:
+            return dict(self.requests), self.errors, self.frames
+
+    def quantiles(self, qs=(0.5, 0.95, 0.99)):
+        with self._lock:
+            values = np.array(self._latencies)
+        if not len(values):
+            return {q: 0.0 for q in qs}
+        return {q: float(np.quantile(values, q)) for q in qs}
+
+
+class InferenceServer:
+    """
+    Modelos carregados uma vez (quentes), cada um com seu MicroBatcher
+
+    Uso:
+        server = InferenceServer({"yolov8n": "yolov8n.pt"}, port=8765)
+        server.serve_forever()
+    """
+
+    def __init__(self, models, host="127.0.0.1", port=8765, conf=0.25, max_batch=8,
+                 max_wait_ms=5.0, warmup=True):
+        self.conf = conf
+        self.metrics = ServerMetrics()
+        self.batchers = {}
+        for name, path in models.items():
+            print(f"Carregando modelo {name}: {path}")
+            detector = Detector(path, conf=conf)
+            if warmup:
+                # Primeira chamada monta o predictor e aloca memória fora da medição
+                detector.predict(np.zeros((480, 640, 3), dtype=np.uint8))
+            self.batchers[name] = MicroBatcher(detector, max_batch, max_wait_ms, name)
+        self.default_model = next(iter(self.batchers))
+
+        handler = type('Handler', (_RequestHandler,), {'server_app': self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def address(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_forever(self):
+        print(f"Servidor de inferência em {self.address} (modelos: {', '.join(self.batchers)})")
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.close()
+
+    def close(self):
+        self.httpd.server_close()
+        for batcher in self.batchers.values():
+            batcher.close()
+
+    def batcher(self, name):
+        batcher = self.batchers.get(name or self.default_model)
+        if batcher is None:
+            raise KeyError(f"Modelo não carregado: {name}")
+        return batcher
+
+    def detect_image(self, body, params):
+        frame = cv2.imdecode(np.frombuffer(body, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            raise ValueError("Corpo não é uma imagem válida")
+        batcher = self.batcher(params.get('model'))
+        min_conf = float(params.get('conf', self.conf))
+
+        result, batch_size = batcher.submit(frame).result()
+        return {
+            'model': batcher.name,
+            'width': frame.shape[1],
+            'height': frame.shape[0],
+            'batch_size': batch_size,
+            'detections': result_to_json(result, min_conf),
+        }, 1
+
+    def detect_video(self, body, params):
+        batcher = self.batcher(params.get('model'))
+        min_conf = float(params.get('conf', self.conf))
+        stride = max(1, int(params.get('stride', 1)))
+        max_size = int(params.get('max_size', 1280))
+
+        # FFmpeg precisa de um arquivo para demultiplexar o trecho
+        fd, path = tempfile.mkstemp(suffix=params.get('ext', '.mp4'))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(body)
+            cap = open_decoder(path, backend='opencv', max_size=max_size)
+            if not cap.isOpened():
+                raise ValueError("Corpo não é um vídeo válido")
+
+            # Todos os frames entram na fila de uma vez e viram lotes completos
+            futures = []
+            index = 0
+            while True:
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                if index % stride == 0:
+                    h, w = frame.shape[:2]
+                    if max(h, w) > max_size:
+                        scale = max_size / max(h, w)
+                        frame = cv2.resize(frame, (int(w * scale), int(h * scale)))
+                    futures.append((index, batcher.submit(frame)))
+                index += 1
+            fps = cap.fps
+            cap.release()
+        finally:
+            os.remove(path)
+
+        frames = [
+            {'frame': i, 'detections': result_to_json(future.result()[0], min_conf)}
+            for i, future in futures
+        ]
+        return {'model': batcher.name, 'fps': fps, 'frames': frames}, len(frames)
+
+    def health(self):
+        return {
+            'status': 'ok',
+            'models': list(self.batchers),
+            'uptime_s': round(time.time() - self.metrics.started, 1),
+        }
+
+    def metrics_text(self):
+        m = self.metrics
+        requests, errors, frames = m.snapshot()
+        lines = [
+            "# TYPE yolo_requests_total counter",
+            *(f'yolo_requests_total{{endpoint="{e}"}} {n}' for e, n in requests.items()),
+            "# TYPE yolo_errors_total counter",
+            f"yolo_errors_total {errors}",
+            "# TYPE yolo_frames_total counter",
+            f"yolo_frames_total {frames}",
+            "# TYPE yolo_latency_ms summary",
+            *(f'yolo_latency_ms{{quantile="{q}"}} {v:.2f}' for q, v in m.quantiles().items()),
+            "# TYPE yolo_batch_size_avg gauge",
+            *(f'yolo_batch_size_avg{{model="{n}"}} {b.avg_batch_size:.2f}' for n, b in self.batchers.items()),
+            "# TYPE yolo_queue_pending gauge",
+            *(f'yolo_queue_pending{{model="{n}"}} {b.pending}' for n, b in self.batchers.items()),
+            "# TYPE yolo_uptime_seconds gauge",
+            f"yolo_uptime_seconds {time.time() - m.started:.1f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    server_app = None  # InferenceServer, definido pela subclasse criada no servidor
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # uma linha por requisição atrapalha o teste de carga
+
+    def _send(self, status, payload, content_type="application/json"):
+        body = payload if isinstance(payload, bytes) else (
+            payload.encode() if isinstance(payload, str) else json.dumps(payload).encode()
+        )
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/health":
+            self._send(200, self.server_app.health())
+        elif path == "/metrics":
+            self._send(200, self.server_app.metrics_text(), "text/plain; version=0.0.4")
+        else:
+            self._send(404, {'error': f"Rota desconhecida: {path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        routes = {'/detect': self.server_app.detect_image, '/detect_video': self.server_app.detect_video}
+        route = routes.get(url.path)
+        if route is None:
+            self._send(404, {'error': f"Rota desconhecida: {url.path}"})
+            return
+
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        start = time.perf_counter()
+        try:
+            payload, frames = route(body, params)
+        except (KeyError, ValueError) as e:
+            self.server_app.metrics.record(url.path, 0, error=True)
+            self._send(400, {'error': str(e).strip("'")})
+            return
+        except Exception as e:
+            print(f"Erro em {url.path}: {e}")
+            self.server_app.metrics.record(url.path, 0, error=True)
+            self._send(500, {'error': str(e)})
+            return
+
+        latency = (time.perf_counter() - start) * 1000
+        self.server_app.metrics.record(url.path, latency, frames)
+        payload['latency_ms'] = round(latency, 2)
+        self._send(200, payload)
@@ -0,0 +1,100 @@
+"""
+Micro-batching dinâmico: agrupa requisições concorrentes em uma chamada ao modelo
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """
+    Fila única por modelo com uma thread de inferência
+
+    A thread pega a primeira requisição pendente e espera no máximo
+    max_wait_ms por outras, até max_batch; o lote inteiro vai para
+    Detector.predict_batch. Com uma requisição só, a espera extra é no
+    máximo max_wait_ms; sob carga o lote enche antes disso.
+    """
+
+    def __init__(self, detector, max_batch=8, max_wait_ms=5.0, name="modelo"):
+        self.detector = detector
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait_ms / 1000
+        self.name = name
+
+        self.batches = 0
+        self.batched_items = 0
+        self._queue = queue.Queue()
+        self._running = True
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name=f"batcher-{name}", daemon=True)
+        self._worker.start()
+
+    @property
+    def pending(self):
+        return self._queue.qsize()
+
+    @property
+    def avg_batch_size(self):
+        return self.batched_items / self.batches if self.batches else 0.0
+
+    def submit(self, frame):
+        """Enfileira um frame BGR; o Future recebe (Results, tamanho do lote)
+
+        Depois de close() o Future já volta com RuntimeError em vez de ficar
+        pendente para sempre.
+        """
+        future = Future()
+        with self._close_lock:
+            if self._closed:
+                future.set_exception(RuntimeError(f"MicroBatcher '{self.name}' encerrado"))
+                return future
+            self._queue.put((frame, future))
+        return future
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._running = False
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while self._running:
+            batch = self._collect()
+            if batch is None:
+                break
+
+            frames = [frame for frame, _ in batch]
+            try:
+                results = self.detector.predict_batch(frames)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.batched_items += len(batch)
+            for (_, future), result in zip(batch, results):
+                future.set_result((result, len(batch)))
+
+    def close(self, timeout=5.0):
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)  # depois de tudo o que já foi aceito
+        self._worker.join(timeout)
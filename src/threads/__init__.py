@@ -2,7 +2,17 @@
 Módulo de threads para processamento YOLO
 """
 
+from .scheduler import (
+    JobScheduler, Job, CancellationToken,
+    PRIORITY_INTERACTIVE, PRIORITY_NORMAL, PRIORITY_BACKGROUND, STATUS_LABELS
+)
+from .mailbox import FrameMailbox
 from .yolo_thread import YOLOThread
 from .video_thread import VideoThread
+from .session_thread import ImageSessionThread, IMAGE_EXTENSIONS
+from .comparison_thread import ComparisonThread
+from .variant_thread import VariantBuildThread
 
-__all__ = ['YOLOThread', 'VideoThread']
+__all__ = ['YOLOThread', 'VideoThread', 'ImageSessionThread', 'ComparisonThread', 'VariantBuildThread',
+           'IMAGE_EXTENSIONS', 'FrameMailbox', 'JobScheduler', 'Job', 'CancellationToken',
+           'PRIORITY_INTERACTIVE', 'PRIORITY_NORMAL', 'PRIORITY_BACKGROUND', 'STATUS_LABELS']
@@ -0,0 +1,107 @@
+"""
+Job para comparar vários modelos YOLO sobre o mesmo vídeo
+"""
+import os
+import time
+from collections import Counter
+
+import cv2
+import torch
+from PyQt5.QtGui import QImage
+
+from ..core import Detector, extract_detections, open_decoder
+from .mailbox import FrameMailbox
+from .scheduler import Job
+
+
+class ComparisonThread(Job):
+    """
+    Decodifica cada frame uma única vez e o distribui para todos os modelos
+
+    Publica em mailbox, como o VideoThread, um quadro composto com os
+    resultados lado a lado e, por modelo, latência do frame, latência média
+    e contagem de detecções por classe: (QImage, lista de estatísticas). A
+    UI retira o mais recente no ritmo da tela; o último do vídeo fica na
+    caixa até ser retirado, então o acumulado final sempre chega.
+    """
+
+    name = "comparação"
+
+    def __init__(self, model_paths, source, max_size=1280, backend='auto'):
+        super().__init__()
+        self.model_paths = list(model_paths)
+        self.source = source
+        self.max_size = max_size
+        self.backend = backend
+        self.mailbox = FrameMailbox()
+
+    def run(self):
+        detectors = [Detector(path) for path in self.model_paths]
+        names = [os.path.basename(path) for path in self.model_paths]
+        cap = open_decoder(self.source, backend=self.backend, max_size=self.max_size)
+
+        try:
+            if not cap.isOpened():
+                raise IOError(f"Não foi possível abrir o vídeo: {self.source}")
+
+            total_latency = [0.0] * len(detectors)
+            total_counts = [Counter() for _ in detectors]
+            frames = 0
+
+            while not self.token.cancelled:
+                ret, frame = cap.read()
+                if not ret:
+                    print("Fim do vídeo ou erro ao ler frame")
+                    break
+
+                # Redimensionar uma vez; o mesmo frame vai para todos os modelos
+                h, w = frame.shape[:2]
+                if max(h, w) > self.max_size:
+                    scale = self.max_size / max(h, w)
+                    frame = cv2.resize(frame, (int(w * scale), int(h * scale)))
+
+                frames += 1
+                panels = []
+                stats = []
+                for i, detector in enumerate(detectors):
+                    start = time.perf_counter()
+                    result = detector.predict(frame)
+                    latency = (time.perf_counter() - start) * 1000
+                    total_latency[i] += latency
+
+                    counts = Counter(nome for nome, _ in extract_detections(result))
+                    total_counts[i].update(counts)
+                    stats.append({
+                        'model': names[i],
+                        'latency_ms': latency,
+                        'avg_latency_ms': total_latency[i] / frames,
+                        'counts': dict(counts),
+                        'total_counts': dict(total_counts[i]),
+                    })
+                    panels.append((result, f"{names[i]}  {latency:.0f} ms"))
+
+                if self.token.cancelled:
+                    break
+                self.mailbox.put((self._compose(panels), stats))
+        finally:
+            cap.release()
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+
+    def _compose(self, panels):
+        """Junta os frames anotados lado a lado, com o nome do modelo no topo"""
+        images = []
+        for result, label in panels:
+            annotated = result.plot()
+            cv2.rectangle(annotated, (0, 0), (annotated.shape[1], 36), (17, 24, 39), -1)
+            cv2.putText(annotated, label, (10, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+            images.append(annotated)
+
+        composite = cv2.hconcat(images)
+        if composite.shape[1] > 2 * self.max_size:
+            scale = 2 * self.max_size / composite.shape[1]
+            composite = cv2.resize(composite, (2 * self.max_size, int(composite.shape[0] * scale)))
+
+        rgb = cv2.cvtColor(composite, cv2.COLOR_BGR2RGB)
+        h, w, ch = rgb.shape
+        return QImage(rgb.data, w, h, ch * w, QImage.Format_RGB888).copy()
@@ -0,0 +1,41 @@
+"""
+Caixa de último valor entre um job e a interface
+"""
+import threading
+
+
+class FrameMailbox:
+    """
+    Um único slot: o worker sobrescreve, a UI retira quando vai desenhar
+
+    Substitui um sinal por frame em conexão enfileirada. Se a UI atrasa, o
+    frame antigo é trocado pelo novo em vez de acumular QImages na fila de
+    eventos do Qt; a fila nunca passa de um e overwritten conta os frames
+    que nunca chegaram à tela.
+
+    Uso:
+        mailbox.put((qt_img, detections, fps, index))   # thread do job
+        frame = mailbox.take()                           # timer da UI; None se nada novo
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value = None
+        self.posted = 0
+        self.overwritten = 0
+
+    def put(self, value):
+        """Publica o valor mais recente; True se havia um ainda não retirado"""
+        with self._lock:
+            replaced = self._value is not None
+            self._value = value
+            self.posted += 1
+            if replaced:
+                self.overwritten += 1
+        return replaced
+
+    def take(self):
+        """Retira o valor pendente (None se nada foi publicado desde a última retirada)"""
+        with self._lock:
+            value, self._value = self._value, None
+        return value
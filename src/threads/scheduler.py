@@ -0,0 +1,177 @@
+"""
+Agendador de jobs sobre um QThreadPool com prioridades e cancelamento cooperativo
+"""
+import itertools
+import threading
+import traceback
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+# Prioridades do QThreadPool: maior sai da fila primeiro
+PRIORITY_INTERACTIVE = 10  # imagem única, o usuário está esperando
+PRIORITY_NORMAL = 5        # sessão de imagens
+PRIORITY_BACKGROUND = 0    # vídeo e comparação, rodam por muito tempo
+
+QUEUED = 'queued'
+RUNNING = 'running'
+FINISHED = 'finished'
+CANCELLED = 'cancelled'
+FAILED = 'failed'
+FINAL_STATES = (FINISHED, CANCELLED, FAILED)
+
+STATUS_LABELS = {
+    QUEUED: "na fila",
+    RUNNING: "em execução",
+    FINISHED: "concluído",
+    CANCELLED: "cancelado",
+    FAILED: "falhou",
+}
+
+_job_ids = itertools.count(1)
+
+
+class CancellationToken:
+    """Sinalizador de cancelamento consultado pelo job dentro do próprio laço"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def wait(self, timeout):
+        """Espera até timeout segundos; retorna True se o job foi cancelado"""
+        return self._event.wait(timeout)
+
+
+class Job(QObject):
+    """
+    Trabalho executado no pool do JobScheduler
+
+    Subclasses implementam run() e consultam self.token.cancelled entre
+    frames/imagens. Nunca há término forçado: parar é só pedir o
+    cancelamento, e o job sai no próximo ponto de verificação, liberando
+    decodificador e memória da GPU pelo caminho normal.
+    """
+    status_changed = pyqtSignal(int, str)  # id do job, estado
+    done = pyqtSignal(str)  # estado final
+
+    name = "job"
+
+    def __init__(self):
+        super().__init__()
+        self.job_id = next(_job_ids)
+        self.token = CancellationToken()
+        self.status = None
+        self._runnable = None
+
+    def run(self):
+        raise NotImplementedError
+
+    def on_failure(self, error):
+        """Chamado na thread do pool quando run() levanta uma exceção"""
+
+    def stop(self):
+        """Pede o cancelamento; não bloqueia"""
+        self.token.cancel()
+
+    def is_active(self):
+        return self.status in (QUEUED, RUNNING)
+
+    def _set_status(self, status):
+        self.status = status
+        self.status_changed.emit(self.job_id, status)
+        if status in FINAL_STATES:
+            self.done.emit(status)
+
+    def _execute(self):
+        if self.token.cancelled:
+            self._set_status(CANCELLED)
+            return
+
+        self._set_status(RUNNING)
+        try:
+            self.run()
+        except Exception as e:
+            print(f"Erro no job {self.name} #{self.job_id}: {e}")
+            traceback.print_exc()
+            self.on_failure(e)
+            self._set_status(FAILED)
+            return
+
+        self._set_status(CANCELLED if self.token.cancelled else FINISHED)
+
+
+class _JobRunnable(QRunnable):
+    """Adaptador QRunnable; a posse fica com o JobScheduler, não com o pool"""
+
+    def __init__(self, job):
+        super().__init__()
+        self.job = job
+        self.setAutoDelete(False)
+
+    def run(self):
+        self.job._execute()
+
+
+class JobScheduler(QObject):
+    """
+    Pool limitado de workers para os jobs de inferência
+
+    Jobs interativos passam à frente dos de fundo na fila. submit() e
+    cancel() retornam imediatamente; a espera pelos workers acontece só
+    em shutdown(), ao fechar o aplicativo.
+    """
+    job_status = pyqtSignal(int, str, str)  # id, nome do job, estado
+
+    def __init__(self, max_workers=3, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max(1, max_workers))
+        self._jobs = {}
+        # Jobs encerrados ficam aqui até o próximo submit, para que a última
+        # referência seja solta na thread da UI e não na do worker
+        self._retired = []
+
+    def submit(self, job, priority=PRIORITY_NORMAL):
+        """Enfileira o job e devolve o próprio job"""
+        self._retired.clear()
+        job._runnable = _JobRunnable(job)
+        self._jobs[job.job_id] = job
+        job.status_changed.connect(self._on_status_changed)
+        job._set_status(QUEUED)
+        self.pool.start(job._runnable, priority)
+        return job
+
+    def cancel(self, job):
+        """Cancela o job: sai da fila se ainda não começou, senão para no próximo frame"""
+        if job is None:
+            return
+        job.stop()
+        if job.status == QUEUED and self.pool.tryTake(job._runnable):
+            job._set_status(CANCELLED)
+
+    def cancel_all(self):
+        for job in list(self._jobs.values()):
+            self.cancel(job)
+
+    def active_jobs(self):
+        return [job for job in self._jobs.values() if job.is_active()]
+
+    def shutdown(self, timeout_ms=5000):
+        """Cancela tudo e espera os workers; True se todos terminaram no prazo"""
+        self.cancel_all()
+        return self.pool.waitForDone(timeout_ms)
+
+    def _on_status_changed(self, job_id, status):
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+        self.job_status.emit(job_id, job.name, status)
+        if status in FINAL_STATES:
+            self._retired.append(self._jobs.pop(job_id))
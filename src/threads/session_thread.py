@@ -0,0 +1,103 @@
+"""
+Job para processamento YOLO de uma sessão com várias imagens
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtGui import QImage
+
+from ..core import Detector, MemoryGovernor, detector_options, extract_detections
+from .scheduler import Job
+
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff')
+
+
+class ImageSessionThread(Job):
+    """
+    Processa uma lista de imagens com um único modelo carregado
+
+    A decodificação das próximas imagens acontece em paralelo à inferência da
+    atual (leitura antecipada), e cada resultado é emitido assim que fica
+    pronto, junto com uma miniatura já redimensionada para a faixa da UI.
+    As imagens são inferidas em lotes; o MemoryGovernor reduz lote e
+    leitura antecipada quando a memória aperta.
+    """
+    result_ready = pyqtSignal(int, QImage, QImage, list, str)
+    progress = pyqtSignal(int)
+
+    name = "sessão"
+
+    def __init__(self, model_path, image_paths, writer=None, prefetch=4, batch_size=4,
+                 thumb_size=96, variant=None):
+        super().__init__()
+        self.model_path = model_path
+        self.variant = variant
+        self.image_paths = list(image_paths)
+        self.writer = writer
+        self.prefetch = max(1, prefetch)
+        self.batch_size = max(1, batch_size)
+        self.thumb_size = thumb_size
+
+    def run(self):
+        total = len(self.image_paths)
+        if not total:
+            return
+
+        detector = Detector(self.model_path, **detector_options(self.variant))
+
+        governor = MemoryGovernor(
+            queue_depth=self.prefetch, batch_size=self.batch_size, check_interval=1
+        )
+
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefetch") as pool:
+            pending = {}
+            next_read = 0
+            index = 0
+
+            while index < total and not self.token.cancelled:
+                # Leitura antecipada limitada pela fila e lote atuais
+                while next_read < total and len(pending) < governor.queue_depth + governor.batch_size:
+                    pending[next_read] = pool.submit(cv2.imread, self.image_paths[next_read])
+                    next_read += 1
+
+                batch = []
+                while index < total and len(batch) < governor.batch_size:
+                    frame = pending.pop(index).result()
+                    if frame is None:
+                        print(f"Erro ao ler imagem: {self.image_paths[index]}")
+                    else:
+                        batch.append((index, frame))
+                    index += 1
+
+                try:
+                    self._process_batch(detector, batch)
+                except Exception as e:
+                    print(f"Erro ao processar lote até {self.image_paths[index - 1]}: {e}")
+
+                self.progress.emit(int(index * 100 / total))
+                governor.update()
+
+            for future in pending.values():
+                future.cancel()
+
+    def _process_batch(self, detector, batch):
+        results = detector.predict_batch([frame for _, frame in batch])
+        for (index, _), result in zip(batch, results):
+            self._emit_result(index, result)
+
+    def _emit_result(self, index, result):
+        annotated = result.plot()
+        detections = extract_detections(result)
+
+        output_path = ""
+        if self.writer is not None:
+            output_path = self.writer.submit(annotated, detections, self.image_paths[index])
+
+        rgb = cv2.cvtColor(annotated, cv2.COLOR_BGR2RGB)
+        h, w, ch = rgb.shape
+        qt_img = QImage(rgb.data, w, h, ch * w, QImage.Format_RGB888).copy()
+        thumb = qt_img.scaled(self.thumb_size, self.thumb_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+        self.result_ready.emit(index, qt_img, thumb, detections, output_path)
@@ -0,0 +1,31 @@
+"""
+Job para gerar e medir as variantes otimizadas de um modelo
+"""
+from PyQt5.QtCore import pyqtSignal
+
+from ..core import ModelVariants
+from .scheduler import Job
+
+
+class VariantBuildThread(Job):
+    """Mede as variantes de um modelo na máquina local e grava o resultado ao lado dele"""
+    progress = pyqtSignal(int)
+    variants_ready = pyqtSignal(str, list)  # caminho do modelo, variantes medidas
+
+    name = "variantes"
+
+    def __init__(self, model_path, frames=None, runs=3):
+        super().__init__()
+        self.model_path = model_path
+        self.frames = frames
+        self.runs = runs
+
+    def run(self):
+        variants = ModelVariants(self.model_path).build(
+            frames=self.frames,
+            runs=self.runs,
+            progress=lambda i, total, name: self.progress.emit(int(i * 100 / total)),
+            cancelled=lambda: self.token.cancelled,
+        )
+        if not self.token.cancelled:
+            self.variants_ready.emit(self.model_path, variants)
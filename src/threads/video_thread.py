@@ -1,109 +1,273 @@
 """
-Thread para processamento YOLO em vídeo
+Job para processamento YOLO em vídeo
 """
+import os
+import threading
 import time
 import cv2
+import numpy as np
 import torch
-from ultralytics import YOLO
-from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtGui import QImage
 
+from ..core import (
+    ClipRecorder, DetectionAnalytics, Detector, FrameCache, KeyframeIndex, MemoryGovernor,
+    detector_options, extract_detections, open_decoder, predict_frame
+)
+from .mailbox import FrameMailbox
+from .scheduler import Job
 
-class VideoThread(QThread):
-    """Thread para processar detecção YOLO em tempo real em vídeos"""
-    frame_updated = pyqtSignal(QImage, list, float)
 
-    def __init__(self, model_path, source=0, max_size=1280):
+class VideoThread(Job):
+    """
+    Job para processar detecção YOLO em tempo real em vídeos
+
+    Os frames anotados não viajam por sinal: cada um sobrescreve
+    mailbox com (QImage, detecções, fps, índice) e a UI busca o mais
+    recente no ritmo da tela.
+
+    No fim do vídeo o job emite playback_ended e fica aguardando um seek
+    da linha do tempo (o cache e a análise continuam valendo); só termina
+    quando é cancelado.
+    """
+    stats_updated = pyqtSignal(dict)
+    video_opened = pyqtSignal(int, float)  # total de frames, fps da fonte
+    analytics_updated = pyqtSignal(dict)  # DetectionAnalytics.snapshot(), ~1x por segundo
+    playback_ended = pyqtSignal()  # fim da fonte alcançado (de novo após cada seek)
+
+    name = "vídeo"
+
+    def __init__(self, model_path, source=0, max_size=1280, preprocess='auto',
+                 rss_limit_mb=None, device_limit_mb=None, backend='auto',
+                 cache_mb=256, rois=None, variant=None, clip_rules=None, pre_roll=3.0,
+                 post_roll=3.0):
         super().__init__()
         self.model_path = model_path
-        self.running = True
+        self.variant = variant
         self.source = source
         self.max_size = max_size  # Tamanho máximo para processar
+        self.preprocess = preprocess  # 'auto', 'device' ou 'cpu'
+        self.backend = backend  # Decodificador: 'auto', 'opencv' ou 'pyav'
+        self.governor = MemoryGovernor(
+            rss_limit_mb=rss_limit_mb,
+            device_limit_mb=device_limit_mb,
+            max_size=max_size,
+            queue_depth=None,  # um frame por vez e a caixa de último valor: nada a reduzir
+            batch_size=None,
+        )
 
-    def run(self):
-        try:
-            model = YOLO(self.model_path)
-            cap = cv2.VideoCapture(self.source)
+        # Último frame anotado para a UI (fila de exibição com profundidade um)
+        self.mailbox = FrameMailbox()
 
-            if not cap.isOpened():
-                print(f"Erro: Não foi possível abrir o vídeo: {self.source}")
-                return
+        # Navegação: frames anotados recentes e pedido de seek vindo da UI
+        self.cache_mb = cache_mb
+        self.frame_cache = FrameCache(cache_mb)
+        self.keyframes = KeyframeIndex()
+        self._seek_request = None
+        self._seek_lock = threading.Lock()
 
-            fps_counter = 0
-            start_time = time.time()
-            fps = 0.0
+        # Regiões de interesse normalizadas (x1, y1, x2, y2); vazio = frame inteiro
+        self.rois = list(rois or [])
 
-            while self.running and cap.isOpened():
-                ret, frame = cap.read()
-                if not ret:
-                    print("Fim do vídeo ou erro ao ler frame")
-                    break
+        # Estatísticas do vídeo inteiro (criadas quando o modelo e o vídeo abrem)
+        self.analytics = None
 
-                try:
-                    # Redimensionar frame grande para economizar memória
-                    h, w = frame.shape[:2]
-                    if max(h, w) > self.max_size:
-                        scale = self.max_size / max(h, w)
-                        new_w = int(w * scale)
-                        new_h = int(h * scale)
-                        frame = cv2.resize(frame, (new_w, new_h))
-                        print(f"Frame redimensionado de {w}x{h} para {new_w}x{new_h}")
-
-                    results = model(
-                        frame,
-                        verbose=False,
-                        conf=0.5,
-                        device='0',
-                        half=True  # Usar FP16 para economizar VRAM
-                    )
+        # Gravação de clipes por evento (TriggerRule); vazio = desligada
+        self.clip_rules = list(clip_rules or [])
+        self.pre_roll = pre_roll
+        self.post_roll = post_roll
+        self.clip_recorder = None
 
-                    annotated = results[0].plot()
-                    rgb = cv2.cvtColor(annotated, cv2.COLOR_BGR2RGB)
-                    h, w, ch = rgb.shape
+    def seek(self, frame_index, exact=True):
+        """
+        Pede que o processamento continue a partir de frame_index (chamado pela UI)
 
-                    # Criar QImage com cópia dos dados contínuos
-                    bytes_per_line = ch * w
-                    qt_img = QImage(rgb.copy().data, w, h, bytes_per_line, QImage.Format_RGB888)
+        Args:
+            exact: False para parar no keyframe anterior (arraste da linha do
+                tempo: mostra um frame próximo sem decodificar até o alvo)
+        """
+        with self._seek_lock:
+            self._seek_request = (max(0, int(frame_index)), exact)
 
-                    detections = []
-                    for box in results[0].boxes:
-                        cls = int(box.cls)
-                        conf = float(box.conf)
-                        nome = results[0].names[cls]
-                        detections.append((nome, conf))
+    def set_rois(self, rois):
+        """Troca as ROIs usadas nos próximos frames (chamado pela UI)"""
+        self.rois = list(rois)
 
-                    fps_counter += 1
-                    if fps_counter % 30 == 0:
-                        fps = fps_counter / (time.time() - start_time)
+    def _take_seek(self):
+        with self._seek_lock:
+            request, self._seek_request = self._seek_request, None
+        return request
 
-                    self.frame_updated.emit(qt_img, detections, fps)
+    def _reposition(self, cap, target, exact=True):
+        """
+        Leva o decodificador até target usando o índice de keyframes
 
-                    # Limpar cache da GPU periodicamente
-                    if fps_counter % 100 == 0 and torch.cuda.is_available():
-                        torch.cuda.empty_cache()
+        Returns:
+            int: Frame em que o decodificador ficou (com exact=False, o
+                keyframe anterior ao alvo ou a posição atual)
+        """
+        if self.keyframes.should_decode_forward(cap.position, target):
+            if not exact:
+                # Sem keyframe no caminho: o seek aproximado voltaria para trás do frame atual
+                return cap.position
+            # Seguir decodificando é mais barato que o seek
+            while cap.position < target:
+                ok, _ = cap.read()
+                if not ok:
+                    break
+        else:
+            cap.seek(target, exact=exact)
+        return cap.position if not exact else target
 
-                except Exception as e:
-                    print(f"Erro ao processar frame {fps_counter}: {e}")
-                    continue
+    def run(self):
+        detector = Detector(self.model_path, preprocess=self.preprocess, **detector_options(self.variant))
+        if self.token.cancelled:
+            return
+        cap = open_decoder(self.source, backend=self.backend, max_size=self.max_size)
 
+        try:
+            if not cap.isOpened():
+                raise IOError(f"Não foi possível abrir o vídeo: {self.source}")
+            self._process(detector, cap)
+        finally:
             cap.release()
-
-            # Limpar memória da GPU ao finalizar
+            if self.clip_recorder is not None:
+                self.clip_recorder.close()
+            # Limpar memória da GPU ao finalizar (também ao cancelar ou falhar)
             if torch.cuda.is_available():
                 torch.cuda.empty_cache()
 
-        except Exception as e:
-            print(f"Erro crítico na thread de vídeo: {e}")
-            import traceback
-            traceback.print_exc()
-
-    def stop(self):
-        """Para a thread de forma segura"""
-        self.running = False
-        # Aguardar a thread terminar (com timeout de 3 segundos)
-        if self.isRunning():
-            self.wait(3000)
-            if self.isRunning():
-                print("Aviso: Thread não parou no tempo esperado")
-                self.terminate()
-                self.wait(1000)
+    def _process(self, detector, cap):
+        self.keyframes = KeyframeIndex.build(self.source, cap.fps)
+        self.video_opened.emit(cap.frame_count, cap.fps)
+
+        self.analytics = DetectionAnalytics(detector.model.names, cap.fps)
+        # Um bit por frame evita contar duas vezes um trecho reprocessado após seek
+        analysed = np.zeros(cap.frame_count, dtype=bool) if cap.frame_count > 0 else None
+        base_imgsz = detector.imgsz
+
+        if self.clip_rules:
+            known = set(detector.model.names.values())
+            for rule in self.clip_rules:
+                if rule.class_name not in known:
+                    print(f"Aviso: a regra {rule} usa uma classe que o modelo não conhece")
+            source_name = os.path.splitext(os.path.basename(str(self.source)))[0] or "camera"
+            self.clip_recorder = ClipRecorder(
+                self.clip_rules, cap.fps, pre_roll=self.pre_roll, post_roll=self.post_roll,
+                source_name=source_name
+            )
+
+        fps_counter = 0
+        start_time = time.time()
+        fps = 0.0
+        next_index = 0
+        exact = True
+        at_end = False
+        plan = None  # LetterboxPlan do caminho de CPU
+
+        # O token é consultado a cada frame; cancelar nunca interrompe uma inferência no meio
+        while not self.token.cancelled and cap.isOpened():
+            request = self._take_seek()
+            if request is not None:
+                next_index, exact = request
+                at_end = False
+
+            # Trecho já processado: exibir do cache, sem decodificar nem inferir
+            cached = self.frame_cache.get(next_index)
+            if cached is not None:
+                qt_img, detections = cached
+                self.mailbox.put((qt_img, detections, fps, next_index))
+                next_index += 1
+                self.token.wait(1.0 / cap.fps)
+                continue
+
+            if at_end:
+                # Fim do vídeo: aguardar um seek da linha do tempo
+                self.token.wait(0.05)
+                continue
+
+            if cap.position != next_index:
+                next_index = self._reposition(cap, next_index, exact)
+            exact = True
+
+            ret, frame = cap.read()
+            if not ret:
+                print("Fim do vídeo ou erro ao ler frame")
+                at_end = True
+                if self.clip_recorder is not None and self.clip_recorder.recording:
+                    # O pós-roll nunca chegaria ao fim: fechar o clipe com o que já foi gravado
+                    self.clip_recorder.flush()
+                    self.stats_updated.emit(self._status(cap, fps))
+                self.analytics_updated.emit(self.analytics.snapshot())
+                self.playback_ended.emit()
+                continue
+
+            index = next_index
+            next_index += 1
+
+            try:
+                decision = self.governor.update()
+                if decision is not None:
+                    self.max_size = self.governor.max_size
+                    cap.max_size = self.max_size
+                    # O governador só reduz; uma variante com imgsz menor continua valendo
+                    detector.set_imgsz(min(self.governor.imgsz, base_imgsz))
+                    self.frame_cache.set_budget(self.cache_mb / 2 ** decision['level'])
+                    decision['overwritten_frames'] = self.mailbox.overwritten
+                    self.stats_updated.emit(decision)
+
+                result, plan = predict_frame(detector, frame, self.max_size, plan, self.rois)
+
+                detections = extract_detections(result)
+
+                first_pass = analysed is None or index >= len(analysed) or not analysed[index]
+                if first_pass:
+                    if analysed is not None and index < len(analysed):
+                        analysed[index] = True
+                    self.analytics.update(
+                        index,
+                        result.boxes.cls.cpu().numpy(),
+                        result.boxes.conf.cpu().numpy()
+                    )
+
+                fps_counter += 1
+                if fps_counter % 30 == 0:
+                    fps = fps_counter / (time.time() - start_time)
+                    self.stats_updated.emit(self._status(cap, fps))
+
+                if fps_counter % max(int(cap.fps), 1) == 0:
+                    self.analytics_updated.emit(self.analytics.snapshot())
+
+                annotated = result.plot()
+                if self.clip_recorder is not None:
+                    # O mesmo frame anotado vai para o gravador (pré-roll e clipe);
+                    # a compressão e a escrita acontecem na thread do gravador
+                    self.clip_recorder.update(index, detections, annotated)
+
+                rgb = cv2.cvtColor(annotated, cv2.COLOR_BGR2RGB)
+                h, w, ch = rgb.shape
+
+                # QImage dona dos próprios dados (fica no cache de navegação)
+                bytes_per_line = ch * w
+                qt_img = QImage(rgb.data, w, h, bytes_per_line, QImage.Format_RGB888).copy()
+                self.frame_cache.put(index, (qt_img, detections), qt_img.sizeInBytes())
+
+                # UI atrasada: o frame anterior ainda não exibido é substituído, nada acumula
+                self.mailbox.put((qt_img, detections, fps, index))
+
+            except Exception as e:
+                print(f"Erro ao processar frame {index}: {e}")
+                continue
+
+    def _status(self, cap, fps):
+        """Estado do governador com FPS, cache, frames não exibidos e gravação"""
+        status = self.governor.status()
+        status['fps'] = round(fps, 1)
+        status['decode_fps'] = round(cap.decode_fps, 1)
+        status['overwritten_frames'] = self.mailbox.overwritten
+        status['cache_mb'] = round(self.frame_cache.size_mb, 1)
+        if self.clip_recorder is not None:
+            status['clips'] = self.clip_recorder.clips_saved
+            status['recording'] = self.clip_recorder.recording
+            status['dropped_frames'] = self.clip_recorder.dropped_frames
+        return status
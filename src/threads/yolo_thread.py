@@ -1,52 +1,56 @@
 """
-Thread para processamento YOLO em imagens
+Job para processamento YOLO em imagens
 """
-import os
 import cv2
-from ultralytics import YOLO
-from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtGui import QImage
 
+from ..core import Detector, detector_options, extract_detections
+from .scheduler import Job
 
-class YOLOThread(QThread):
-    """Thread para processar detecção YOLO em imagens estáticas"""
-    finished = pyqtSignal(str, list)
+
+class YOLOThread(Job):
+    """Job para processar detecção YOLO em imagens estáticas"""
+    finished = pyqtSignal(str, list, QImage)
     progress = pyqtSignal(int)
 
-    def __init__(self, model_path, image_path):
+    name = "imagem"
+
+    def __init__(self, model_path, image_path, writer=None, variant=None):
         super().__init__()
         self.model_path = model_path
+        self.variant = variant  # Variante medida (ModelVariants) ou None para o padrão
         self.image_path = image_path
+        self.writer = writer  # ResultWriter opcional para salvar em segundo plano
 
     def run(self):
-        try:
-            self.progress.emit(15)
-            model = YOLO(self.model_path)
-            self.progress.emit(45)
-            results = model(
-                self.image_path,
-                verbose=False,
-                conf=0.5,
-                device='0',
-                half=True  # Usar FP16 na GPU
-            )
-            self.progress.emit(75)
-
-            save_dir = "resultados"
-            os.makedirs(save_dir, exist_ok=True)
-            output_path = os.path.join(save_dir, "saida.jpg")
-
-            img_result = results[0].plot()
-            cv2.imwrite(output_path, cv2.cvtColor(img_result, cv2.COLOR_BGR2RGB))
-
-            detections = []
-            for box in results[0].boxes:
-                cls = int(box.cls)
-                conf = float(box.conf)
-                nome = results[0].names[cls]
-                detections.append((nome, conf))
-
-            self.progress.emit(100)
-            self.finished.emit(output_path, detections)
-        except Exception as e:
-            print("Erro:", e)
-            self.finished.emit("", [])
+        self.progress.emit(15)
+        detector = Detector(self.model_path, **detector_options(self.variant))
+        if self.token.cancelled:
+            return
+        self.progress.emit(45)
+        frame = cv2.imread(self.image_path)
+        if frame is None:
+            raise IOError(f"Não foi possível ler a imagem: {self.image_path}")
+        result = detector.predict(frame)
+        if self.token.cancelled:
+            return
+        self.progress.emit(75)
+
+        img_result = result.plot()
+        detections = extract_detections(result)
+
+        # Gravação fica com o ResultWriter; a UI recebe a imagem em memória
+        output_path = ""
+        if self.writer is not None:
+            output_path = self.writer.submit(img_result, detections, self.image_path)
+
+        rgb = cv2.cvtColor(img_result, cv2.COLOR_BGR2RGB)
+        h, w, ch = rgb.shape
+        qt_img = QImage(rgb.data, w, h, ch * w, QImage.Format_RGB888).copy()
+
+        self.progress.emit(100)
+        self.finished.emit(output_path, detections, qt_img)
+
+    def on_failure(self, error):
+        self.finished.emit("", [], QImage())
@@ -0,0 +1,69 @@
+"""
+Gráfico de ocupação por classe ao longo do vídeo
+"""
+from PyQt5.QtWidgets import QWidget, QSizePolicy
+from PyQt5.QtGui import QPainter, QPen, QColor, QPolygonF, QFont
+from PyQt5.QtCore import Qt, QPointF
+
+
+SERIES_COLORS = ["#3b82f6", "#10b981", "#f59e0b", "#ef4444", "#8b5cf6"]
+
+
+class OccupancyChart(QWidget):
+    """Desenha a fração de frames com cada classe por intervalo de tempo"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.snapshot = None
+        self.setMinimumHeight(110)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+
+    def set_snapshot(self, snapshot):
+        """Recebe o resultado de DetectionAnalytics.snapshot() e redesenha"""
+        self.snapshot = snapshot
+        self.update()
+
+    def clear(self):
+        self.snapshot = None
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.fillRect(self.rect(), QColor("#f9fafb"))
+
+        rect = self.rect().adjusted(8, 8, -8, -22)
+        painter.setPen(QPen(QColor("#e5e7eb"), 1))
+        painter.drawRect(rect)
+
+        snapshot = self.snapshot
+        if not snapshot or not snapshot['names'] or len(snapshot['occupancy']) == 0:
+            painter.setPen(QColor("#6b7280"))
+            painter.drawText(rect, Qt.AlignCenter, "Sem detecções ainda")
+            return
+
+        occupancy = snapshot['occupancy']
+        n_bins = len(occupancy)
+        step = rect.width() / max(n_bins - 1, 1)
+
+        for k, name in enumerate(snapshot['names']):
+            color = QColor(SERIES_COLORS[k % len(SERIES_COLORS)])
+            painter.setPen(QPen(color, 2))
+            points = QPolygonF([
+                QPointF(rect.left() + i * step, rect.bottom() - occupancy[i, k] * rect.height())
+                for i in range(n_bins)
+            ])
+            painter.drawPolyline(points)
+
+        # Legenda
+        painter.setFont(QFont(painter.font().family(), 8))
+        x = rect.left()
+        for k, (name, total) in enumerate(zip(snapshot['names'], snapshot['totals'])):
+            painter.setPen(QColor(SERIES_COLORS[k % len(SERIES_COLORS)]))
+            label = f"■ {name} ({total})"
+            painter.drawText(x, self.height() - 6, label)
+            x += painter.fontMetrics().width(label) + 14
+
+        painter.setPen(QColor("#6b7280"))
+        duration = n_bins * snapshot['bin_seconds']
+        painter.drawText(rect.adjusted(0, 0, -4, 0), Qt.AlignRight | Qt.AlignTop, f"{duration:.0f}s")
@@ -2,17 +2,33 @@
 Janela principal do aplicativo FEI Vision Studio
 """
 import os
+from collections import OrderedDict
+
+import cv2
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
-    QFileDialog, QMessageBox, QListWidget, QProgressBar, QFrame,
-    QComboBox, QButtonGroup, QRadioButton, QSplitter, QSizePolicy
+    QFileDialog, QMessageBox, QListWidget, QListWidgetItem, QListView,
+    QProgressBar, QFrame, QComboBox, QButtonGroup, QRadioButton, QSplitter,
+    QSizePolicy, QSlider, QRubberBand, QLineEdit, QApplication
 )
-from PyQt5.QtGui import QPixmap, QImage
-from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPixmap, QImage, QIcon, QPainter, QPen, QColor
+from PyQt5.QtCore import Qt, QTimer, QSize, QRect, QEvent
 
-from ..threads import YOLOThread, VideoThread
-from ..utils.image_utils import display_image_scaled, create_placeholder, create_custom_placeholder
+from ..core import ModelVariants, ResultWriter, RoiStore, open_decoder, parse_rules, variant_label
+from ..threads import (
+    YOLOThread, VideoThread, ImageSessionThread, ComparisonThread, VariantBuildThread, IMAGE_EXTENSIONS,
+    JobScheduler, PRIORITY_INTERACTIVE, PRIORITY_NORMAL, PRIORITY_BACKGROUND, STATUS_LABELS
+)
+from ..utils.image_utils import (
+    ScaledPixmapCache, display_cached_pixmap, available_image_size,
+    create_placeholder, create_custom_placeholder
+)
 from . import styles
+from .analytics_chart import OccupancyChart
+
+
+# Papel dos itens do combo de modelos que guarda a variante medida (dict ou None)
+VARIANT_ROLE = Qt.UserRole + 1
 
 
 class YOLOApp(QWidget):
@@ -26,15 +42,55 @@ class YOLOApp(QWidget):
 
         # Atributos de estado
         self.model_path = None
+        self.model_variant = None  # variante escolhida no combo (None = configuração padrão)
         self.source_path = None
+        # Jobs atuais de cada modo; rodam no pool do agendador, nunca na thread da UI
+        self.scheduler = JobScheduler(max_workers=3, parent=self)
+        self.scheduler.job_status.connect(self._on_job_status)
         self.video_thread = None
         self.thread = None
+        self.session_thread = None
+        self.comparison_thread = None
+        self.variant_thread = None
         self.is_detecting = False
         self.detection_mode = "image"
-        self.current_image_path = None
-        self.current_scale = 1.0
+        self.current_image = None  # ScaledPixmapCache da imagem exibida
+        # Escala da interface pelo DPI da tela; cada widget guarda a fábrica do seu estilo
+        self.current_scale = styles.screen_scale(QApplication.primaryScreen())
+        self.scaled_styles = {}  # widget -> (função get_*_style, argumentos)
+        self.screen_tracked = False
+        self.result_writer = ResultWriter("resultados", index="sqlite")
+        self.video_fps = 30.0
+        self.video_frame_count = 0
+        self.last_analytics = None  # DetectionAnalytics do último vídeo processado
+
+        # Regiões de interesse do vídeo atual (normalizadas), salvas por fonte
+        self.roi_store = RoiStore()
+        self.rois = []
+        self.roi_drawing = False
+        self.roi_origin = None
+
+        # Sessão com várias imagens
+        self.session_paths = []
+        self.session_results = {}  # índice -> (caminho salvo, detecções)
+        self.session_pixmaps = OrderedDict()  # LRU índice -> ScaledPixmapCache
+        self.session_cache_size = 24
+        self.session_follow = True  # exibe o resultado mais recente até o usuário navegar
         self.ui_initialized = False
 
+        # Escala suave só depois que o redimensionamento da janela para
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(120)
+        self.resize_timer.timeout.connect(self._update_displayed_image)
+
+        # Frames do vídeo: a UI busca o mais recente no ritmo da tela, em vez de um sinal por frame
+        screen = QApplication.primaryScreen()
+        refresh = screen.refreshRate() if screen is not None else 60.0
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setInterval(max(8, min(33, int(1000 / max(refresh, 1.0)))))
+        self.frame_timer.timeout.connect(self._pull_video_frame)
+
         # Construir interface
         self._setup_ui()
         self.ui_initialized = True
@@ -65,6 +121,29 @@ class YOLOApp(QWidget):
         # Aplicar estilo global
         self.setStyleSheet(styles.GLOBAL_STYLE)
 
+    def _set_scaled_style(self, widget, style_func, *args):
+        """Aplica um estilo escalável e o registra (ou atualiza o registro) para mudanças de escala"""
+        self.scaled_styles[widget] = (style_func, args)
+        styles.apply_style(widget, style_func(*args, scale=self.current_scale))
+
+    def _set_detect_button(self, detecting):
+        """Texto e folha do botão iniciar/parar (as duas folhas vêm do cache de styles)"""
+        self.btn_detect.setText("⏸  Parar Detecção" if detecting else "▶  Iniciar Detecção")
+        self._set_scaled_style(self.btn_detect, styles.get_action_button_style, detecting)
+
+    def _apply_scale(self, scale):
+        """
+        Re-aplica os estilos registrados em outra escala
+
+        Só os widgets registrados recebem folha nova (strings do cache de
+        styles); nada acontece se a escala arredondada não mudou.
+        """
+        if scale == self.current_scale:
+            return
+        self.current_scale = scale
+        for widget, (style_func, args) in self.scaled_styles.items():
+            styles.apply_style(widget, style_func(*args, scale=scale))
+
     def _create_sidebar(self):
         """Cria a barra lateral com controles"""
         self.sidebar = QFrame()
@@ -139,19 +218,33 @@ class YOLOApp(QWidget):
     def _add_model_section(self, layout):
         """Adiciona seção de seleção de modelo"""
         self.model_label = QLabel("Modelo YOLO")
-        self.model_label.setStyleSheet(styles.get_label_style(12))
+        self._set_scaled_style(self.model_label, styles.get_label_style, 12)
         layout.addWidget(self.model_label)
 
         self.model_combo = QComboBox()
+        self.compare_list = QListWidget()
         self._load_available_models()
         self.model_combo.currentTextChanged.connect(self._on_model_selected)
-        self.model_combo.setStyleSheet(styles.get_combo_box_style())
+        self._set_scaled_style(self.model_combo, styles.get_combo_box_style)
         layout.addWidget(self.model_combo)
 
+        # Mede variantes (INT8, FP32/FP16, imgsz menor) do modelo selecionado
+        self.btn_optimize = QPushButton("⚡  Otimizar Modelo")
+        self.btn_optimize.setCursor(Qt.PointingHandCursor)
+        self._set_scaled_style(self.btn_optimize, styles.get_secondary_button_style)
+        self.btn_optimize.clicked.connect(self._optimize_model)
+        layout.addWidget(self.btn_optimize)
+
+        # Modelos marcados para o modo de comparação
+        self._set_scaled_style(self.compare_list, styles.get_list_widget_style)
+        self.compare_list.setMaximumHeight(140)
+        self.compare_list.setVisible(False)
+        layout.addWidget(self.compare_list)
+
     def _add_detection_type_section(self, layout):
         """Adiciona seção de tipo de detecção"""
         self.source_label = QLabel("Tipo de Detecção")
-        self.source_label.setStyleSheet(styles.get_label_style(12))
+        self._set_scaled_style(self.source_label, styles.get_label_style, 12)
         layout.addWidget(self.source_label)
 
         self.source_group = QButtonGroup()
@@ -159,49 +252,110 @@ class YOLOApp(QWidget):
         self.radio_image = QRadioButton("📷  Imagem")
         self.radio_image.setChecked(True)
         self.radio_image.setCursor(Qt.PointingHandCursor)
-        self.radio_image.setStyleSheet(styles.get_radio_button_style())
-        self.radio_image.toggled.connect(lambda: self._set_detection_mode("image"))
+        self._set_scaled_style(self.radio_image, styles.get_radio_button_style)
+        self.radio_image.toggled.connect(lambda checked: checked and self._set_detection_mode("image"))
 
         self.radio_video = QRadioButton("🎬  Vídeo")
         self.radio_video.setCursor(Qt.PointingHandCursor)
-        self.radio_video.setStyleSheet(styles.get_radio_button_style())
-        self.radio_video.toggled.connect(lambda: self._set_detection_mode("video"))
+        self._set_scaled_style(self.radio_video, styles.get_radio_button_style)
+        self.radio_video.toggled.connect(lambda checked: checked and self._set_detection_mode("video"))
+
+        self.radio_session = QRadioButton("🗂  Várias Imagens")
+        self.radio_session.setCursor(Qt.PointingHandCursor)
+        self._set_scaled_style(self.radio_session, styles.get_radio_button_style)
+        self.radio_session.toggled.connect(lambda checked: checked and self._set_detection_mode("session"))
+
+        self.radio_compare = QRadioButton("⚖  Comparar Modelos")
+        self.radio_compare.setCursor(Qt.PointingHandCursor)
+        self._set_scaled_style(self.radio_compare, styles.get_radio_button_style)
+        self.radio_compare.toggled.connect(lambda checked: checked and self._set_detection_mode("compare"))
 
         self.source_group.addButton(self.radio_image)
         self.source_group.addButton(self.radio_video)
+        self.source_group.addButton(self.radio_session)
+        self.source_group.addButton(self.radio_compare)
 
         layout.addWidget(self.radio_image)
         layout.addWidget(self.radio_video)
+        layout.addWidget(self.radio_session)
+        layout.addWidget(self.radio_compare)
 
     def _add_load_source_section(self, layout):
         """Adiciona seção de carregar fonte"""
         self.source_btn_label = QLabel("Carregar Fonte")
-        self.source_btn_label.setStyleSheet(styles.get_label_style(12))
+        self._set_scaled_style(self.source_btn_label, styles.get_label_style, 12)
         layout.addWidget(self.source_btn_label)
 
         self.btn_load_source = QPushButton("📂  Selecionar Arquivo")
         self.btn_load_source.setCursor(Qt.PointingHandCursor)
-        self.btn_load_source.setStyleSheet(styles.get_primary_button_style())
+        self._set_scaled_style(self.btn_load_source, styles.get_primary_button_style)
         self.btn_load_source.clicked.connect(self._load_source)
         layout.addWidget(self.btn_load_source)
 
+        self.btn_load_folder = QPushButton("📁  Selecionar Pasta")
+        self.btn_load_folder.setCursor(Qt.PointingHandCursor)
+        self._set_scaled_style(self.btn_load_folder, styles.get_secondary_button_style)
+        self.btn_load_folder.clicked.connect(self._load_folder)
+        self.btn_load_folder.setVisible(False)
+        layout.addWidget(self.btn_load_folder)
+
+        roi_layout = QHBoxLayout()
+        self.btn_draw_roi = QPushButton("✏  Desenhar ROI")
+        self.btn_draw_roi.setCheckable(True)
+        self.btn_draw_roi.setCursor(Qt.PointingHandCursor)
+        self._set_scaled_style(self.btn_draw_roi, styles.get_secondary_button_style)
+        self.btn_draw_roi.toggled.connect(self._set_roi_drawing)
+
+        self.btn_clear_roi = QPushButton("✕  Limpar")
+        self.btn_clear_roi.setCursor(Qt.PointingHandCursor)
+        self._set_scaled_style(self.btn_clear_roi, styles.get_secondary_button_style)
+        self.btn_clear_roi.clicked.connect(self._clear_rois)
+
+        roi_layout.addWidget(self.btn_draw_roi, stretch=1)
+        roi_layout.addWidget(self.btn_clear_roi)
+        self.roi_controls = QWidget()
+        self.roi_controls.setLayout(roi_layout)
+        roi_layout.setContentsMargins(0, 0, 0, 0)
+        self.roi_controls.setVisible(False)
+        layout.addWidget(self.roi_controls)
+
+        # Regras de gravação por evento; clipes vão para resultados/clipes/
+        self.clip_rules_edit = QLineEdit()
+        self.clip_rules_edit.setPlaceholderText("🎞  Gravar clipes: person>0.6x5, car")
+        self.clip_rules_edit.setToolTip(
+            "Grava um clipe anotado (3 s antes e depois) quando a classe aparece com\n"
+            "confiança acima do valor por N frames seguidos. Vazio = não gravar."
+        )
+        self.clip_rules_edit.setStyleSheet(
+            "padding: 8px; border: 1px solid #d1d5db; border-radius: 6px; background: white;"
+        )
+        self.clip_rules_edit.setVisible(False)
+        layout.addWidget(self.clip_rules_edit)
+
     def _add_save_section(self, layout):
         """Adiciona seção de salvar"""
         self.save_label = QLabel("Salvar Resultado")
-        self.save_label.setStyleSheet(styles.get_label_style(12))
+        self._set_scaled_style(self.save_label, styles.get_label_style, 12)
         layout.addWidget(self.save_label)
 
         self.btn_save = QPushButton("💾  Salvar")
         self.btn_save.setCursor(Qt.PointingHandCursor)
-        self.btn_save.setStyleSheet(styles.get_secondary_button_style())
+        self._set_scaled_style(self.btn_save, styles.get_secondary_button_style)
         self.btn_save.clicked.connect(self._save_result)
         layout.addWidget(self.btn_save)
 
+        self.btn_export_analytics = QPushButton("📊  Exportar Análise")
+        self.btn_export_analytics.setCursor(Qt.PointingHandCursor)
+        self._set_scaled_style(self.btn_export_analytics, styles.get_secondary_button_style)
+        self.btn_export_analytics.clicked.connect(self._export_analytics)
+        self.btn_export_analytics.setVisible(False)
+        layout.addWidget(self.btn_export_analytics)
+
     def _add_action_button(self, layout):
         """Adiciona botão de iniciar/parar"""
         self.btn_detect = QPushButton("▶  Iniciar Detecção")
         self.btn_detect.setCursor(Qt.PointingHandCursor)
-        self.btn_detect.setStyleSheet(styles.get_action_button_style(False))
+        self._set_scaled_style(self.btn_detect, styles.get_action_button_style, False)
         self.btn_detect.clicked.connect(self._toggle_detection)
         layout.addWidget(self.btn_detect)
 
@@ -225,6 +379,11 @@ class YOLOApp(QWidget):
         self.progress.setStyleSheet(styles.PROGRESS_BAR_STYLE)
         self.content_layout.addWidget(self.progress)
 
+        # Linha de status (FPS e memória)
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet("color: #6b7280; font-size: 12px;")
+        self.content_layout.addWidget(self.status_label)
+
         # Painel de resultados
         self._create_results_panel()
 
@@ -242,6 +401,8 @@ class YOLOApp(QWidget):
         self.image_label.setMinimumHeight(300)
         self.image_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.image_label.setScaledContents(False)
+        self.image_label.installEventFilter(self)
+        self.roi_band = QRubberBand(QRubberBand.Rectangle, self.image_label)
 
         # Placeholder inicial
         self._setup_placeholder()
@@ -249,6 +410,44 @@ class YOLOApp(QWidget):
         image_layout.addWidget(self.image_label)
         self.content_layout.addWidget(self.image_container, stretch=1)
 
+        self._create_timeline()
+        self._create_thumbnail_strip()
+
+    def _create_timeline(self):
+        """Cria a linha do tempo do vídeo"""
+        self.timeline = QWidget()
+        timeline_layout = QHBoxLayout(self.timeline)
+        timeline_layout.setContentsMargins(0, 0, 0, 0)
+        timeline_layout.setSpacing(12)
+
+        self.timeline_slider = QSlider(Qt.Horizontal)
+        self.timeline_slider.setEnabled(False)
+        self.timeline_slider.sliderMoved.connect(self._on_timeline_moved)
+        self.timeline_slider.sliderReleased.connect(self._on_timeline_released)
+        self.timeline_slider.actionTriggered.connect(self._on_timeline_action)
+
+        self.timeline_label = QLabel("00:00 / 00:00")
+        self.timeline_label.setStyleSheet("color: #6b7280; font-size: 12px;")
+
+        timeline_layout.addWidget(self.timeline_slider, stretch=1)
+        timeline_layout.addWidget(self.timeline_label)
+        self.timeline.setVisible(False)
+        self.content_layout.addWidget(self.timeline)
+
+    def _create_thumbnail_strip(self):
+        """Cria a faixa de miniaturas da sessão de imagens"""
+        self.thumb_strip = QListWidget()
+        self.thumb_strip.setViewMode(QListView.IconMode)
+        self.thumb_strip.setFlow(QListView.LeftToRight)
+        self.thumb_strip.setWrapping(False)
+        self.thumb_strip.setMovement(QListView.Static)
+        self.thumb_strip.setIconSize(QSize(96, 96))
+        self.thumb_strip.setFixedHeight(140)
+        self._set_scaled_style(self.thumb_strip, styles.get_list_widget_style)
+        self.thumb_strip.itemClicked.connect(self._on_thumbnail_clicked)
+        self.thumb_strip.setVisible(False)
+        self.content_layout.addWidget(self.thumb_strip)
+
     def _create_results_panel(self):
         """Cria painel de resultados"""
         result_container = QFrame()
@@ -267,10 +466,14 @@ class YOLOApp(QWidget):
         result_layout.addWidget(self.result_header)
 
         self.list = QListWidget()
-        self.list.setStyleSheet(styles.get_list_widget_style())
+        self._set_scaled_style(self.list, styles.get_list_widget_style)
         self.list.addItem("Nenhum objeto detectado ainda. Selecione uma fonte e clique em 'Iniciar Detecção'.")
         result_layout.addWidget(self.list)
 
+        self.analytics_chart = OccupancyChart()
+        self.analytics_chart.setVisible(False)
+        result_layout.addWidget(self.analytics_chart)
+
         self.content_layout.addWidget(result_container)
 
     def _create_separator(self):
@@ -303,8 +506,25 @@ class YOLOApp(QWidget):
         found_models = list(set(found_models))
         found_models.sort()
 
+        checked = set(self._checked_models())  # recarregar não desmarca a seleção da comparação
+        self.compare_list.clear()
         for model_name, model_path in found_models:
-            self.model_combo.addItem(model_name, model_path)
+            # Variantes medidas aparecem logo abaixo do modelo, com velocidade e tamanho
+            variants = ModelVariants(model_path).load()
+            base = next((v for v in variants if v['name'] == 'padrão'), None)
+            label = f"{model_name}  ·  {variant_label(base)}" if base else model_name
+            self.model_combo.addItem(label, model_path)
+            for variant in variants:
+                if variant is base:
+                    continue
+                self.model_combo.addItem(f"    ↳ {variant['name']}  ·  {variant_label(variant)}", model_path)
+                self.model_combo.setItemData(self.model_combo.count() - 1, variant, VARIANT_ROLE)
+
+            item = QListWidgetItem(model_name)
+            item.setData(Qt.UserRole, model_path)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked if model_path in checked else Qt.Unchecked)
+            self.compare_list.addItem(item)
 
         if not found_models:
             self.model_combo.addItem("Nenhum modelo encontrado")
@@ -313,25 +533,78 @@ class YOLOApp(QWidget):
         """Callback quando um modelo é selecionado"""
         if model_name and model_name not in ["Selecione um modelo...", "Nenhum modelo encontrado"]:
             self.model_path = self.model_combo.currentData()
-            print(f"Modelo selecionado: {self.model_path}")
+            self.model_variant = self.model_combo.itemData(self.model_combo.currentIndex(), VARIANT_ROLE)
+            variant = f" (variante {self.model_variant['name']})" if self.model_variant else ""
+            print(f"Modelo selecionado: {self.model_path}{variant}")
+
+    def _optimize_model(self):
+        """Mede as variantes do modelo selecionado em segundo plano"""
+        if not self.model_path or self.model_combo.currentIndex() == 0:
+            QMessageBox.warning(self, "Aviso", "Selecione um modelo YOLO primeiro.")
+            return
+        if self.variant_thread:
+            return
+
+        print(f"Medindo variantes de {self.model_path}...")
+        self.btn_optimize.setEnabled(False)
+        self.btn_optimize.setText("⏳  Medindo variantes...")
+        self.variant_thread = VariantBuildThread(self.model_path)
+        self.variant_thread.progress.connect(self.progress.setValue)
+        self.variant_thread.variants_ready.connect(self._on_variants_ready)
+        self.variant_thread.done.connect(self._variants_finished)
+        self.scheduler.submit(self.variant_thread, PRIORITY_NORMAL)
+
+    def _on_variants_ready(self, model_path, variants):
+        """Recarrega o combo com as variantes medidas e mantém o modelo selecionado"""
+        self._load_available_models()
+        index = self.model_combo.findData(model_path)
+        if index >= 0:
+            self.model_combo.setCurrentIndex(index)
+        if len(variants) > 1:
+            fastest = max(variants, key=lambda v: v['fps'])
+            self.status_label.setText(f"Variante mais rápida: {fastest['name']} ({variant_label(fastest)})")
+
+    def _variants_finished(self, status):
+        self.variant_thread = None
+        self.btn_optimize.setEnabled(True)
+        self.btn_optimize.setText("⚡  Otimizar Modelo")
 
     def _set_detection_mode(self, mode):
         """Define o modo de detecção"""
         self.detection_mode = mode
-        if mode == "video":
+        if mode in ("video", "compare"):
             self.btn_load_source.setText("🎬  Selecionar Vídeo")
+        elif mode == "session":
+            self.btn_load_source.setText("🗂  Selecionar Imagens")
         else:
             self.btn_load_source.setText("📷  Selecionar Imagem")
 
+        self.btn_load_folder.setVisible(mode == "session")
+        self.compare_list.setVisible(mode == "compare")
+        self.model_combo.setVisible(mode != "compare")
+        self.timeline.setVisible(mode == "video")
+        self.roi_controls.setVisible(mode == "video")
+        self.clip_rules_edit.setVisible(mode == "video")
+        self.analytics_chart.setVisible(mode == "video")
+        self.btn_export_analytics.setVisible(mode == "video")
+        self.thumb_strip.setVisible(mode == "session")
+
     def _load_source(self):
         """Carrega a fonte (imagem ou vídeo)"""
-        if self.detection_mode == "video":
+        if self.detection_mode in ("video", "compare"):
             file_path, _ = QFileDialog.getOpenFileName(
                 self, "Selecionar Vídeo", "", "Vídeos (*.mp4 *.avi *.mov *.mkv)"
             )
             if file_path:
                 self.source_path = file_path
-                self._display_placeholder_with_text("Vídeo carregado", "Clique em 'Iniciar Detecção' para processar")
+                self.rois = self.roi_store.load(file_path)
+                self._show_video_preview(file_path)
+        elif self.detection_mode == "session":
+            file_paths, _ = QFileDialog.getOpenFileNames(
+                self, "Selecionar Imagens", "", "Imagens (*.jpg *.png *.jpeg *.bmp)"
+            )
+            if file_paths:
+                self._set_session_sources(file_paths)
         else:
             file_path, _ = QFileDialog.getOpenFileName(
                 self, "Selecionar Imagem", "", "Imagens (*.jpg *.png *.jpeg *.bmp)"
@@ -342,21 +615,77 @@ class YOLOApp(QWidget):
                 self.list.clear()
                 self.progress.setValue(0)
 
-    def _display_image(self, path):
-        """Exibe uma imagem"""
+    def _show_video_preview(self, path):
+        """Exibe o primeiro frame do vídeo, onde as ROIs podem ser desenhadas"""
+        frame = None
+        try:
+            decoder = open_decoder(path, backend='opencv')
+            ok, frame = decoder.read()
+            decoder.release()
+        except Exception as e:
+            print(f"Erro ao ler prévia do vídeo: {e}")
+
+        if frame is None:
+            self._display_placeholder_with_text("Vídeo carregado", "Clique em 'Iniciar Detecção' para processar")
+            return
+
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        h, w, ch = rgb.shape
+        image = QImage(rgb.data, w, h, ch * w, QImage.Format_RGB888).copy()
+        self._display_image(QPixmap.fromImage(image))
+
+    def _load_folder(self):
+        """Carrega todas as imagens de uma pasta para a sessão"""
+        folder = QFileDialog.getExistingDirectory(self, "Selecionar Pasta de Imagens")
+        if not folder:
+            return
+
+        file_paths = sorted(
+            os.path.join(folder, name) for name in os.listdir(folder)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        if not file_paths:
+            QMessageBox.warning(self, "Aviso", "Nenhuma imagem encontrada na pasta.")
+            return
+
+        self._set_session_sources(file_paths)
+
+    def _set_session_sources(self, file_paths):
+        """Define as imagens da sessão e limpa resultados anteriores"""
+        self.session_paths = list(file_paths)
+        self.source_path = self.session_paths[0]
+        self._reset_session_results()
+        self._display_placeholder_with_text(
+            f"{len(self.session_paths)} imagens carregadas",
+            "Clique em 'Iniciar Detecção' para processar a sessão"
+        )
+
+    def _reset_session_results(self):
+        """Limpa resultados, cache e miniaturas da sessão"""
+        self.session_results.clear()
+        self.session_pixmaps.clear()
+        self.session_follow = True
+        self.thumb_strip.clear()
+        self.list.clear()
+        self.progress.setValue(0)
+
+    def _display_image(self, image):
+        """Exibe uma imagem (caminho ou QPixmap), decodificada uma única vez"""
         from PyQt5.QtWidgets import QWidget
         if self.image_label.layout():
             QWidget().setLayout(self.image_label.layout())
 
-        self.current_image_path = path
+        self.current_image = ScaledPixmapCache(image)
         self._update_displayed_image()
 
-    def _update_displayed_image(self):
-        """Atualiza a exibição da imagem"""
-        if not self.current_image_path:
+    def _update_displayed_image(self, smooth=True):
+        """Atualiza a exibição da imagem a partir do cache em memória"""
+        if not self.current_image:
             return
 
-        display_image_scaled(self.image_label, self.current_image_path)
+        display_cached_pixmap(self.image_label, self.current_image, smooth)
+        if self.detection_mode == "video" and self.rois:
+            self.image_label.setPixmap(self._paint_rois(self.image_label.pixmap()))
 
     def _display_placeholder_with_text(self, main_text, sub_text):
         """Exibe placeholder com texto customizado"""
@@ -364,13 +693,21 @@ class YOLOApp(QWidget):
         if self.image_label.layout():
             QWidget().setLayout(self.image_label.layout())
 
-        self.current_image_path = None
+        self.current_image = None
         placeholder_layout = create_custom_placeholder("✓", main_text, sub_text)
         self.image_label.setLayout(placeholder_layout)
 
     def _toggle_detection(self):
         """Inicia ou para a detecção"""
-        if not self.model_path or self.model_combo.currentIndex() == 0:
+        if self.is_detecting:
+            self._stop_detection()
+            return
+
+        if self.detection_mode == "compare":
+            if len(self._checked_models()) < 2:
+                QMessageBox.warning(self, "Aviso", "Marque ao menos dois modelos para comparar.")
+                return
+        elif not self.model_path or self.model_combo.currentIndex() == 0:
             QMessageBox.warning(self, "Aviso", "Selecione um modelo YOLO primeiro.")
             return
 
@@ -378,88 +715,170 @@ class YOLOApp(QWidget):
             QMessageBox.warning(self, "Aviso", "Carregue uma fonte primeiro (imagem ou vídeo).")
             return
 
-        if self.is_detecting:
-            self._stop_detection()
-        else:
-            self._start_detection()
+        self._start_detection()
+
+    def _checked_models(self):
+        """Caminhos dos modelos marcados na lista de comparação"""
+        return [
+            self.compare_list.item(i).data(Qt.UserRole)
+            for i in range(self.compare_list.count())
+            if self.compare_list.item(i).checkState() == Qt.Checked
+        ]
 
     def _start_detection(self):
         """Inicia a detecção"""
+        if self.video_thread is not None and self.detection_mode != "video":
+            # Vídeo já terminado, parado só para navegação na linha do tempo
+            self.scheduler.cancel(self.video_thread)
+            self.video_thread = None
         self.is_detecting = True
-        self.btn_detect.setText("⏸  Parar Detecção")
-        self.btn_detect.setStyleSheet(styles.get_action_button_style(True, self.current_scale))
+        self._set_detect_button(True)
 
         if self.detection_mode == "image":
             self._detect_image()
+        elif self.detection_mode == "session":
+            self._detect_session()
+        elif self.detection_mode == "compare":
+            self._detect_comparison()
         else:
             self._detect_video()
 
     def _stop_detection(self):
-        """Para a detecção"""
-        try:
-            if self.video_thread:
-                print("Parando thread de vídeo...")
-                # Desconectar sinais para evitar problemas
-                try:
-                    self.video_thread.frame_updated.disconnect()
-                except:
-                    pass
-
-                # Parar thread se estiver rodando
-                if self.video_thread.isRunning():
-                    self.video_thread.stop()
-
-                # Garantir que thread foi parada
-                self.video_thread.deleteLater()
-                self.video_thread = None
-                print("Thread de vídeo parada com sucesso")
-        except Exception as e:
-            print(f"Erro ao parar thread de vídeo: {e}")
-            import traceback
-            traceback.print_exc()
+        """Para a detecção sem esperar pelos workers"""
+        # O cancelamento é cooperativo: cada job sai no próximo frame/imagem e
+        # libera decodificador e GPU sozinho. Sinais que ainda chegarem de um job
+        # cancelado são ignorados pelos handlers (ver _is_current).
+        self.frame_timer.stop()
+        if self.video_thread:
+            self.last_analytics = self.video_thread.analytics
+        for job in (self.thread, self.session_thread, self.comparison_thread, self.video_thread):
+            self.scheduler.cancel(job)
+        self.thread = None
+        self.session_thread = None
+        self.comparison_thread = None
+        self.video_thread = None
 
         self.is_detecting = False
-        self.btn_detect.setText("▶  Iniciar Detecção")
-        self.btn_detect.setStyleSheet(styles.get_action_button_style(False, self.current_scale))
+        self._set_detect_button(False)
 
     def _detect_image(self):
         """Detecta objetos em imagem"""
-        self.thread = YOLOThread(self.model_path, self.source_path)
+        self.thread = YOLOThread(
+            self.model_path, self.source_path, writer=self.result_writer, variant=self.model_variant
+        )
         self.thread.progress.connect(self.progress.setValue)
         self.thread.finished.connect(self._show_result)
-        self.thread.start()
+        self.scheduler.submit(self.thread, PRIORITY_INTERACTIVE)
+
+    def _detect_session(self):
+        """Processa todas as imagens da sessão com um único modelo"""
+        if not self.session_paths:
+            QMessageBox.warning(self, "Aviso", "Selecione as imagens da sessão primeiro.")
+            self._stop_detection()
+            return
+
+        self._reset_session_results()
+        self.session_thread = ImageSessionThread(
+            self.model_path, self.session_paths, writer=self.result_writer, variant=self.model_variant
+        )
+        self.session_thread.progress.connect(self.progress.setValue)
+        self.session_thread.result_ready.connect(self._add_session_result)
+        self.session_thread.done.connect(self._session_finished)
+        self.scheduler.submit(self.session_thread, PRIORITY_NORMAL)
+
+    def _detect_comparison(self):
+        """Roda os modelos marcados sobre o mesmo fluxo de frames"""
+        model_paths = self._checked_models()
+        print(f"Comparando {len(model_paths)} modelos em: {self.source_path}")
+        self.comparison_thread = ComparisonThread(model_paths, self.source_path, max_size=1280)
+        self.comparison_thread.done.connect(self._comparison_finished)
+        self.scheduler.submit(self.comparison_thread, PRIORITY_BACKGROUND)
+        self.frame_timer.start()
+
+    def _update_comparison(self, img, stats):
+        """Exibe o quadro lado a lado e as métricas de cada modelo (retirados da caixa do job)"""
+        self._show_video_frame(img, [])
+
+        self.list.clear()
+        for entry in stats:
+            self.list.addItem(
+                f"⚖  {entry['model']}: {entry['latency_ms']:.1f} ms "
+                f"(média {entry['avg_latency_ms']:.1f} ms)"
+            )
+            counts = ", ".join(f"{nome} {n}" for nome, n in sorted(entry['counts'].items())) or "nenhum objeto"
+            totals = ", ".join(f"{nome} {n}" for nome, n in sorted(entry['total_counts'].items())) or "nenhum objeto"
+            self.list.addItem(f"     frame: {counts}  ·  acumulado: {totals}")
+
+    def _comparison_finished(self, status):
+        """Callback ao final da comparação (fim do vídeo, cancelada ou com falha)"""
+        if not self._is_current(self.comparison_thread):
+            return
+        # O último quadro (acumulado final) pode ainda estar na caixa
+        frame = self.comparison_thread.mailbox.take()
+        if frame is not None:
+            self._update_comparison(*frame)
+        self.comparison_thread = None
+
+        self.is_detecting = False
+        self._set_detect_button(False)
 
     def _detect_video(self):
         """Detecta objetos em vídeo"""
-        # Parar thread anterior se existir
-        if self.video_thread:
-            print("Limpando thread anterior...")
-            try:
-                self.video_thread.frame_updated.disconnect()
-            except:
-                pass
-            if self.video_thread.isRunning():
-                self.video_thread.stop()
-            self.video_thread.deleteLater()
-            self.video_thread = None
+        try:
+            clip_rules = parse_rules(self.clip_rules_edit.text())
+        except ValueError as e:
+            QMessageBox.warning(self, "Aviso", str(e))
+            self._stop_detection()
+            return
 
-        # Criar e iniciar nova thread
-        print(f"Iniciando detecção de vídeo: {self.source_path}")
-        self.video_thread = VideoThread(self.model_path, self.source_path, max_size=1280)
-        self.video_thread.frame_updated.connect(self._update_frame)
-        self.video_thread.start()
+        # Job anterior (se houver) só é cancelado; o novo não espera por ele
+        self.scheduler.cancel(self.video_thread)
 
-    def _show_result(self, output_path, detections):
+        print(f"Iniciando detecção de vídeo: {self.source_path}")
+        self.video_thread = VideoThread(
+            self.model_path, self.source_path, max_size=1280, rois=self.rois, variant=self.model_variant,
+            clip_rules=clip_rules
+        )
+        self.video_thread.stats_updated.connect(self._update_stats)
+        self.video_thread.video_opened.connect(self._on_video_opened)
+        self.video_thread.analytics_updated.connect(self.analytics_chart.set_snapshot)
+        self.video_thread.playback_ended.connect(self._on_playback_ended)
+        self.analytics_chart.clear()
+        self.scheduler.submit(self.video_thread, PRIORITY_BACKGROUND)
+        self.frame_timer.start()
+
+    def _is_current(self, job):
+        """True se o sinal recebido veio do job atual (e não de um já cancelado)"""
+        return job is not None and self.sender() is job
+
+    def _on_job_status(self, job_id, name, status):
+        """Registra as mudanças de estado dos jobs"""
+        print(f"Job {name} #{job_id}: {STATUS_LABELS[status]}")
+        if status == 'failed':
+            self.status_label.setText(f"Falha no processamento ({name}); detalhes no console")
+            if self.is_detecting and self.detection_mode != "image":
+                self._stop_detection()
+
+    def _show_result(self, output_path, detections, image):
         """Mostra resultado da detecção em imagem"""
+        if not self._is_current(self.thread):
+            return
+        self.thread = None
         self.is_detecting = False
-        self.btn_detect.setText("▶  Iniciar Detecção")
-        self.btn_detect.setStyleSheet(styles.get_action_button_style(False, self.current_scale))
+        self._set_detect_button(False)
 
-        if not output_path:
+        if image.isNull():
             QMessageBox.critical(self, "Erro", "Erro na inferência.")
             return
 
-        self._display_image(output_path)
+        # Resultado vem em memória; a gravação em disco segue em segundo plano
+        self._display_image(QPixmap.fromImage(image))
+        self._show_detection_list(detections)
+
+        QMessageBox.information(self, "Concluído", "Detecção finalizada!")
+
+    def _show_detection_list(self, detections):
+        """Preenche a lista de objetos detectados"""
         self.list.clear()
         if not detections:
             self.list.addItem("Nenhum objeto detectado.")
@@ -467,7 +886,58 @@ class YOLOApp(QWidget):
             for nome, conf in detections:
                 self.list.addItem(f"✓  {nome} - Confiança: {conf:.2%}")
 
-        QMessageBox.information(self, "Concluído", "Detecção finalizada!")
+    def _add_session_result(self, index, image, thumb, detections, output_path):
+        """Guarda um resultado da sessão e adiciona sua miniatura"""
+        self.session_results[index] = (output_path, detections)
+        self._cache_session_pixmap(index, ScaledPixmapCache(QPixmap.fromImage(image)))
+
+        item = QListWidgetItem(QIcon(QPixmap.fromImage(thumb)), os.path.basename(self.session_paths[index]))
+        item.setData(Qt.UserRole, index)
+        self.thumb_strip.addItem(item)
+
+        if self.session_follow:
+            self.thumb_strip.setCurrentItem(item)
+            self._show_session_result(index)
+
+    def _cache_session_pixmap(self, index, cache):
+        """Mantém os resultados exibidos mais recentemente decodificados em memória"""
+        self.session_pixmaps[index] = cache
+        self.session_pixmaps.move_to_end(index)
+        while len(self.session_pixmaps) > self.session_cache_size:
+            self.session_pixmaps.popitem(last=False)
+
+    def _on_thumbnail_clicked(self, item):
+        """Navega para o resultado da miniatura clicada"""
+        self.session_follow = False
+        self._show_session_result(item.data(Qt.UserRole))
+
+    def _show_session_result(self, index):
+        """Exibe um resultado da sessão sem refazer a inferência"""
+        output_path, detections = self.session_results[index]
+        cache = self.session_pixmaps.get(index)
+        if cache is None:
+            # Fora do cache em memória: relê o resultado já salvo, sem inferência
+            cache = ScaledPixmapCache(output_path)
+        self._cache_session_pixmap(index, cache)
+
+        from PyQt5.QtWidgets import QWidget
+        if self.image_label.layout():
+            QWidget().setLayout(self.image_label.layout())
+
+        self.current_image = cache
+        self._update_displayed_image()
+        self._show_detection_list(detections)
+
+    def _session_finished(self, status):
+        """Callback ao final da sessão de imagens (concluída, cancelada ou com falha)"""
+        processed = len(self.session_results)
+        print(f"Sessão finalizada: {processed}/{len(self.session_paths)} imagens")
+        if not self._is_current(self.session_thread):
+            return
+        self.session_thread = None
+
+        self.is_detecting = False
+        self._set_detect_button(False)
 
     def _save_result(self):
         """Salva o resultado"""
@@ -480,18 +950,131 @@ class YOLOApp(QWidget):
             self.image_label.pixmap().save(file)
             QMessageBox.information(self, "Salvo", f"Imagem salva em:\n{file}")
 
-    def _update_frame(self, img, detections, fps):
-        """Atualiza frame do vídeo"""
+    def _update_stats(self, stats):
+        """Exibe FPS, uso de memória e decisões do governador de memória"""
+        parts = []
+        if 'fps' in stats:
+            parts.append(f"FPS: {stats['fps']:.1f}")
+        if stats.get('decode_fps'):
+            parts.append(f"Decodificação: {stats['decode_fps']:.0f} FPS")
+        parts.append(f"RAM: {stats['rss_mb']:.0f} MB")
+        if stats.get('device_mb'):
+            parts.append(f"GPU: {stats['device_mb']:.0f} MB")
+        if stats['level']:
+            parts.append(f"Economia nível {stats['level']} ({stats['max_size']}px, imgsz {stats['imgsz']})")
+        if stats.get('overwritten_frames'):
+            parts.append(f"Frames não exibidos: {stats['overwritten_frames']}")
+        if 'clips' in stats:
+            parts.append(f"{'● Gravando  ' if stats['recording'] else ''}Clipes: {stats['clips']}")
+        if stats.get('dropped_frames'):
+            parts.append(f"Pré-roll descartado: {stats['dropped_frames']} frames")
+        self.status_label.setText("  ·  ".join(parts))
+
+        if 'reason' in stats:
+            print(f"Governador de memória: {stats['reason']}")
+
+    def _on_video_opened(self, frame_count, fps):
+        """Configura a linha do tempo para o vídeo aberto"""
+        self.video_fps = fps or 30.0
+        self.video_frame_count = frame_count
+        self.timeline_slider.setRange(0, max(0, frame_count - 1))
+        self.timeline_slider.setValue(0)
+        self.timeline_slider.setEnabled(frame_count > 0)
+        self._update_timeline_label(0)
+
+    def _on_video_position(self, frame_index):
+        """Acompanha o frame exibido, exceto enquanto o usuário arrasta"""
+        if not self.timeline_slider.isSliderDown():
+            self.timeline_slider.setValue(frame_index)
+            self._update_timeline_label(frame_index)
+
+    def _on_timeline_moved(self, frame_index):
+        """Prévia durante o arraste: frame em cache ou, sem ele, o keyframe mais próximo"""
+        self._update_timeline_label(frame_index)
+        if self.video_thread:
+            cached = self.video_thread.frame_cache.peek(frame_index)
+            if cached is not None:
+                self._show_video_frame(*cached)
+            else:
+                # Seek aproximado (keyframe anterior); o exato vem ao soltar
+                self._seek_video(frame_index, exact=False)
+
+    def _on_timeline_released(self):
+        """Continua o processamento a partir da posição escolhida"""
+        self._seek_video(self.timeline_slider.value())
+
+    def _on_timeline_action(self, action):
+        """Clique na trilha, teclado ou roda do mouse: seek exato para a nova posição"""
+        if action == QSlider.SliderMove and self.timeline_slider.isSliderDown():
+            return  # arraste: tratado por sliderMoved/sliderReleased
+        # O sinal chega antes de o valor mudar; sliderPosition já tem o destino
+        frame_index = self.timeline_slider.sliderPosition()
+        self._update_timeline_label(frame_index)
+        self._seek_video(frame_index)
+
+    def _seek_video(self, frame_index, exact=True):
+        """Pede o seek ao job de vídeo; depois do fim do vídeo, volta ao estado de detecção"""
+        if not self.video_thread:
+            return
+        self.video_thread.seek(frame_index, exact)
+        if not self.is_detecting:
+            self.is_detecting = True
+            self._set_detect_button(True)
+
+    def _on_playback_ended(self):
+        """Fim do vídeo: encerra o estado de detecção, mantendo a linha do tempo navegável"""
+        if not self._is_current(self.video_thread) or not self.is_detecting:
+            return
+        self.last_analytics = self.video_thread.analytics
+        self.is_detecting = False
+        self._set_detect_button(False)
+
+    def _update_timeline_label(self, frame_index):
+        """Atualiza o texto tempo atual / duração"""
+        def fmt(seconds):
+            minutes, seconds = divmod(int(seconds), 60)
+            return f"{minutes:02d}:{seconds:02d}"
+
+        self.timeline_label.setText(
+            f"{fmt(frame_index / self.video_fps)} / {fmt(self.video_frame_count / self.video_fps)}"
+        )
+
+    def _export_analytics(self):
+        """Exporta o resumo e a série temporal das detecções do vídeo"""
+        analytics = self.video_thread.analytics if self.video_thread else self.last_analytics
+        if analytics is None or not analytics.frames:
+            QMessageBox.warning(self, "Aviso", "Nenhuma análise de vídeo para exportar.")
+            return
+
+        basename = os.path.splitext(os.path.basename(str(self.source_path)))[0] or "video"
+        json_path, csv_path = analytics.export(os.path.join("resultados", "analises"), basename)
+        QMessageBox.information(self, "Exportado", f"Análise salva em:\n{json_path}\n{csv_path}")
+
+    def _pull_video_frame(self):
+        """Exibe o frame mais recente do job de vídeo (ou de comparação) atual, se houver um novo"""
+        if self.comparison_thread is not None:
+            frame = self.comparison_thread.mailbox.take()
+            if frame is not None:
+                self._update_comparison(*frame)
+            return
+        if self.video_thread is None:
+            self.frame_timer.stop()
+            return
+        frame = self.video_thread.mailbox.take()
+        if frame is None:
+            return
+        img, detections, _, frame_index = frame
+        self._show_video_frame(img, detections)
+        self._on_video_position(frame_index)
+
+    def _show_video_frame(self, img, detections):
+        """Exibe um frame anotado do vídeo e suas detecções"""
         from PyQt5.QtWidgets import QWidget
         if self.image_label.layout():
             QWidget().setLayout(self.image_label.layout())
 
-        available_width = self.image_label.width() - 40
-        available_height = self.image_label.height() - 40
-
-        if available_width <= 0 or available_height <= 0:
-            available_width = 800
-            available_height = 600
+        self.current_image = None
+        available_width, available_height = available_image_size(self.image_label)
 
         pix = QPixmap.fromImage(img).scaled(
             available_width,
@@ -499,6 +1082,8 @@ class YOLOApp(QWidget):
             Qt.KeepAspectRatio,
             Qt.SmoothTransformation
         )
+        if self.rois and self.detection_mode == "video":
+            pix = self._paint_rois(pix)
         self.image_label.setPixmap(pix)
         self.list.clear()
 
@@ -508,19 +1093,90 @@ class YOLOApp(QWidget):
             for nome, conf in detections:
                 self.list.addItem(f"✓  {nome} ({conf:.2%})")
 
+    def _set_roi_drawing(self, enabled):
+        """Liga/desliga o modo de desenho de ROIs sobre a prévia"""
+        self.roi_drawing = enabled
+        self.image_label.setCursor(Qt.CrossCursor if enabled else Qt.ArrowCursor)
+
+    def _clear_rois(self):
+        """Remove as ROIs da fonte atual"""
+        self._set_rois([])
+
+    def _set_rois(self, rois):
+        """Aplica, salva e redesenha as ROIs da fonte atual"""
+        self.rois = list(rois)
+        if self.source_path and self.detection_mode == "video":
+            self.roi_store.save(self.source_path, self.rois)
+        if self.video_thread:
+            self.video_thread.set_rois(self.rois)
+        self._update_displayed_image()
+
+    def _pixmap_rect(self):
+        """Retângulo ocupado pelo pixmap centralizado dentro do image_label"""
+        pix = self.image_label.pixmap()
+        if pix is None or pix.isNull():
+            return None
+        x = (self.image_label.width() - pix.width()) // 2
+        y = (self.image_label.height() - pix.height()) // 2
+        return QRect(x, y, pix.width(), pix.height())
+
+    def _paint_rois(self, pix):
+        """Desenha as ROIs sobre uma cópia do pixmap exibido"""
+        pix = QPixmap(pix)
+        painter = QPainter(pix)
+        painter.setPen(QPen(QColor("#f59e0b"), 2, Qt.DashLine))
+        for x1, y1, x2, y2 in self.rois:
+            painter.drawRect(QRect(
+                int(x1 * pix.width()), int(y1 * pix.height()),
+                int((x2 - x1) * pix.width()), int((y2 - y1) * pix.height())
+            ))
+        painter.end()
+        return pix
+
+    def eventFilter(self, obj, event):
+        """Desenho de ROIs com o mouse sobre o image_label"""
+        if obj is not self.image_label or not self.roi_drawing:
+            return super().eventFilter(obj, event)
+
+        if event.type() == QEvent.MouseButtonPress and event.button() == Qt.LeftButton:
+            self.roi_origin = event.pos()
+            self.roi_band.setGeometry(QRect(self.roi_origin, QSize()))
+            self.roi_band.show()
+            return True
+
+        if event.type() == QEvent.MouseMove and self.roi_origin is not None:
+            self.roi_band.setGeometry(QRect(self.roi_origin, event.pos()).normalized())
+            return True
+
+        if event.type() == QEvent.MouseButtonRelease and self.roi_origin is not None:
+            self.roi_band.hide()
+            rect = QRect(self.roi_origin, event.pos()).normalized()
+            self.roi_origin = None
+
+            area = self._pixmap_rect()
+            if area is not None and rect.width() > 4 and rect.height() > 4:
+                def norm(point):
+                    return (
+                        min(max((point.x() - area.x()) / area.width(), 0.0), 1.0),
+                        min(max((point.y() - area.y()) / area.height(), 0.0), 1.0),
+                    )
+                x1, y1 = norm(rect.topLeft())
+                x2, y2 = norm(rect.bottomRight())
+                if x2 > x1 and y2 > y1:
+                    self._set_rois(self.rois + [(x1, y1, x2, y2)])
+            return True
+
+        return super().eventFilter(obj, event)
+
     def closeEvent(self, event):
         """Evento de fechamento da janela - limpar threads"""
         try:
-            # Parar thread de vídeo se estiver rodando
-            if self.video_thread and self.video_thread.isRunning():
-                print("Parando thread de vídeo...")
-                self.video_thread.stop()
-
-            # Parar thread de imagem se estiver rodando
-            if self.thread and self.thread.isRunning():
-                print("Parando thread de imagem...")
-                self.thread.quit()
-                self.thread.wait(2000)
+            # Cancelar todos os jobs e esperar que saiam pelo caminho normal
+            if not self.scheduler.shutdown(5000):
+                print("Aviso: jobs ainda em execução ao fechar")
+
+            # Concluir gravações pendentes
+            self.result_writer.close()
         except Exception as e:
             print(f"Erro ao limpar threads: {e}")
 
@@ -532,5 +1188,20 @@ class YOLOApp(QWidget):
         if not self.ui_initialized:
             return
 
-        if self.current_image_path and self.image_label.pixmap():
-            self._update_displayed_image()
+        if self.current_image and self.image_label.pixmap():
+            # Prévia rápida enquanto arrasta; versão suave ao final
+            self._update_displayed_image(smooth=False)
+            self.resize_timer.start()
+
+    def showEvent(self, event):
+        """Acompanha a tela da janela para ajustar a escala quando o DPI muda"""
+        super().showEvent(event)
+        handle = self.windowHandle()
+        if handle is not None and not self.screen_tracked:
+            self.screen_tracked = True
+            handle.screenChanged.connect(self._on_screen_changed)
+            self._on_screen_changed(handle.screen())
+
+    def _on_screen_changed(self, screen):
+        """Janela movida para outra tela (ou DPI alterado)"""
+        self._apply_scale(styles.screen_scale(screen))
@@ -1,6 +1,17 @@
 """
 Estilos CSS para a interface do aplicativo
+
+As funções get_*_style são memoizadas por (argumentos, escala): a mesma
+string volta do cache e o custo fica só no setStyleSheet. Estados que mudam
+em tempo de execução (ex.: botão detectando) vêm de propriedades dinâmicas
+com seletores [prop="true"] na mesma folha, sem trocar o stylesheet.
 """
+from functools import lru_cache
+
+# DPI lógico que corresponde à escala 1.0 (100% no Windows e na maioria dos Linux)
+BASE_DPI = 96.0
+# Escalas arredondadas para este passo: poucas entradas no cache e sem repolish por 1 DPI
+SCALE_STEP = 0.125
 
 GLOBAL_STYLE = """
     QWidget {
@@ -44,6 +55,7 @@ PROGRESS_BAR_STYLE = """
 """
 
 
+@lru_cache(maxsize=None)
 def get_combo_box_style(scale=1.0):
     """Retorna o estilo do ComboBox com escala"""
     button_size = int(13 * scale)
@@ -85,6 +97,7 @@ def get_combo_box_style(scale=1.0):
     """
 
 
+@lru_cache(maxsize=None)
 def get_radio_button_style(scale=1.0):
     """Retorna o estilo dos radio buttons com escala"""
     button_size = int(13 * scale)
@@ -120,6 +133,7 @@ def get_radio_button_style(scale=1.0):
     """
 
 
+@lru_cache(maxsize=None)
 def get_primary_button_style(color="#3b82f6", scale=1.0):
     """Retorna o estilo de botão primário com escala"""
     button_size = int(13 * scale)
@@ -146,6 +160,7 @@ def get_primary_button_style(color="#3b82f6", scale=1.0):
     """
 
 
+@lru_cache(maxsize=None)
 def get_secondary_button_style(scale=1.0):
     """Retorna o estilo de botão secundário com escala"""
     button_size = int(13 * scale)
@@ -173,8 +188,14 @@ def get_secondary_button_style(scale=1.0):
     """
 
 
+@lru_cache(maxsize=None)
 def get_action_button_style(is_detecting=False, scale=1.0):
-    """Retorna o estilo do botão de ação com escala"""
+    """
+    Retorna o estilo do botão de ação com escala
+
+    Uma folha por estado; com o cache, iniciar/parar só troca entre duas
+    strings prontas (tools/bench_styles mede essa troca).
+    """
     action_button_size = int(14 * scale)
     action_padding_v = int(14 * scale)
     action_padding_h = int(16 * scale)
@@ -208,6 +229,7 @@ def get_action_button_style(is_detecting=False, scale=1.0):
     """
 
 
+@lru_cache(maxsize=None)
 def get_list_widget_style(scale=1.0):
     """Retorna o estilo da lista de detecções com escala"""
     button_size = int(13 * scale)
@@ -236,6 +258,7 @@ def get_list_widget_style(scale=1.0):
     """
 
 
+@lru_cache(maxsize=None)
 def get_label_style(font_size, color="#374151", weight=600, scale=1.0):
     """Retorna o estilo de um label"""
     scaled_size = int(font_size * scale)
@@ -246,3 +269,23 @@ def get_label_style(font_size, color="#374151", weight=600, scale=1.0):
         margin-top: 5px;
         margin-bottom: 8px;
     """
+
+
+def screen_scale(screen):
+    """
+    Escala da interface a partir do DPI lógico da tela
+
+    Arredondada para SCALE_STEP e limitada a [1.0, 3.0]; sem tela (ex.:
+    plataforma offscreen sem monitor) retorna 1.0.
+    """
+    if screen is None:
+        return 1.0
+    scale = screen.logicalDotsPerInch() / BASE_DPI
+    scale = round(scale / SCALE_STEP) * SCALE_STEP
+    return min(max(scale, 1.0), 3.0)
+
+
+def apply_style(widget, style):
+    """Aplica o stylesheet só se mudou (o Qt re-polia o widget e os filhos mesmo com texto igual)"""
+    if widget.styleSheet() != style:
+        widget.setStyleSheet(style)
@@ -2,6 +2,10 @@
 Módulo de utilitários
 """
 
-from .image_utils import display_image_scaled, create_placeholder
+from .image_utils import (
+    display_image_scaled, display_cached_pixmap, available_image_size,
+    ScaledPixmapCache, create_placeholder
+)
 
-__all__ = ['display_image_scaled', 'create_placeholder']
+__all__ = ['display_image_scaled', 'display_cached_pixmap', 'available_image_size',
+           'ScaledPixmapCache', 'create_placeholder']
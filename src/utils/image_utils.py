@@ -1,11 +1,65 @@
 """
 Utilitários para manipulação de imagens
 """
+from collections import OrderedDict
+
 from PyQt5.QtWidgets import QFrame, QVBoxLayout, QLabel, QWidget
 from PyQt5.QtGui import QPixmap
 from PyQt5.QtCore import Qt
 
 
+class ScaledPixmapCache:
+    """
+    Pixmap de origem decodificado uma vez e cache LRU de versões redimensionadas
+
+    Imagens maiores que max_source_size são reduzidas uma única vez na criação,
+    então os redimensionamentos seguintes (ex.: arrastar a janela) partem de
+    uma base do tamanho da tela e não da imagem original.
+    """
+
+    def __init__(self, source, max_entries=4, max_source_size=2560):
+        pixmap = source if isinstance(source, QPixmap) else QPixmap(source)
+        if max(pixmap.width(), pixmap.height()) > max_source_size:
+            pixmap = pixmap.scaled(max_source_size, max_source_size,
+                                   Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self.source = pixmap
+        self.max_entries = max_entries
+        self._scaled = OrderedDict()
+
+    def scaled(self, width, height, smooth=True):
+        """
+        Retorna o pixmap ajustado a (width, height) mantendo a proporção
+
+        Apenas as versões suaves entram no cache; as rápidas servem de prévia
+        enquanto a janela ainda está sendo redimensionada.
+        """
+        if not smooth:
+            return self.source.scaled(width, height, Qt.KeepAspectRatio, Qt.FastTransformation)
+
+        key = (width, height)
+        pix = self._scaled.get(key)
+        if pix is None:
+            pix = self.source.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            self._scaled[key] = pix
+            if len(self._scaled) > self.max_entries:
+                self._scaled.popitem(last=False)
+        else:
+            self._scaled.move_to_end(key)
+        return pix
+
+
+def available_image_size(image_label):
+    """Calcula o espaço disponível para a imagem dentro do QLabel"""
+    available_width = image_label.width() - 40
+    available_height = image_label.height() - 40
+
+    if available_width <= 0 or available_height <= 0:
+        available_width = 800
+        available_height = 600
+
+    return available_width, available_height
+
+
 def display_image_scaled(image_label, image_path):
     """
     Exibe uma imagem no QLabel com redimensionamento dinâmico
@@ -18,13 +72,7 @@ def display_image_scaled(image_label, image_path):
     if image_label.layout():
         QWidget().setLayout(image_label.layout())
 
-    # Calcula o tamanho disponível
-    available_width = image_label.width() - 40
-    available_height = image_label.height() - 40
-
-    if available_width <= 0 or available_height <= 0:
-        available_width = 800
-        available_height = 600
+    available_width, available_height = available_image_size(image_label)
 
     pix = QPixmap(image_path).scaled(
         available_width,
@@ -35,6 +83,22 @@ def display_image_scaled(image_label, image_path):
     image_label.setPixmap(pix)
 
 
+def display_cached_pixmap(image_label, cache, smooth=True):
+    """
+    Exibe no QLabel uma imagem mantida em memória, sem acesso a disco
+
+    Args:
+        image_label: QLabel onde a imagem será exibida
+        cache: ScaledPixmapCache com a imagem de origem
+        smooth: False usa escala rápida (prévia durante redimensionamento)
+    """
+    if image_label.layout():
+        QWidget().setLayout(image_label.layout())
+
+    available_width, available_height = available_image_size(image_label)
+    image_label.setPixmap(cache.scaled(available_width, available_height, smooth))
+
+
 def create_placeholder(icon="🖼", main_text="Nenhuma imagem carregada",
                       sub_text="Selecione uma imagem ou vídeo para começar"):
     """
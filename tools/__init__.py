@@ -0,0 +1,3 @@
+"""
+Ferramentas de verificação e benchmark (executar com python -m tools.<nome>)
+"""
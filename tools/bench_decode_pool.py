@@ -0,0 +1,106 @@
+"""
+Benchmark do SharedDecodePool: frames/s com 1..N processos de decodificação
+
+Uso:
+    python -m tools.bench_decode_pool                       # vídeo sintético 1080p
+    python -m tools.bench_decode_pool video1.mp4 video2.mp4 --workers 8 --max-size 640
+
+Compara com a decodificação no próprio processo (como o VideoThread faz) e
+mostra o ganho por número de workers. Nos dois caminhos o consumidor lê uma
+amostra de cada frame (consume), para que a leitura da memória compartilhada
+entre na medição. O tempo de subida dos processos é informado à parte e não
+entra no FPS.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+import cv2
+
+from src.core import open_decoder
+from src.core.shm_decode import SharedDecodePool
+from tools.regression import generate_video
+
+
+SYNTHETIC_PATH = os.path.join('data_test', 'golden', 'bench_1080p.avi')
+
+
+def consume(bgr):
+    """Trabalho do consumidor nos dois caminhos: soma de uma amostra 1/8 x 1/8 do frame"""
+    return int(bgr[::8, ::8].sum())
+
+
+def bench_in_process(sources, max_size):
+    """Referência: um decodificador por vez, resize no mesmo processo"""
+    frames = 0
+    start = time.perf_counter()
+    for source in sources:
+        decoder = open_decoder(source, backend='opencv')
+        while True:
+            ok, frame = decoder.read()
+            if not ok:
+                break
+            h, w = frame.shape[:2]
+            if max(h, w) > max_size:
+                scale = max_size / max(h, w)
+                frame = cv2.resize(frame, (int(w * scale), int(h * scale)))
+            consume(frame)
+            frames += 1
+        decoder.release()
+    return frames, frames / (time.perf_counter() - start)
+
+
+def bench_pool(sources, workers, max_size):
+    """Retorna (frames, FPS em regime, segundos até o primeiro frame)"""
+    created = time.perf_counter()
+    frames = 0
+    first = None
+    with SharedDecodePool(sources, workers=workers, max_size=max_size) as pool:
+        for frame in pool:
+            if first is None:
+                first = time.perf_counter()
+            with frame as bgr:
+                consume(bgr)  # lê direto da view na memória compartilhada; nenhuma cópia
+            frames += 1
+        end = time.perf_counter()
+    if first is None:
+        return 0, 0.0, 0.0
+    return frames, (frames - 1) / max(end - first, 1e-9), first - created
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('sources', nargs='*', help='Vídeos (padrão: vídeo sintético 1080p)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='N máximo de workers')
+    parser.add_argument('--max-size', type=int, default=1280)
+    parser.add_argument('--frames', type=int, default=600, help='Frames do vídeo sintético')
+    args = parser.parse_args()
+
+    sources = args.sources
+    if not sources:
+        if not os.path.exists(SYNTHETIC_PATH):
+            images = sorted(glob.glob(os.path.join('data_test', 'images', '*.jpg')))
+            if not images:
+                print("Informe um vídeo: data_test/images está vazio")
+                return 2
+            print(f"Gerando vídeo sintético: {SYNTHETIC_PATH}")
+            generate_video(SYNTHETIC_PATH, images, frames=args.frames, size=(1920, 1080))
+        sources = [SYNTHETIC_PATH]
+
+    print(f"CPUs: {os.cpu_count()}  ·  fontes: {len(sources)}  ·  max_size: {args.max_size}")
+    frames, fps = bench_in_process(sources, args.max_size)
+    print(f"{'no processo':>12}: {fps:7.1f} frames/s ({frames} frames)")
+
+    baseline = None
+    for workers in range(1, args.workers + 1):
+        frames, fps, startup = bench_pool(sources, workers, args.max_size)
+        baseline = baseline or fps
+        print(f"{workers:>4} worker{'s' if workers > 1 else ' '}: {fps:7.1f} frames/s "
+              f"({frames} frames, x{fps / baseline:.2f}, subida {startup:.1f} s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
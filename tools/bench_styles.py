@@ -0,0 +1,133 @@
+"""
+Mede o custo dos estilos da interface: abertura da janela, iniciar/parar e troca de escala
+
+Uso:
+    python -m tools.bench_styles                 # plataforma offscreen, 500 alternâncias
+    python -m tools.bench_styles -n 2000 --scale 1.5
+
+Compara a alternância do botão de ação pelo caminho antigo (folha do estado
+gerada a cada clique) com a troca entre as duas folhas do cache, a
+re-aplicação dos estilos na mesma escala (setStyleSheet com o mesmo texto x
+apply_style) e a geração das folhas com e sem o cache. Nos dois caminhos do
+botão o Qt analisa a folha nova e re-pole o widget; a diferença é só a geração.
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+from src.ui import YOLOApp, styles  # noqa: E402
+
+STYLE_FUNCS = [
+    (styles.get_combo_box_style, ()),
+    (styles.get_radio_button_style, ()),
+    (styles.get_primary_button_style, ()),
+    (styles.get_secondary_button_style, ()),
+    (styles.get_action_button_style, ()),
+    (styles.get_list_widget_style, ()),
+    (styles.get_label_style, (12,)),
+]
+
+
+def timed(fn, repeat):
+    """Tempo médio por chamada em microssegundos"""
+    start = time.perf_counter()
+    for i in range(repeat):
+        fn(i)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def bench_generation(repeat, scale):
+    uncached = timed(lambda i: [f.__wrapped__(*a, scale=scale) for f, a in STYLE_FUNCS], repeat)
+    cached = timed(lambda i: [f(*a, scale=scale) for f, a in STYLE_FUNCS], repeat)
+    print(f"Geração das folhas ({len(STYLE_FUNCS)} funções): {uncached:.1f} µs sem cache · {cached:.1f} µs com cache")
+
+
+def bench_startup(app):
+    start = time.perf_counter()
+    window = YOLOApp()
+    built = time.perf_counter()
+    window.show()
+    app.processEvents()
+    shown = time.perf_counter()
+    print(f"Abertura: construção {(built - start) * 1000:.1f} ms · show+polish {(shown - built) * 1000:.1f} ms")
+    return window
+
+
+def bench_toggle(app, window, repeat):
+    button = window.btn_detect
+    scale = window.current_scale
+    build = styles.get_action_button_style.__wrapped__
+
+    def legacy(i):
+        # Caminho antigo: cada clique gerava a folha do novo estado e a aplicava
+        detecting = i % 2 == 0
+        button.setText("⏸  Parar Detecção" if detecting else "▶  Iniciar Detecção")
+        button.setStyleSheet(build(detecting, scale=scale))
+        app.processEvents()
+
+    def cached(i):
+        window._set_detect_button(i % 2 == 0)
+        app.processEvents()
+
+    legacy_us = timed(legacy, repeat)
+    cached_us = timed(cached, repeat)
+    window._set_detect_button(False)
+    print(f"Iniciar/parar: {legacy_us:.1f} µs gerando e aplicando a folha (texto e estilo) · "
+          f"{cached_us:.1f} µs com as folhas do cache (texto e estilo)")
+
+
+def bench_scale(app, window, scale):
+    base = window.current_scale
+    start = time.perf_counter()
+    window._apply_scale(scale)
+    app.processEvents()
+    changed = time.perf_counter()
+
+    # Mesma escala: _apply_scale sairia cedo, então os widgets são percorridos aqui
+    registered = [
+        (widget, style_func(*args, scale=scale)) for widget, (style_func, args) in window.scaled_styles.items()
+    ]
+
+    def legacy():
+        # Caminho antigo: setStyleSheet mesmo com o texto igual
+        for widget, style in registered:
+            widget.setStyleSheet(style)
+        app.processEvents()
+
+    def skipping():
+        for widget, style in registered:
+            styles.apply_style(widget, style)
+        app.processEvents()
+
+    legacy_ms = timed(lambda i: legacy(), 20) / 1000
+    skipping_ms = timed(lambda i: skipping(), 20) / 1000
+    window._apply_scale(base)
+    print(f"Escala {base:g} -> {scale:g}: {(changed - start) * 1000:.2f} ms · "
+          f"mesma escala de novo: {legacy_ms:.2f} ms com setStyleSheet, {skipping_ms:.3f} ms com apply_style "
+          f"({len(registered)} widgets registrados)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('-n', '--toggles', type=int, default=500)
+    parser.add_argument('--scale', type=float, default=1.5, help='Escala usada no teste de troca')
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    app.setStyle("Fusion")
+
+    bench_generation(1000, args.scale)
+    window = bench_startup(app)
+    bench_toggle(app, window, args.toggles)
+    bench_scale(app, window, args.scale)
+    window.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
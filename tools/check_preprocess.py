@@ -0,0 +1,91 @@
+"""
+Verifica se o pré-processamento no dispositivo e o LetterboxPlan geram as mesmas detecções do caminho em CPU
+
+Uso:
+    python -m tools.check_preprocess modelo.pt [pasta_de_imagens] [--max-size 1280]
+
+Sem CUDA o caminho de tensores roda em CPU, o que ainda valida o letterbox,
+a normalização e o mapeamento das caixas de volta para o frame de exibição.
+O LetterboxPlan (caminho de CPU do VideoThread) é conferido da mesma forma.
+Sem nenhuma detecção no caminho de referência a verificação falha, já que
+não haveria caixas para comparar.
+"""
+import argparse
+import glob
+import os
+import sys
+
+import cv2
+
+from src.core import Detector
+from src.core.metrics import match_detections
+
+
+def _cpu_reference(detector, frame, max_size):
+    """Reproduz o caminho de CPU do VideoThread (cv2.resize + letterbox do ultralytics)"""
+    h, w = frame.shape[:2]
+    if max(h, w) > max_size:
+        scale = max_size / max(h, w)
+        frame = cv2.resize(frame, (int(w * scale), int(h * scale)))
+    return detector.predict(frame)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('model')
+    parser.add_argument('images', nargs='?', default=os.path.join('data_test', 'images'))
+    parser.add_argument('--max-size', type=int, default=1280)
+    parser.add_argument('--conf', type=float, default=0.5)
+    parser.add_argument('--iou', type=float, default=0.9, help='IoU mínima entre caixas pareadas')
+    parser.add_argument('--conf-tol', type=float, default=0.05, help='Diferença máxima de confiança')
+    args = parser.parse_args()
+
+    cpu = Detector(args.model, conf=args.conf, preprocess='cpu')
+    device = Detector(args.model, conf=args.conf, preprocess='device')
+    print(f"Caminho de tensores em: {device.preprocessor.device}")
+
+    paths = sorted(glob.glob(os.path.join(args.images, '*.jpg')) + glob.glob(os.path.join(args.images, '*.png')))
+    if not paths:
+        print(f"Nenhuma imagem encontrada em {args.images}")
+        return 2
+
+    failures = 0
+    reference_boxes = 0
+    for path in paths:
+        frame = cv2.imread(path)
+        ref = _cpu_reference(cpu, frame, args.max_size)
+        reference_boxes += len(ref.boxes)
+        outputs = {
+            'dispositivo': device.predict(frame, max_size=args.max_size),
+            'plano': cpu.predict_planned(frame, cpu.letterbox_plan(frame, args.max_size)),
+        }
+
+        for name, out in outputs.items():
+            label = f"{os.path.basename(path)} [{name}]"
+            if ref.orig_shape != out.orig_shape:
+                print(f"FALHA {label}: frame de exibição {out.orig_shape} != {ref.orig_shape}")
+                failures += 1
+                continue
+
+            ref_boxes = ref.boxes.data.cpu().numpy()
+            out_boxes = out.boxes.data.cpu().numpy()
+            pairs, missing, extra = match_detections(ref_boxes, out_boxes, args.iou)
+            conf_diff = max((abs(ref_boxes[i, 4] - out_boxes[j, 4]) for i, j, _ in pairs), default=0.0)
+
+            ok = not missing and not extra and conf_diff <= args.conf_tol
+            failures += not ok
+            print(f"{'OK   ' if ok else 'FALHA'} {label}: {len(pairs)} pares, "
+                  f"{len(missing)} ausentes, {len(extra)} extras, Δconf máx {conf_diff:.3f}")
+
+    checks = len(paths) * 2
+    print(f"{checks - failures}/{checks} comparações equivalentes")
+    if not reference_boxes:
+        # Sem caixas todas as comparações "batem" sem verificar o mapeamento
+        print(f"FALHA: nenhuma detecção no caminho de referência com conf {args.conf}; "
+              f"use um modelo treinado ou uma confiança menor")
+        return 1
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+Gerador de carga para o servidor de inferência (server.py)
+
+Uso:
+    python -m tools.load_test --spawn yolov8n.pt                 # sobe o servidor, mede e encerra
+    python -m tools.load_test --url http://127.0.0.1:8765 -n 500 -c 16
+
+Envia as imagens de data_test/images com C requisições simultâneas e
+reporta vazão (req/s e frames/s), latências p50/p95/p99 vistas pelo
+cliente e o tamanho médio dos lotes montados pelo servidor.
+"""
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+def wait_health(url, timeout=120.0):
+    """Espera o /health responder (modelos carregados e aquecidos)"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"{url}/health", timeout=2) as response:
+                return json.load(response)
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.5)
+    raise TimeoutError(f"Servidor não respondeu em {timeout:.0f} s: {url}")
+
+
+def post(url, body, content_type):
+    request = urllib.request.Request(url, data=body, headers={'Content-Type': content_type})
+    start = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=120) as response:
+        payload = json.load(response)
+    return (time.perf_counter() - start) * 1000, payload
+
+
+def run_load(url, bodies, requests, concurrency, endpoint='/detect', content_type='image/jpeg'):
+    """
+    Dispara as requisições e coleta latências
+
+    Returns:
+        dict: total, erros, duração, latências (ms) e tamanhos de lote
+    """
+    latencies, batch_sizes, errors = [], [], []
+    frames = 0
+
+    def one(i):
+        return post(f"{url}{endpoint}", bodies[i % len(bodies)], content_type)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(one, i) for i in range(requests)]:
+            try:
+                latency, payload = future.result()
+            except Exception as e:
+                errors.append(str(e))
+                continue
+            latencies.append(latency)
+            if 'batch_size' in payload:
+                batch_sizes.append(payload['batch_size'])
+            frames += len(payload.get('frames', [None]))
+    duration = time.perf_counter() - start
+
+    return {
+        'requests': requests,
+        'errors': errors,
+        'duration': duration,
+        'frames': frames,
+        'latencies': np.array(latencies),
+        'batch_sizes': batch_sizes,
+    }
+
+
+def report(stats, concurrency):
+    ok = len(stats['latencies'])
+    print(f"Concorrência {concurrency}: {ok}/{stats['requests']} ok em {stats['duration']:.1f} s")
+    print(f"  vazão: {ok / stats['duration']:.1f} req/s, {stats['frames'] / stats['duration']:.1f} frames/s")
+    if ok:
+        p50, p95, p99 = np.percentile(stats['latencies'], [50, 95, 99])
+        print(f"  latência: p50 {p50:.1f} ms  ·  p95 {p95:.1f} ms  ·  p99 {p99:.1f} ms")
+    if stats['batch_sizes']:
+        print(f"  lote médio no servidor: {np.mean(stats['batch_sizes']):.2f}")
+    if stats['errors']:
+        print(f"  erros: {len(stats['errors'])} (ex.: {stats['errors'][0]})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--url', default='http://127.0.0.1:8765')
+    parser.add_argument('--spawn', metavar='MODELO', help='Sobe server.py com este modelo antes do teste')
+    parser.add_argument('-n', '--requests', type=int, default=200)
+    parser.add_argument('-c', '--concurrency', type=int, nargs='+', default=[1, 8],
+                        help='Um ou mais níveis de concorrência')
+    parser.add_argument('--images', default=os.path.join('data_test', 'images'))
+    parser.add_argument('--video', help='Envia este vídeo para /detect_video em vez de imagens')
+    parser.add_argument('--max-batch', type=int, default=8)
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn:
+        port = args.url.rsplit(':', 1)[-1]
+        server = subprocess.Popen([
+            sys.executable, 'server.py', args.spawn, '--port', port, '--max-batch', str(args.max_batch)
+        ])
+
+    try:
+        health = wait_health(args.url)
+        print(f"Servidor ok: modelos {', '.join(health['models'])}")
+
+        if args.video:
+            with open(args.video, 'rb') as f:
+                bodies = [f.read()]
+            ext = os.path.splitext(args.video)[1]
+            endpoint, content_type = f"/detect_video?stride=5&ext={ext}", 'application/octet-stream'
+        else:
+            paths = sorted(glob.glob(os.path.join(args.images, '*.jpg')) + glob.glob(os.path.join(args.images, '*.png')))
+            if not paths:
+                print(f"Nenhuma imagem em {args.images}")
+                return 2
+            bodies = []
+            for path in paths:
+                with open(path, 'rb') as f:
+                    bodies.append(f.read())
+            endpoint, content_type = '/detect', 'image/jpeg'
+
+        # Aquecimento: primeiras chamadas não entram na medição
+        run_load(args.url, bodies, min(len(bodies), 4), 1, endpoint, content_type)
+        for concurrency in args.concurrency:
+            report(run_load(args.url, bodies, args.requests, concurrency, endpoint, content_type), concurrency)
+
+        with urllib.request.urlopen(f"{args.url}/metrics", timeout=5) as response:
+            metrics = response.read().decode()
+        print("\n/metrics:")
+        print("\n".join(line for line in metrics.splitlines() if not line.startswith('#')))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(10)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
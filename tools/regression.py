@@ -0,0 +1,288 @@
+"""
+Teste de regressão do pipeline de detecção contra detecções de referência (golden)
+
+Uso:
+    python -m tools.regression modelo.pt --update      # grava as referências
+    python -m tools.regression modelo.pt               # compara com as referências
+    python -m tools.regression --self-test             # confere a comparação (sem modelo)
+
+Roda sem interface e apenas em CPU: detecta as imagens de data_test/images e
+um vídeo sintético gerado localmente a partir delas, compara as caixas com as
+referências (IoU e confiança com tolerância) e mede o throughput. O código de
+saída é 1 quando a precisão ou a velocidade caem além dos limites, então o
+comando pode ser usado antes de mudanças de desempenho (lote, backends, FP16).
+Referência ou execução sem nenhuma detecção também é falha (nada foi
+verificado); --self-test confere a própria comparação com os casos de
+detecções conhecidas em data_test/fixtures, sem precisar de modelo.
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+import torch
+
+from src.core import Detector, open_decoder, predict_frame
+from src.core.metrics import match_detections
+
+
+DEFAULT_GOLDEN = os.path.join('data_test', 'golden', 'detections.json')
+VIDEO_PATH = os.path.join('data_test', 'golden', 'sintetico.avi')
+SELF_TEST_PATH = os.path.join('data_test', 'fixtures', 'regression_cases.json')
+
+
+def file_digest(path):
+    """SHA-1 curto do arquivo, para garantir que a referência é do mesmo modelo"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+def generate_video(path, image_paths, frames=48, size=(960, 540), fps=24):
+    """
+    Gera um vídeo determinístico (MJPG) com panorâmicas sobre as imagens de teste
+
+    O mesmo conteúdo é sempre produzido para as mesmas imagens, então o vídeo
+    pode ser recriado em qualquer máquina em vez de ser versionado.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    width, height = size
+    sources = [cv2.resize(cv2.imread(p), (width * 2, height)) for p in image_paths]
+
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), fps, size)
+    for i in range(frames):
+        source = sources[(i * len(sources)) // frames]
+        offset = (i * width // frames) % width
+        writer.write(np.ascontiguousarray(source[:, offset:offset + width]))
+    writer.release()
+
+
+def run_images(detector, image_paths):
+    """Detecta cada imagem; retorna (detecções por nome, imagens/s)"""
+    detections = {}
+    elapsed = 0.0
+    for path in image_paths:
+        frame = cv2.imread(path)
+        start = time.perf_counter()
+        result = detector.predict(frame)
+        elapsed += time.perf_counter() - start
+        detections[os.path.basename(path)] = result.boxes.data.cpu().numpy().tolist()
+    return detections, len(image_paths) / elapsed if elapsed else 0.0
+
+
+def run_video(detector, path, max_size):
+    """Mesmo passo por frame do VideoThread (predict_frame); retorna (detecções, FPS)"""
+    cap = open_decoder(path, backend='opencv')
+    detections = {}
+    elapsed = 0.0
+    index = 0
+    plan = None
+    while True:
+        ok, frame = cap.read()
+        if not ok:
+            break
+
+        start = time.perf_counter()
+        result, plan = predict_frame(detector, frame, max_size, plan)
+        elapsed += time.perf_counter() - start
+
+        detections[str(index)] = result.boxes.data.cpu().numpy().tolist()
+        index += 1
+    cap.release()
+    return detections, index / elapsed if elapsed else 0.0
+
+
+def compare(golden, current, iou, conf_tol):
+    """
+    Compara dois conjuntos {chave: caixas}
+
+    Chaves (imagens ou frames) que existem só em um dos lados também contam
+    como divergência: as caixas delas entram como ausentes ou extras.
+
+    Returns:
+        dict: total de caixas de cada lado, pares, referências sem par,
+            detecções extras, divergências de confiança, chaves só na
+            referência/só na execução atual e a lista das chaves com diferença
+    """
+    stats = {'golden': 0, 'current': 0, 'matched': 0, 'missing': 0, 'extra': 0, 'conf_out': 0,
+             'missing_keys': [], 'extra_keys': [], 'items': []}
+    for key in list(golden) + [key for key in current if key not in golden]:
+        if key not in current:
+            stats['missing_keys'].append(key)
+        elif key not in golden:
+            stats['extra_keys'].append(key)
+        reference = golden.get(key, [])
+        candidate = current.get(key, [])
+        pairs, missing, extra = match_detections(reference, candidate, iou)
+        conf_out = sum(
+            abs(reference[i][4] - candidate[j][4]) > conf_tol for i, j, _ in pairs
+        )
+        stats['golden'] += len(reference)
+        stats['current'] += len(candidate)
+        stats['matched'] += len(pairs)
+        stats['missing'] += len(missing)
+        stats['extra'] += len(extra)
+        stats['conf_out'] += conf_out
+        if missing or extra or conf_out or key not in current or key not in golden:
+            stats['items'].append(key)
+    return stats
+
+
+def accuracy_failures(name, reference, current, iou, conf_tol, min_match):
+    """
+    Decide se um conjunto (imagens ou vídeo) regrediu em relação à referência
+
+    Um lado sem nenhuma detecção é falha: sem caixas não há o que comparar
+    (modelo sem treino, confiança alta demais) e o teste passaria sem
+    verificar nada.
+
+    Returns:
+        tuple: (estatísticas de compare, lista de falhas)
+    """
+    stats = compare(reference, current, iou, conf_tol)
+    failures = []
+    if not stats['golden']:
+        failures.append(f"referência de {name} sem nenhuma detecção: nada a comparar")
+    if not stats['current']:
+        failures.append(f"execução atual de {name} sem nenhuma detecção")
+    if stats['missing_keys'] or stats['extra_keys']:
+        failures.append(f"chaves de {name}: {len(stats['missing_keys'])} só na referência, "
+                        f"{len(stats['extra_keys'])} só na execução atual")
+
+    recall = stats['matched'] / stats['golden'] if stats['golden'] else 0.0
+    precision = stats['matched'] / stats['current'] if stats['current'] else 0.0
+    if stats['golden'] and stats['current'] and (recall < min_match or precision < min_match):
+        failures.append(f"precisão em {name}: recall {recall:.3f}, precisão {precision:.3f}")
+    if stats['conf_out'] > (1 - min_match) * max(stats['matched'], 1):
+        failures.append(f"confiança em {name}: {stats['conf_out']} caixas fora de ±{conf_tol}")
+    return stats, failures
+
+
+def self_test(path, iou, conf_tol, min_match):
+    """
+    Roda a comparação sobre casos com detecções conhecidas e veredito esperado
+
+    Não depende de modelo: confere que accuracy_failures aceita variações
+    dentro das tolerâncias e acusa caixas ausentes, extras, de outra classe,
+    confiança fora, chaves sobrando ou faltando e conjuntos vazios.
+    """
+    with open(path, encoding='utf-8') as f:
+        cases = json.load(f)['cases']
+    wrong = 0
+    for case in cases:
+        _, failures = accuracy_failures('caso', case['golden'], case['current'], iou, conf_tol, min_match)
+        verdict = 'fail' if failures else 'ok'
+        correct = verdict == case['expect']
+        wrong += not correct
+        detail = f" ({failures[0]})" if failures else ""
+        print(f"{'OK   ' if correct else 'ERRO '} {case['name']}: {verdict}, esperado {case['expect']}{detail}")
+    print(f"{len(cases) - wrong}/{len(cases)} casos com o veredito esperado")
+    return 1 if wrong else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('model', nargs='?')
+    parser.add_argument('--golden', default=DEFAULT_GOLDEN)
+    parser.add_argument('--self-test', nargs='?', const=SELF_TEST_PATH, metavar='CASOS',
+                        help='Só confere a comparação com os casos de detecções conhecidas (sem modelo)')
+    parser.add_argument('--images', default=os.path.join('data_test', 'images'))
+    parser.add_argument('--update', action='store_true', help='Grava novas referências')
+    parser.add_argument('--preprocess', choices=['cpu', 'device'], default='cpu')
+    parser.add_argument('--conf', type=float, default=0.25)
+    parser.add_argument('--max-size', type=int, default=640)
+    parser.add_argument('--iou', type=float, default=0.9, help='IoU mínima para considerar a mesma caixa')
+    parser.add_argument('--conf-tol', type=float, default=0.02, help='Diferença máxima de confiança')
+    parser.add_argument('--min-match', type=float, default=0.98,
+                        help='Fração mínima das caixas de referência (e das atuais) com par')
+    parser.add_argument('--max-slowdown', type=float, default=0.25,
+                        help='Queda máxima de throughput em relação à referência (0.25 = 25%%)')
+    parser.add_argument('--skip-throughput', action='store_true',
+                        help='Não compara velocidade (ex.: referência gravada em outra máquina)')
+    args = parser.parse_args()
+
+    if args.self_test:
+        return self_test(args.self_test, args.iou, args.conf_tol, args.min_match)
+    if not args.model:
+        parser.error("informe o modelo (ou use --self-test)")
+
+    torch.manual_seed(0)
+    torch.use_deterministic_algorithms(True, warn_only=True)
+
+    image_paths = sorted(glob.glob(os.path.join(args.images, '*.jpg')) + glob.glob(os.path.join(args.images, '*.png')))
+    if not image_paths:
+        print(f"Nenhuma imagem encontrada em {args.images}")
+        return 2
+    if not os.path.exists(VIDEO_PATH):
+        generate_video(VIDEO_PATH, image_paths)
+
+    detector = Detector(args.model, conf=args.conf, preprocess=args.preprocess, device='cpu')
+    detector.predict(cv2.imread(image_paths[0]))  # aquecimento fora da medição
+
+    images, images_fps = run_images(detector, image_paths)
+    video, video_fps = run_video(detector, VIDEO_PATH, args.max_size)
+    print(f"Imagens: {images_fps:.2f} img/s  ·  Vídeo: {video_fps:.2f} FPS ({len(video)} frames)")
+
+    config = {'model': os.path.basename(args.model), 'model_sha1': file_digest(args.model),
+              'conf': args.conf, 'max_size': args.max_size}
+
+    if args.update:
+        boxes = sum(len(b) for b in images.values()) + sum(len(b) for b in video.values())
+        if not boxes:
+            print("Nenhuma detecção com este modelo e confiança: a referência não verificaria nada")
+            return 2
+        os.makedirs(os.path.dirname(args.golden), exist_ok=True)
+        with open(args.golden, 'w', encoding='utf-8') as f:
+            json.dump({
+                'config': config,
+                'throughput': {'images_fps': images_fps, 'video_fps': video_fps},
+                'images': images,
+                'video': video,
+            }, f)
+        print(f"Referências gravadas em {args.golden}")
+        return 0
+
+    if not os.path.exists(args.golden):
+        print(f"Referências não encontradas: {args.golden} (rode com --update)")
+        return 2
+    with open(args.golden, encoding='utf-8') as f:
+        golden = json.load(f)
+
+    if golden['config'] != config:
+        print(f"Referência gerada com outra configuração: {golden['config']} != {config}")
+        return 2
+
+    failures = []
+    for name, reference, current in (('imagens', golden['images'], images), ('vídeo', golden['video'], video)):
+        stats, set_failures = accuracy_failures(name, reference, current, args.iou, args.conf_tol, args.min_match)
+        print(f"[{name}] {stats['matched']}/{stats['golden']} caixas com par, {stats['extra']} extras, "
+              f"{stats['conf_out']} fora da tolerância de confiança")
+        if stats['items']:
+            print(f"    divergências em: {', '.join(stats['items'][:10])}")
+        failures += set_failures
+
+    if not args.skip_throughput:
+        for key, current in (('images_fps', images_fps), ('video_fps', video_fps)):
+            baseline = golden['throughput'][key]
+            if current < baseline * (1 - args.max_slowdown):
+                failures.append(f"throughput {key}: {current:.2f} < {baseline:.2f} - {args.max_slowdown:.0%}")
+
+    if failures:
+        print("FALHA:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+
+    print("OK: detecções e throughput dentro das tolerâncias")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())